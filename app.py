@@ -1,18 +1,116 @@
 import dash
-from dash import html, dcc, Input, Output, State
+from dash import html, dcc, dash_table, Input, Output, State, DiskcacheManager, Patch, ctx, no_update
+import diskcache
 import dash_bootstrap_components as dbc
 # import sys
 import os
 # sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from parse_stats import parse_stats_text
-from parse_execution_plan import parse_execution_plan
-from collections import defaultdict
+from sqlstatistics.parse_stats import StatsTail, parse_stats_columns
+from sqlstatistics.parse_execution_plan import parse_execution_plan, plan_frame, read_plan
+from sqlstatistics.parse_cache import ParseCache, content_key, private_cache_dir
+from sqlstatistics.plan_diff import DIFF_COLUMNS, diff_plans, summarize_diff
+from sqlstatistics.plan_correlation import CORRELATION_COLUMNS, correlate_stats_with_plan
+from sqlstatistics.plan_analysis import elapsed_report, has_runtime, memory_grant_report, misestimate_report
+from sqlstatistics.plan_advice import missing_index_report, warnings_report
+import io
+import uuid
+import flask
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
+import numpy as np
+from sqlstatistics.table_paging import page_frame
+from sqlstatistics.stats_lines import COUNTER_COLUMNS
+from sqlstatistics.timing import JsonFormatter, StageMetrics, record, span
+import contextlib
+import logging
 
 BASE_PATH = os.getenv("DASH_BASE_PATHNAME","/")
-app = dash.Dash(__name__, url_base_pathname=BASE_PATH, external_stylesheets=[dbc.themes.BOOTSTRAP])
+PAGE_SIZE = 25
+
+def cache_path(variable, name):
+    # Job results and cache entries are unpickled, so by default they live in
+    # a directory only this user can write rather than the shared temp
+    # directory. It is only looked up (and created) for paths not set in the
+    # environment, so overriding every one needs no writable home directory
+    return os.getenv(variable) or os.path.join(private_cache_dir(), name)
+
+# Analyses run as background jobs in their own processes, tracked in a local
+# diskcache shared by every web worker, so a long parse blocks nobody else
+JOBS_PATH = cache_path("BACKGROUND_JOBS_PATH", "jobs")
+background_callback_manager = DiskcacheManager(diskcache.Cache(JOBS_PATH))
+
+# Result tables are created by the analyze callbacks, so their paging
+# callbacks refer to components that are not in the initial layout
+app = dash.Dash(__name__, url_base_pathname=BASE_PATH, external_stylesheets=[dbc.themes.BOOTSTRAP],
+                suppress_callback_exceptions=True, background_callback_manager=background_callback_manager)
+server = app.server
+
+# Parsed inputs and built figures, shared by all workers and background jobs
+# on this host; it has to live on disk for the jobs and web workers to share it
+CACHE_PATH = cache_path("PARSE_CACHE_PATH", "parse-cache.sqlite")
+parse_cache = ParseCache(
+    CACHE_PATH,
+    max_entries=int(os.getenv("PARSE_CACHE_MAX_ENTRIES", "64")),
+    max_bytes=int(os.getenv("PARSE_CACHE_MAX_BYTES", str(512 * 2**20)))
+)
+
+# Live Tail follows capture files on this host; only paths under this
+# directory can be opened from the browser
+TAIL_ROOT = os.path.realpath(os.getenv("STATS_TAIL_ROOT", os.getcwd()))
+TAIL_INTERVAL_MS = int(os.getenv("STATS_TAIL_INTERVAL_MS", "2000"))
+# Upper bound on what one refresh parses, so catching up on a large
+# existing file is spread over several refreshes
+TAIL_POLL_BYTES = int(os.getenv("STATS_TAIL_POLL_BYTES", str(32 * 2**20)))
+# Followed tails' state, apart from the parse cache so polling neither counts
+# as cache hits nor gets evicted by its size bound; a tail nobody has
+# refreshed for this long is dropped
+TAIL_STATE_PATH = cache_path("STATS_TAIL_STATE_PATH", "tails")
+TAIL_STATE_TTL = int(os.getenv("STATS_TAIL_STATE_TTL", str(24 * 3600)))
+tail_states = diskcache.Cache(TAIL_STATE_PATH, eviction_policy='none')
+
+@app.server.route(BASE_PATH.rstrip('/') + '/cache-stats')
+def cache_stats():
+    return flask.jsonify(parse_cache.stats())
+
+# Stage timings are logged with their fields as ``extra``; LOG_FORMAT=json
+# writes one JSON object per line for a log collector
+_log_handler = logging.StreamHandler()
+if os.getenv("LOG_FORMAT", "text") == "json":
+    _log_handler.setFormatter(JsonFormatter())
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"), handlers=[_log_handler])
+
+# With ENABLE_METRICS=1, stage timings are also kept as histograms served at
+# /metrics for Prometheus. Like the parse cache they live in a SQLite file,
+# so background jobs and every web worker add to the same series
+stage_metrics = None
+if os.getenv("ENABLE_METRICS", "0") == "1":
+    stage_metrics = StageMetrics(cache_path("METRICS_PATH", "metrics.sqlite"))
+# Serialising a result again just to time it doubles that cost, so it is opt-in
+MEASURE_PAYLOAD = os.getenv("MEASURE_PAYLOAD", "0") == "1"
+
+if stage_metrics is not None:
+    @app.server.route(BASE_PATH.rstrip('/') + '/metrics')
+    def metrics():
+        cache = parse_cache.stats()
+        lines = [
+            "# HELP sqlstatistics_parse_cache_hits_total Parse cache lookups that found an entry.",
+            "# TYPE sqlstatistics_parse_cache_hits_total counter",
+            f"sqlstatistics_parse_cache_hits_total {cache['hits']}",
+            "# HELP sqlstatistics_parse_cache_misses_total Parse cache lookups that found nothing.",
+            "# TYPE sqlstatistics_parse_cache_misses_total counter",
+            f"sqlstatistics_parse_cache_misses_total {cache['misses']}",
+            "# HELP sqlstatistics_parse_cache_bytes Pickled size of the cached entries.",
+            "# TYPE sqlstatistics_parse_cache_bytes gauge",
+            f"sqlstatistics_parse_cache_bytes {cache['bytes']}",
+        ]
+        return flask.Response(stage_metrics.render() + '\n'.join(lines) + '\n',
+                              mimetype='text/plain; version=0.0.4')
+
+TAIL_COLUMNS = ['Table', 'Scan Count', 'Logical Reads', 'Physical Reads', 'Read-Ahead Reads',
+                'LOB Logical Reads']
+_TAIL_COUNTERS = [COUNTER_COLUMNS.index(column) for column in
+                  ['scan_count', 'logical_reads', 'physical_reads', 'read_ahead_reads', 'lob_logical_reads']]
 
 app.layout = dbc.Container([
     html.H1("SQL Server Statistics Analyzer"),
@@ -25,7 +123,9 @@ app.layout = dbc.Container([
                 placeholder='Paste SQL Server statistics here...'
             ),
             html.Br(),
-            dbc.Button("Analyze", id='analyze-btn', color='primary', className='mb-3'),
+            dbc.Button("Analyze", id='analyze-btn', color='primary', className='mb-3 me-2'),
+            dbc.Button("Cancel", id='cancel-btn', color='secondary', className='mb-3', disabled=True),
+            dbc.Progress(id='stats-progress', value=0, className='mb-3', style={'display': 'none'}),
             html.Div(id='stats-results')
         ], label="Query Statistics"),
         
@@ -37,173 +137,658 @@ app.layout = dbc.Container([
                 placeholder='Paste SQL Server execution plan XML here...'
             ),
             html.Br(),
-            dbc.Button("Analyze Plan", id='analyze-plan-btn', color='primary', className='mb-3'),
+            dbc.Button("Analyze Plan", id='analyze-plan-btn', color='primary', className='mb-3 me-2'),
+            dbc.Button("Cancel", id='cancel-plan-btn', color='secondary', className='mb-3', disabled=True),
+            dbc.Progress(id='execplan-progress', value=0, className='mb-3', style={'display': 'none'}),
             html.Div(id='execplan-results')
-        ], label="Execution Plan")
+        ], label="Execution Plan"),
+        
+        dbc.Tab([
+            html.P("Paste the old and new execution plan XML below:"),
+            dbc.Row([
+                dbc.Col(dcc.Textarea(
+                    id='diff-old-input',
+                    style={'width': '100%', 'height': 300},
+                    placeholder='Paste the old execution plan XML here...'
+                ), width=6),
+                dbc.Col(dcc.Textarea(
+                    id='diff-new-input',
+                    style={'width': '100%', 'height': 300},
+                    placeholder='Paste the new execution plan XML here...'
+                ), width=6)
+            ]),
+            html.Br(),
+            dbc.Button("Compare Plans", id='compare-btn', color='primary', className='mb-3 me-2'),
+            dbc.Button("Cancel", id='cancel-compare-btn', color='secondary', className='mb-3', disabled=True),
+            html.Div(id='diff-results')
+        ], label="Plan Comparison"),
+        
+        dbc.Tab([
+            html.P("Maps the table reads from the Query Statistics tab to the operators "
+                   "in the Execution Plan tab that access each table."),
+            dbc.Button("Correlate", id='correlate-btn', color='primary', className='mb-3'),
+            html.Div(id='correlation-results')
+        ], label="Reads by Operator"),
+
+        dbc.Tab([
+            html.P(f"Follows a STATISTICS IO capture that is still being written, keeping running "
+                   f"per-table totals. Paths are relative to {TAIL_ROOT} on the server."),
+            dbc.Input(id='tail-path', placeholder='maintenance-statistics-io.txt', className='mb-2'),
+            dbc.Checkbox(id='tail-from-end', label="Only count blocks written from now on", value=False,
+                         className='mb-2'),
+            dbc.Button("Follow", id='tail-start-btn', color='primary', className='mb-3 me-2'),
+            dbc.Button("Stop", id='tail-stop-btn', color='secondary', className='mb-3', disabled=True),
+            dcc.Interval(id='tail-interval', interval=TAIL_INTERVAL_MS, disabled=True),
+            dcc.Store(id='tail-key'),
+            # Version of the tail the table's rows reflect, see refresh_tail
+            dcc.Store(id='tail-seq'),
+            html.Div(id='tail-summary'),
+            dash_table.DataTable(
+                id='tail-table',
+                columns=[{'name': column, 'id': column} for column in TAIL_COLUMNS],
+                data=[],
+                sort_action='native',
+                page_size=PAGE_SIZE
+            )
+        ], label="Live Tail")
     ])
 ], fluid=True)
 
+QUERY_ROW_COLUMNS = ['Query', 'Table', 'Scan Count', 'Logical Reads', 'Physical Reads',
+                     'Rows Affected', 'Completion Time', 'Query Logical Reads']
+
+def build_query_rows(stats):
+    # One row per table line, plus one for each query that touched no tables
+    queries = pd.DataFrame({
+        'Query': np.arange(1, len(stats) + 1),
+        'Rows Affected': stats.queries['rows_affected'].map(lambda rows: ', '.join(map(str, rows))),
+        'Completion Time': stats.queries['completion_time'].map(lambda t: str(t) if t else ''),
+        'Query Logical Reads': stats.query_totals()['logical_reads'].to_numpy()
+    })
+    tables = pd.DataFrame({
+        'Query': stats.tables['query'] + 1,
+        'Table': stats.tables['table_name'],
+        'Scan Count': stats.tables['scan_count'],
+        'Logical Reads': stats.tables['logical_reads'],
+        'Physical Reads': stats.tables['physical_reads']
+    })
+    rows = queries.merge(tables, on='Query', how='left')[QUERY_ROW_COLUMNS]
+    return rows.astype({'Scan Count': 'Int64', 'Logical Reads': 'Int64', 'Physical Reads': 'Int64'})
+
+def paged_table(table_id, columns, key):
+    # Rows are served a page at a time by the matching page_* callback
+    return html.Div([
+        dcc.Store(id=f'{table_id}-key', data=key),
+        html.Div(id=f'{table_id}-status'),
+        dash_table.DataTable(
+            id=table_id,
+            columns=[{'name': col, 'id': col} for col in columns],
+            page_action='custom',
+            page_current=0,
+            page_size=PAGE_SIZE,
+            sort_action='custom',
+            sort_mode='multi',
+            sort_by=[],
+            filter_action='custom',
+            filter_query='',
+            style_table={'overflowX': 'auto'},
+            style_cell={'textAlign': 'left', 'maxWidth': 400, 'overflow': 'hidden', 'textOverflow': 'ellipsis'}
+        )
+    ], className='mb-4')
+
+# Shown instead of an empty page when a table's rows were evicted from the
+# cache (or never fit in it) and its inputs have been edited since
+RESULTS_EXPIRED = dbc.Alert("These results are no longer cached and the input has changed since; "
+                            "run the analysis again.", color='warning')
+
+def cached_rows(name, key, inputs, compute):
+    # The rows behind a paged table. The cache is shared and bounded, so on a
+    # miss they are rebuilt from the inputs, as long as those still hash to
+    # the key the table was built from; None otherwise
+    rows = parse_cache.get(f"{name}:{key}")
+    if rows is None and key and ':'.join(content_key(text or '') for text in inputs) == key:
+        rows = parse_cache.get_or_compute(f"{name}:{key}", compute)
+    return rows
+
+def page_rows(rows, page_current, page_size, sort_by, filter_query):
+    if rows is None:
+        return [], 1, RESULTS_EXPIRED
+    return (*page_frame(rows, page_current, page_size, sort_by, filter_query), None)
+
+def stats_frame(stats_text):
+    return parse_cache.get_or_compute(f"stats:{content_key(stats_text)}",
+                                      lambda: parse_stats_columns(io.StringIO(stats_text)))
+
+def plan_df(xml_content):
+    return parse_cache.get_or_compute(f"plan:{content_key(xml_content)}",
+                                      lambda: parse_execution_plan(xml_content))
+
+@contextlib.contextmanager
+def timed(operation):
+    # Collects the callback's stages, including the parsers' own spans
+    with record(operation) as timings:
+        yield timings
+    if stage_metrics is not None:
+        stage_metrics.observe(timings)
+
+def measure_payload(children):
+    """Size of the serialised result in bytes, timed as a stage; None unless MEASURE_PAYLOAD is set."""
+    if not MEASURE_PAYLOAD:
+        return None
+    from plotly.io.json import to_json_plotly
+    with span('serialize'):
+        return len(to_json_plotly(children).encode('utf-8'))
+
+def performance_panel(timings, payload_bytes=None):
+    total_ms = timings.seconds * 1000
+    rows = [
+        html.Tr([
+            html.Td(stage.name, style={'paddingLeft': f"{0.75 + stage.depth * 1.5}rem"}),
+            html.Td(f"{stage.seconds * 1000:,.1f}"),
+            html.Td(f"{stage.seconds * 1000 / total_ms * 100:.1f}%" if total_ms else "")
+        ]) for stage in timings.stages
+    ]
+    notes = ["Indented stages ran inside the one above; parser stages only appear when the input "
+             "was not already cached."]
+    if payload_bytes is not None:
+        notes.append(f"Serialised result: {payload_bytes / 2**20:,.2f} MiB.")
+    return html.Details([
+        html.Summary(f"Performance: {total_ms:,.0f} ms"),
+        dbc.Table([
+            html.Thead(html.Tr([html.Th("Stage"), html.Th("ms"), html.Th("Share")])),
+            html.Tbody(rows)
+        ], bordered=True, size='sm', className='mt-2 mb-1'),
+        html.Small(' '.join(notes), className='text-muted')
+    ], className='mt-4')
+
+def progress_lines(text, set_progress, every=10000):
+    # Yields the lines of text, reporting the share consumed every few lines
+    total = len(text) or 1
+    consumed = 0
+    for i, line in enumerate(io.StringIO(text)):
+        consumed += len(line)
+        if i % every == 0:
+            percent = int(consumed * 100 / total)
+            set_progress((percent, f"Parsing {percent}%"))
+        yield line
+
 @app.callback(
     Output('stats-results', 'children'),
     Input('analyze-btn', 'n_clicks'),
-    State('stats-input', 'value')
+    State('stats-input', 'value'),
+    background=True,
+    running=[
+        (Output('analyze-btn', 'disabled'), True, False),
+        (Output('cancel-btn', 'disabled'), False, True),
+        (Output('stats-progress', 'style'), {'display': 'flex'}, {'display': 'none'}),
+    ],
+    cancel=[Input('cancel-btn', 'n_clicks')],
+    progress=[Output('stats-progress', 'value'), Output('stats-progress', 'label')],
+    prevent_initial_call=True
 )
-def analyze_stats(n_clicks, stats_text):
+def analyze_stats(set_progress, n_clicks, stats_text):
     if not n_clicks or not stats_text:
         return ""
     try:
-        stats = parse_stats_text(stats_text)
-        total_logical_reads = 0
-        all_queries_content = []
-        table_stats = defaultdict(lambda: {'scan_count': 0, 'logical_reads': 0, 'physical_reads': 0})
-        for i, query in enumerate(stats, 1):
-            query_logical_reads = 0
-            query_content = [html.H3(f"Query {i}")]
-            for table in query.tables:
-                query_content.append(html.Div([
-                    html.P(f"Table: {table.table_name}"),
-                    html.P(f"  Scan count: {table.scan_count}"),
-                    html.P(f"  Logical reads: {table.logical_reads}"),
-                    html.P(f"  Physical reads: {table.physical_reads}")
-                ]))
-                table_stats[table.table_name]['scan_count'] += table.scan_count
-                table_stats[table.table_name]['logical_reads'] += table.logical_reads
-                table_stats[table.table_name]['physical_reads'] += table.physical_reads
-                query_logical_reads += table.logical_reads
-            if query.rows_affected:
-                query_content.append(html.P(f"Rows affected: {query.rows_affected}"))
-            if query.completion_time:
-                query_content.append(html.P(f"Completion time: {query.completion_time}"))
-            query_content.append(html.P(f"Total logical reads for this query: {query_logical_reads}"))
-            total_logical_reads += query_logical_reads
-            all_queries_content.append(html.Div(query_content, className='mb-4'))
-        all_queries_tab = dbc.Tab(
-            html.Div(all_queries_content),
-            label="All Queries"
-        )
-        table_tab = dbc.Tab(
-            dbc.Table([
-                html.Thead(html.Tr([
-                    html.Th("Table Name"),
-                    html.Th("Total Scan Count"),
-                    html.Th("Total Logical Reads"),
-                    html.Th("Total Physical Reads")
-                ])),
-                html.Tbody([
-                    html.Tr([
-                        html.Td(table_name),
-                        html.Td(stats['scan_count']),
-                        html.Td(stats['logical_reads']),
-                        html.Td(stats['physical_reads'])
-                    ]) for table_name, stats in table_stats.items()
-                ])
-            ], bordered=True, hover=True, className='mb-4'),
-            label="All Tables"
-        )
-        summary = html.Div([
-            html.H2(f"Total logical reads across all queries: {total_logical_reads}"),
-            html.Hr()
-        ])
-        return [summary, dbc.Tabs([all_queries_tab, table_tab])]
+        with timed('analyze_stats') as timings:
+            key = content_key(stats_text)
+            with span('parse'):
+                stats = parse_cache.get_or_compute(
+                    f"stats:{key}", lambda: parse_stats_columns(progress_lines(stats_text, set_progress))
+                )
+            set_progress((100, "Rendering"))
+            with span('query rows'):
+                parse_cache.get_or_compute(f"stats-rows:{key}", lambda: build_query_rows(stats))
+            with span('table totals'):
+                total_logical_reads = stats.tables['logical_reads'].sum()
+                table_stats = stats.table_totals()
+            with span('layout'):
+                children = stats_layout(total_logical_reads, table_stats, key)
+            payload_bytes = measure_payload(children)
+        return [*children, performance_panel(timings, payload_bytes)]
     except Exception as e:
         return f"Error parsing statistics: {e}"
 
+def stats_layout(total_logical_reads, table_stats, key):
+    all_queries_tab = dbc.Tab(
+        paged_table('queries-table', QUERY_ROW_COLUMNS, key),
+        label="All Queries"
+    )
+    table_tab = dbc.Tab(
+        dbc.Table([
+            html.Thead(html.Tr([
+                html.Th("Table Name"),
+                html.Th("Total Scan Count"),
+                html.Th("Total Logical Reads"),
+                html.Th("Total Physical Reads")
+            ])),
+            html.Tbody([
+                html.Tr([
+                    html.Td(table_name),
+                    html.Td(row['scan_count']),
+                    html.Td(row['logical_reads']),
+                    html.Td(row['physical_reads'])
+                ]) for table_name, row in table_stats.iterrows()
+            ])
+        ], bordered=True, hover=True, className='mb-4'),
+        label="All Tables"
+    )
+    summary = html.Div([
+        html.H2(f"Total logical reads across all queries: {total_logical_reads}"),
+        html.Hr()
+    ])
+    return [summary, dbc.Tabs([all_queries_tab, table_tab])]
+
+def plan_advice(records):
+    return missing_index_report([records]), warnings_report(records)
+
+def build_plan_figures(df):
+    # Create visualizations
+    cost_fig = px.bar(
+        df.nlargest(10, 'Cost %'),
+        x='Cost %',
+        y='Physical Operation',
+        title='Top 10 Most Expensive Operations'
+    )
+
+    cpu_io_fig = px.scatter(
+        df,
+        x='CPU Cost',
+        y='IO Cost',
+        hover_data=['Physical Operation', 'Statement Type'],
+        title='CPU vs IO Cost Distribution'
+    )
+
+    stmt_type_fig = px.pie(
+        df,
+        names='Statement Type',
+        values='Cost %',
+        title='Cost Distribution by Statement Type'
+    )
+    
+    return {'cost': cost_fig, 'cpu_io': cpu_io_fig, 'statement_type': stmt_type_fig}
+
 @app.callback(
     Output('execplan-results', 'children'),
     Input('analyze-plan-btn', 'n_clicks'),
-    State('execplan-input', 'value')
+    State('execplan-input', 'value'),
+    background=True,
+    running=[
+        (Output('analyze-plan-btn', 'disabled'), True, False),
+        (Output('cancel-plan-btn', 'disabled'), False, True),
+        (Output('execplan-progress', 'style'), {'display': 'flex'}, {'display': 'none'}),
+    ],
+    cancel=[Input('cancel-plan-btn', 'n_clicks')],
+    progress=[Output('execplan-progress', 'value'), Output('execplan-progress', 'label')],
+    prevent_initial_call=True
 )
-def analyze_execution_plan(n_clicks, xml_content):
+def analyze_execution_plan(set_progress, n_clicks, xml_content):
     if not n_clicks or not xml_content:
         return ""
     try:
-        df = parse_execution_plan(xml_content)
-        
-        # Create visualizations
-        cost_fig = px.bar(
-            df.nlargest(10, 'Cost %'),
-            x='Cost %',
-            y='Physical Operation',
-            title='Top 10 Most Expensive Operations'
-        )
-        
-        cpu_io_fig = px.scatter(
-            df,
-            x='CPU Cost',
-            y='IO Cost',
-            hover_data=['Physical Operation', 'Statement Type'],
-            title='CPU vs IO Cost Distribution'
-        )
-        
-        stmt_type_fig = px.pie(
-            df,
-            names='Statement Type',
-            values='Cost %',
-            title='Cost Distribution by Statement Type'
-        )
-        
-        # Create summary statistics
-        summary_stats = html.Div([
-            html.H3("Summary Statistics"),
-            html.P(f"Total number of execution steps: {len(df)}"),
-            html.P(f"Number of statements: {df['Statement ID'].nunique()}"),
-            # html.P(f"Most expensive operation: {df.loc[df['Cost %'].idxmax(), 'Physical Operation']} ({df['Cost %'].max():.2f}%)"),
-            # html.P(f"Total estimated rows: {df['Estimated Rows'].sum():,.0f}")
+        with timed('analyze_execution_plan') as timings:
+            key = content_key(xml_content)
+
+            def report(fraction):
+                # Parsing is the bulk of the work; figures take the last stretch
+                percent = int(fraction * 80)
+                set_progress((percent, f"Parsing {percent}%"))
+
+            def parse():
+                # Missing indexes and warnings come out of the same pass as the operators
+                records = read_plan(xml_content, progress=report)
+                with span('plan_advice'):
+                    parse_cache.set(f"plan-advice:{key}", plan_advice(records))
+                return plan_frame(records)
+
+            with span('parse'):
+                df = parse_cache.get_or_compute(f"plan:{key}", parse)
+            with span('advice'):
+                missing_indexes, plan_warnings = parse_cache.get_or_compute(
+                    f"plan-advice:{key}", lambda: plan_advice(read_plan(xml_content))
+                )
+            set_progress((80, "Building figures"))
+            with span('figures'):
+                figures = parse_cache.get_or_compute(f"plan-figures:{key}", lambda: build_plan_figures(df))
+            set_progress((100, "Rendering"))
+            with span('layout'):
+                children = plan_layout(df, figures, missing_indexes, plan_warnings, key)
+            payload_bytes = measure_payload(children)
+        return html.Div([*children, performance_panel(timings, payload_bytes)])
+    except Exception as e:
+        return f"Error parsing execution plan: {e}"
+
+def plan_layout(df, figures, missing_indexes, plan_warnings, key):
+    # Create summary statistics
+    summary_stats = html.Div([
+        html.H3("Summary Statistics"),
+        html.P(f"Total number of execution steps: {len(df)}"),
+        html.P(f"Number of statements: {df['Statement ID'].nunique()}"),
+        html.P(f"Most expensive operation: {df.loc[df['Cost %'].idxmax(), 'Physical Operation']} ({df['Cost %'].max():.2f}%)"),
+        html.P(f"Total estimated rows: {df['Estimated Rows'].sum():,.0f}")
+    ])
+    
+    # Create statement summary table
+    stmt_summary = df.groupby('Statement Type', observed=True).agg({
+        'Cost %': 'sum',
+        'Estimated Rows': 'sum',
+        'Node ID': 'count'
+    }).sort_values('Cost %', ascending=False)
+    stmt_summary.columns = ['Total Cost %', 'Total Estimated Rows', 'Number of Operations']
+    
+    stmt_table = dbc.Table([
+        html.Thead(html.Tr([
+            html.Th("Statement Type"),
+            html.Th("Total Cost %"),
+            html.Th("Total Estimated Rows"),
+            html.Th("Number of Operations")
+        ])),
+        html.Tbody([
+            html.Tr([
+                html.Td(idx),
+                html.Td(f"{row['Total Cost %']:.2f}%"),
+                html.Td(f"{row['Total Estimated Rows']:,.0f}"),
+                html.Td(row['Number of Operations'])
+            ]) for idx, row in stmt_summary.iterrows()
         ])
+    ], bordered=True, hover=True, className='mb-4')
+    
+    # Actual plans also get runtime rankings
+    runtime_section = []
+    if has_runtime(df):
+        runtime_section = [
+            html.H3("Runtime Statistics"),
+            dbc.Row([
+                dbc.Col([
+                    html.H5("Worst Cardinality Misestimates"),
+                    dbc.Table.from_dataframe(misestimate_report(df, top=10), bordered=True, hover=True, size='sm')
+                ], width=6),
+                dbc.Col([
+                    html.H5("Most Elapsed Time"),
+                    dbc.Table.from_dataframe(elapsed_report(df, top=10), bordered=True, hover=True, size='sm')
+                ], width=6)
+            ]),
+            html.H5("Memory Grants"),
+            dbc.Table.from_dataframe(memory_grant_report(df), bordered=True, hover=True, size='sm'),
+            html.Hr()
+        ]
+    
+    advice_section = []
+    if len(missing_indexes):
+        advice_section += [
+            html.H3("Missing Indexes"),
+            dbc.Table.from_dataframe(missing_indexes, bordered=True, hover=True, size='sm')
+        ]
+    if len(plan_warnings):
+        advice_section += [
+            html.H3("Warnings"),
+            dbc.Table.from_dataframe(plan_warnings.astype(object).fillna(''), bordered=True, hover=True, size='sm')
+        ]
+    if advice_section:
+        advice_section.append(html.Hr())
+    
+    return [
+        summary_stats,
+        html.Hr(),
+        *advice_section,
+        *runtime_section,
+        dbc.Row([
+            dbc.Col(dcc.Graph(figure=figures['cost']), width=6),
+            dbc.Col(dcc.Graph(figure=figures['cpu_io']), width=6)
+        ]),
+        dbc.Row([
+            dbc.Col(dcc.Graph(figure=figures['statement_type']), width=6),
+            dbc.Col(stmt_table, width=6)
+        ]),
+        html.H3("Detailed Operations"),
+        paged_table('operations-table', list(df.columns), key)
+    ]
+
+@app.callback(
+    Output('diff-results', 'children'),
+    Input('compare-btn', 'n_clicks'),
+    State('diff-old-input', 'value'),
+    State('diff-new-input', 'value'),
+    background=True,
+    running=[
+        (Output('compare-btn', 'disabled'), True, False),
+        (Output('cancel-compare-btn', 'disabled'), False, True),
+    ],
+    cancel=[Input('cancel-compare-btn', 'n_clicks')],
+    prevent_initial_call=True
+)
+def compare_execution_plans(n_clicks, old_xml, new_xml):
+    if not n_clicks or not old_xml or not new_xml:
+        return ""
+    try:
+        old_key = content_key(old_xml)
+        new_key = content_key(new_xml)
+        old_df = plan_df(old_xml)
+        new_df = plan_df(new_xml)
+        key = f"{old_key}:{new_key}"
+        diff = parse_cache.get_or_compute(f"plan-diff:{key}", lambda: diff_plans(old_df, new_df))
+        counts = summarize_diff(diff)
         
-        # Create statement summary table
-        stmt_summary = df.groupby('Statement Type').agg({
-            'Cost %': 'sum',
-            'Estimated Rows': 'sum',
-            'Node ID': 'count'
-        }).sort_values('Cost %', ascending=False)
-        stmt_summary.columns = ['Total Cost %', 'Total Estimated Rows', 'Number of Operations']
-        
-        stmt_table = dbc.Table([
-            html.Thead(html.Tr([
-                html.Th("Statement Type"),
-                # html.Th("Total Cost %"),
-                # html.Th("Total Estimated Rows"),
-                html.Th("Number of Operations")
-            ])),
-            html.Tbody([
-                html.Tr([
-                    html.Td(idx),
-                    # html.Td(f"{row['Total Cost %']:.2f}%"),
-                    # html.Td(f"{row['Total Estimated Rows']:,.0f}"),
-                    html.Td(row['Number of Operations'])
-                ]) for idx, row in stmt_summary.iterrows()
-            ])
-        ], bordered=True, hover=True, className='mb-4')
-        
-        # Create detailed operations table
-        operations_table = dbc.Table([
-            html.Thead(html.Tr([
-                html.Th(col) for col in df.columns
-            ])),
-            html.Tbody([
-                html.Tr([
-                    html.Td(str(val)) for val in row
-                ]) for row in df.values
-            ])
-        ], bordered=True, hover=True, className='mb-4')
+        summary = html.Div([
+            html.H3("Comparison Summary"),
+            html.P(f"Unchanged operations: {counts.get('unchanged', 0)}"),
+            html.P(f"Changed cost share or estimated rows: {counts.get('changed', 0)}"),
+            html.P(f"Replaced operations: {counts.get('replaced', 0)}"),
+            html.P(f"Added operations: {counts.get('added', 0)}"),
+            html.P(f"Removed operations: {counts.get('removed', 0)}"),
+            html.P(f"New scans where there used to be seeks: {counts['flagged']}")
+        ])
         
         return html.Div([
-            summary_stats,
+            summary,
             html.Hr(),
-            dbc.Row([
-                dbc.Col(dcc.Graph(figure=cost_fig), width=6),
-                dbc.Col(dcc.Graph(figure=cpu_io_fig), width=6)
-            ]),
-            dbc.Row([
-                dbc.Col(dcc.Graph(figure=stmt_type_fig), width=6),
-                dbc.Col(stmt_table, width=6)
-            ]),
-            html.H3("Detailed Operations"),
-            operations_table
+            paged_table('diff-table', DIFF_COLUMNS, key)
         ])
     except Exception as e:
-        return f"Error parsing execution plan: {e}"
+        return f"Error comparing execution plans: {e}"
+
+@app.callback(
+    Output('correlation-results', 'children'),
+    Input('correlate-btn', 'n_clicks'),
+    State('stats-input', 'value'),
+    State('execplan-input', 'value'),
+    background=True,
+    running=[(Output('correlate-btn', 'disabled'), True, False)],
+    prevent_initial_call=True
+)
+def correlate(n_clicks, stats_text, xml_content):
+    if not n_clicks:
+        return ""
+    if not stats_text or not xml_content:
+        return "Paste both query statistics and an execution plan first."
+    try:
+        stats_key = content_key(stats_text)
+        plan_key = content_key(xml_content)
+        stats = stats_frame(stats_text)
+        df = plan_df(xml_content)
+        key = f"{stats_key}:{plan_key}"
+        correlation = parse_cache.get_or_compute(
+            f"correlation:{key}", lambda: correlate_stats_with_plan(stats, df)
+        )
+        unmatched = correlation.loc[correlation['Node ID'].isna(), 'Table'].nunique()
+        return html.Div([
+            html.P(f"Tables read: {correlation['Table'].nunique()}, "
+                   f"without a matching plan operator: {unmatched}"),
+            paged_table('correlation-table', CORRELATION_COLUMNS, key)
+        ])
+    except Exception as e:
+        return f"Error correlating statistics with the plan: {e}"
+
+@app.callback(
+    Output('correlation-table', 'data'),
+    Output('correlation-table', 'page_count'),
+    Output('correlation-table-status', 'children'),
+    Input('correlation-table', 'page_current'),
+    Input('correlation-table', 'page_size'),
+    Input('correlation-table', 'sort_by'),
+    Input('correlation-table', 'filter_query'),
+    State('correlation-table-key', 'data'),
+    State('stats-input', 'value'),
+    State('execplan-input', 'value')
+)
+def page_correlation(page_current, page_size, sort_by, filter_query, key, stats_text, xml_content):
+    correlation = cached_rows('correlation', key, [stats_text, xml_content],
+                              lambda: correlate_stats_with_plan(stats_frame(stats_text), plan_df(xml_content)))
+    return page_rows(correlation, page_current, page_size, sort_by, filter_query)
+
+@app.callback(
+    Output('diff-table', 'data'),
+    Output('diff-table', 'page_count'),
+    Output('diff-table-status', 'children'),
+    Input('diff-table', 'page_current'),
+    Input('diff-table', 'page_size'),
+    Input('diff-table', 'sort_by'),
+    Input('diff-table', 'filter_query'),
+    State('diff-table-key', 'data'),
+    State('diff-old-input', 'value'),
+    State('diff-new-input', 'value')
+)
+def page_diff(page_current, page_size, sort_by, filter_query, key, old_xml, new_xml):
+    diff = cached_rows('plan-diff', key, [old_xml, new_xml],
+                       lambda: diff_plans(plan_df(old_xml), plan_df(new_xml)))
+    return page_rows(diff, page_current, page_size, sort_by, filter_query)
+
+@app.callback(
+    Output('queries-table', 'data'),
+    Output('queries-table', 'page_count'),
+    Output('queries-table-status', 'children'),
+    Input('queries-table', 'page_current'),
+    Input('queries-table', 'page_size'),
+    Input('queries-table', 'sort_by'),
+    Input('queries-table', 'filter_query'),
+    State('queries-table-key', 'data'),
+    State('stats-input', 'value')
+)
+def page_queries(page_current, page_size, sort_by, filter_query, key, stats_text):
+    rows = cached_rows('stats-rows', key, [stats_text], lambda: build_query_rows(stats_frame(stats_text)))
+    return page_rows(rows, page_current, page_size, sort_by, filter_query)
+
+@app.callback(
+    Output('operations-table', 'data'),
+    Output('operations-table', 'page_count'),
+    Output('operations-table-status', 'children'),
+    Input('operations-table', 'page_current'),
+    Input('operations-table', 'page_size'),
+    Input('operations-table', 'sort_by'),
+    Input('operations-table', 'filter_query'),
+    State('operations-table-key', 'data'),
+    State('execplan-input', 'value')
+)
+def page_operations(page_current, page_size, sort_by, filter_query, key, xml_content):
+    df = cached_rows('plan', key, [xml_content], lambda: parse_execution_plan(xml_content))
+    return page_rows(df, page_current, page_size, sort_by, filter_query)
+
+def tail_row(tail, position):
+    totals = tail.totals[position]
+    return dict(zip(TAIL_COLUMNS, [tail.tables[position]] + [totals[i] for i in _TAIL_COUNTERS]))
+
+def tail_summary(tail):
+    logical_reads = sum(totals[COUNTER_COLUMNS.index('logical_reads')] for totals in tail.totals)
+    return html.P(f"{tail.queries:,} queries, {len(tail.tables):,} tables, {logical_reads:,} logical reads "
+                  f"({tail.offset:,} bytes of {tail.path} read)")
+
+def resolve_tail_path(path):
+    resolved = os.path.realpath(os.path.join(TAIL_ROOT, path))
+    if os.path.commonpath([resolved, TAIL_ROOT]) != TAIL_ROOT:
+        raise ValueError(f"{path} is outside {TAIL_ROOT}")
+    if not os.path.isfile(resolved):
+        raise ValueError(f"{path} is not a file")
+    return resolved
+
+def tail_rows(tail):
+    return [tail_row(tail, position) for position in range(len(tail.tables))]
+
+@app.callback(
+    Output('tail-key', 'data'),
+    Output('tail-seq', 'data'),
+    Output('tail-table', 'data'),
+    Output('tail-summary', 'children'),
+    Output('tail-interval', 'disabled'),
+    Output('tail-start-btn', 'disabled'),
+    Output('tail-stop-btn', 'disabled'),
+    Input('tail-start-btn', 'n_clicks'),
+    Input('tail-stop-btn', 'n_clicks'),
+    State('tail-path', 'value'),
+    State('tail-from-end', 'value'),
+    State('tail-key', 'data'),
+    prevent_initial_call=True
+)
+def control_tail(start_clicks, stop_clicks, path, from_end, old_key):
+    if old_key:
+        tail_states.delete(f"tail:{old_key}")
+    if ctx.triggered_id == 'tail-stop-btn':
+        return None, None, no_update, no_update, True, False, True
+    try:
+        tail = StatsTail(resolve_tail_path(path or ''), from_end=bool(from_end))
+    except (OSError, ValueError) as e:
+        return None, None, [], dbc.Alert(f"Cannot follow {path}: {e}", color='danger'), True, False, True
+    # The tail's state is shared on disk, so any worker can serve the next
+    # refresh; the interval does the parsing
+    key = uuid.uuid4().hex
+    tail_states.set(f"tail:{key}", (tail, 0), expire=TAIL_STATE_TTL)
+    return key, 0, [], tail_summary(tail), False, True, False
+
+@app.callback(
+    Output('tail-table', 'data', allow_duplicate=True),
+    Output('tail-summary', 'children', allow_duplicate=True),
+    Output('tail-seq', 'data', allow_duplicate=True),
+    Output('tail-interval', 'disabled', allow_duplicate=True),
+    Output('tail-start-btn', 'disabled', allow_duplicate=True),
+    Output('tail-stop-btn', 'disabled', allow_duplicate=True),
+    Input('tail-interval', 'n_intervals'),
+    State('tail-key', 'data'),
+    State('tail-seq', 'data'),
+    prevent_initial_call=True
+)
+def refresh_tail(n_intervals, key, seq):
+    if not key:
+        return no_update, no_update, no_update, no_update, no_update, no_update
+    # One refresh per tail at a time: a poll can take longer than the
+    # interval, and overlapping ones would parse and append the same rows
+    lock = f"lock:{key}"
+    if not tail_states.add(lock, True, expire=600):
+        return no_update, no_update, no_update, no_update, no_update, no_update
+    try:
+        state = tail_states.get(f"tail:{key}")
+        if state is None:
+            message = dbc.Alert("This tail has expired or was stopped; press Follow to start again.",
+                                color='warning')
+            return no_update, message, None, True, False, True
+        tail, previous_seq = state
+        offset = tail.offset
+        known = len(tail.tables)
+        update = tail.poll(max_bytes=TAIL_POLL_BYTES)
+        advanced = tail.offset != offset or update.reset
+        server_seq = previous_seq + advanced
+        if advanced:
+            tail_states.set(f"tail:{key}", (tail, server_seq), expire=TAIL_STATE_TTL)
+        else:
+            tail_states.touch(f"tail:{key}", expire=TAIL_STATE_TTL)
+    finally:
+        tail_states.delete(lock)
+
+    # A patch only applies on top of the rows of the previous version; if the
+    # browser missed or dropped a response it gets the (few) rows in full
+    if update.reset or seq != previous_seq:
+        return tail_rows(tail), tail_summary(tail), server_seq, no_update, no_update, no_update
+    if not advanced:
+        return no_update, no_update, no_update, no_update, no_update, no_update
+    if not update.changed:
+        return no_update, tail_summary(tail), server_seq, no_update, no_update, no_update
+
+    # Send only the rows that changed; new tables are appended in order
+    rows = Patch()
+    for position in update.changed:
+        if position < known:
+            rows[position] = tail_row(tail, position)
+        else:
+            rows.append(tail_row(tail, position))
+    return rows, tail_summary(tail), server_seq, no_update, no_update, no_update
 
 if __name__ == "__main__":
     app.run(debug=True, host='0.0.0.0', port=8050)
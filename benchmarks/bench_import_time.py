@@ -0,0 +1,78 @@
+"""Cold-start import benchmark for the modules of the sqlstatistics package.
+
+Imports each module in a fresh interpreter under ``python -X importtime``
+and reports its cumulative import time, best of ``--repeat`` runs. Exits
+non-zero when a module goes over its budget or pulls in one of the heavy
+packages the core is meant to load lazily (pandas, Dash, plotting, ...).
+tests/test_import_time.py runs the same check as part of the test suite;
+run this script for the timings themselves:
+
+    python benchmarks/bench_import_time.py
+    python benchmarks/bench_import_time.py --budget-scale 2 --repeat 5
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+# Cumulative import time budgets in milliseconds
+BUDGETS = {
+    'sqlstatistics.stats_lines': 30,
+    'sqlstatistics.timing': 30,
+    'sqlstatistics.parse_stats': 60,
+    'sqlstatistics.parse_execution_plan': 60,
+    'sqlstatistics.parse_cache': 40,
+    'sqlstatistics.stats_store': 80,
+    'sqlstatistics.cli': 30,
+}
+
+HEAVY_MODULES = ['pandas', 'numpy', 'dash', 'plotly', 'flask', 'matplotlib', 'seaborn',
+                 'IPython', 'multiprocessing']
+
+def measure(module):
+    """Return (cumulative import ms, heavy modules loaded) for one cold import."""
+    check = (f"import sys, {module}; "
+             f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', check],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    cumulative = None
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        parts = line.split('|')
+        if len(parts) == 3 and parts[2].strip() == module:
+            cumulative = int(parts[1]) / 1000
+    loaded = [m for m in result.stdout.strip().split(',') if m]
+    return cumulative, loaded
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('modules', nargs='*', default=list(BUDGETS))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--budget-scale', type=float, default=1.0,
+                        help="Multiply every budget, e.g. on slow CI machines")
+    args = parser.parse_args(argv)
+
+    failures = []
+    for module in args.modules:
+        runs = [measure(module) for _ in range(args.repeat)]
+        best = min(ms for ms, _ in runs)
+        loaded = runs[0][1]
+        budget = BUDGETS.get(module, 100) * args.budget_scale
+        status = 'ok'
+        if best > budget:
+            status = f'over budget ({budget:.0f} ms)'
+        if loaded:
+            status = f"imports {', '.join(loaded)}"
+        if status != 'ok':
+            failures.append(module)
+        print(f"{module:36} {best:8.1f} ms  {status}")
+
+    if failures:
+        print(f"Import time regressions: {', '.join(failures)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
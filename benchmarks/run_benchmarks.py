@@ -0,0 +1,228 @@
+"""Benchmark harness for the parsers and the app's callback rendering paths.
+
+Generates deterministic synthetic inputs (see synthetic.py), then for each
+case records wall-clock latency over ``--repeat`` runs, throughput in the
+case's natural unit (lines or operators per second) and the peak of traced
+Python allocations from one extra run under tracemalloc. Results are written
+as JSON; given a baseline file, every case's median latency and peak memory
+are compared against it and the run fails when either grew by more than
+``--threshold``.
+
+    python benchmarks/run_benchmarks.py --preset small --output baseline.json
+    python benchmarks/run_benchmarks.py --preset small --baseline baseline.json --threshold 0.2
+
+The app cases import app.py and so need the Dash extras; they are skipped
+when Dash is not installed or with ``--no-app``.
+"""
+import argparse
+import atexit
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import synthetic
+
+PRESETS = {
+    'small': {'queries': 2_000, 'tables': 5, 'statements': 5, 'depth': 6, 'fanout': 2},
+    'medium': {'queries': 50_000, 'tables': 5, 'statements': 20, 'depth': 8, 'fanout': 2},
+    'large': {'queries': 500_000, 'tables': 8, 'statements': 50, 'depth': 10, 'fanout': 2},
+}
+
+@dataclass
+class Case:
+    name: str
+    run: Callable[[], object]
+    units: int
+    unit: str
+    # Called before every run, outside the timed region
+    setup: Optional[Callable[[], None]] = None
+
+@dataclass
+class Result:
+    median_s: float
+    min_s: float
+    max_s: float
+    throughput: float
+    unit: str
+    peak_bytes: int
+
+def measure(case: Case, repeat: int) -> Result:
+    timings = []
+    for _ in range(repeat + 1):
+        if case.setup:
+            case.setup()
+        start = time.perf_counter()
+        case.run()
+        timings.append(time.perf_counter() - start)
+    # The first run warms imports and caches and is not counted
+    timings = timings[1:]
+
+    if case.setup:
+        case.setup()
+    tracemalloc.start()
+    try:
+        case.run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    median = statistics.median(timings)
+    return Result(median_s=median, min_s=min(timings), max_s=max(timings),
+                  throughput=case.units / median if median else 0.0,
+                  unit=case.unit, peak_bytes=peak)
+
+def parser_cases(stats_text: str, stats_lines: int, plan_xml: str, operators: int) -> List[Case]:
+    from sqlstatistics.parse_execution_plan import parse_execution_plan
+    from sqlstatistics.parse_stats import parse_stats_text, parse_stats_text_columns
+
+    return [
+        Case('parse_stats_text', lambda: parse_stats_text(stats_text), stats_lines, 'lines'),
+        Case('parse_stats_text_columns', lambda: parse_stats_text_columns(stats_text), stats_lines, 'lines'),
+        Case('parse_execution_plan', lambda: parse_execution_plan(plan_xml), operators, 'operators'),
+    ]
+
+def app_cases(stats_text: str, stats_lines: int, plan_xml: str, operators: int) -> List[Case]:
+    # Keep the benchmark's caches away from a real deployment's
+    workdir = tempfile.mkdtemp(prefix='sqlstatistics-bench-')
+    atexit.register(shutil.rmtree, workdir, ignore_errors=True)
+    os.environ['PARSE_CACHE_PATH'] = os.path.join(workdir, 'cache.sqlite')
+    os.environ['BACKGROUND_JOBS_PATH'] = os.path.join(workdir, 'jobs')
+    # Every callback logs its stage timings at INFO; keep them out of the report
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+    import app
+    from sqlstatistics.parse_cache import content_key
+    from plotly.io.json import to_json_plotly
+
+    def render(result):
+        # A callback is only done once its output is serialised for the browser
+        if isinstance(result, str) and result.startswith('Error'):
+            raise RuntimeError(result)
+        return to_json_plotly(result)
+
+    def no_progress(progress):
+        pass
+
+    stats_key = content_key(stats_text)
+    plan_key = content_key(plan_xml)
+    page = (0, app.PAGE_SIZE, [], '')
+
+    def warm():
+        render(app.analyze_stats(no_progress, 1, stats_text))
+        render(app.analyze_execution_plan(no_progress, 1, plan_xml))
+
+    return [
+        Case('app.analyze_stats (cold)', lambda: render(app.analyze_stats(no_progress, 1, stats_text)),
+             stats_lines, 'lines', setup=app.parse_cache.clear),
+        Case('app.analyze_stats (cached)', lambda: render(app.analyze_stats(no_progress, 1, stats_text)),
+             stats_lines, 'lines', setup=warm),
+        Case('app.page_queries', lambda: render(app.page_queries(*page, stats_key)),
+             app.PAGE_SIZE, 'rows', setup=warm),
+        Case('app.analyze_execution_plan (cold)',
+             lambda: render(app.analyze_execution_plan(no_progress, 1, plan_xml)),
+             operators, 'operators', setup=app.parse_cache.clear),
+        Case('app.analyze_execution_plan (cached)',
+             lambda: render(app.analyze_execution_plan(no_progress, 1, plan_xml)),
+             operators, 'operators', setup=warm),
+        Case('app.page_operations', lambda: render(app.page_operations(*page, plan_key)),
+             app.PAGE_SIZE, 'rows', setup=warm),
+    ]
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """Print each case against the baseline; return the regressed case names."""
+    regressions = []
+    print(f"\n{'case':40} {'time':>8} {'memory':>8}")
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:40} {'new':>8}")
+            continue
+        time_ratio = result['median_s'] / base['median_s'] if base['median_s'] else 1.0
+        memory_ratio = result['peak_bytes'] / base['peak_bytes'] if base['peak_bytes'] else 1.0
+        regressed = time_ratio > 1 + threshold or memory_ratio > 1 + threshold
+        if regressed:
+            regressions.append(name)
+        print(f"{name:40} {time_ratio:7.2f}x {memory_ratio:7.2f}x{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--preset', choices=list(PRESETS), default='small')
+    for name in PRESETS['small']:
+        parser.add_argument(f'--{name}', type=int, help=f"Override the preset's {name}")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--only', help="Run only cases whose name contains this text")
+    parser.add_argument('--no-app', action='store_true', help="Skip the app.py callback cases")
+    parser.add_argument('--output', help="Write results to this JSON file")
+    parser.add_argument('--baseline', help="Compare against results from an earlier run")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="Allowed relative growth of latency or memory over the baseline")
+    args = parser.parse_args(argv)
+
+    shape = dict(PRESETS[args.preset])
+    for name in shape:
+        if getattr(args, name) is not None:
+            shape[name] = getattr(args, name)
+
+    stats_text = synthetic.stats_capture(shape['queries'], shape['tables'], args.seed)
+    stats_lines = stats_text.count('\n')
+    plan_xml = synthetic.showplan(shape['statements'], shape['depth'], shape['fanout'], args.seed)
+    operators = synthetic.operator_count(shape['statements'], shape['depth'], shape['fanout'])
+    print(f"STATISTICS IO: {stats_lines:,} lines, {len(stats_text) / 2**20:,.1f} MiB; "
+          f"showplan: {operators:,} operators, {len(plan_xml) / 2**20:,.1f} MiB")
+
+    cases = parser_cases(stats_text, stats_lines, plan_xml, operators)
+    if not args.no_app:
+        try:
+            cases += app_cases(stats_text, stats_lines, plan_xml, operators)
+        except ImportError as e:
+            print(f"Skipping app cases: {e}")
+    if args.only:
+        cases = [case for case in cases if args.only in case.name]
+
+    results = {}
+    print(f"\n{'case':40} {'median':>9} {'min':>9} {'max':>9} {'throughput':>24} {'peak':>10}")
+    for case in cases:
+        result = measure(case, args.repeat)
+        results[case.name] = asdict(result)
+        print(f"{case.name:40} {result.median_s:8.3f}s {result.min_s:8.3f}s {result.max_s:8.3f}s "
+              f"{result.throughput:12,.0f} {result.unit + '/s':<11} {result.peak_bytes / 2**20:8.1f}MiB")
+
+    report = {
+        'created': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'preset': args.preset,
+        'shape': shape,
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get('shape') != shape:
+            print(f"Warning: baseline was recorded with a different shape: {baseline.get('shape')}")
+        regressions = compare(results, baseline['results'], args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) regressed by more than {args.threshold:.0%}")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+"""Deterministic synthetic inputs for the parser benchmarks.
+
+STATISTICS IO captures are ``queries`` blocks of ``tables`` table lines
+each, cycling through the classic, 2019+ page server and columnstore
+segment layouts. Showplans hold ``statements`` statements whose operator
+trees are ``depth`` levels deep with ``fanout`` children per operator,
+with consistent subtree costs, Object references on the leaves and,
+optionally, actual runtime counters, missing index suggestions and spill
+warnings. The same arguments and seed always
+produce the same text.
+
+    python benchmarks/synthetic.py stats capture.txt --queries 10000 --tables 5
+    python benchmarks/synthetic.py plan plan.sqlplan --statements 10 --depth 8 --fanout 2
+"""
+import argparse
+import random
+from typing import Iterator, List, Optional, Tuple
+
+SHOWPLAN_NS = 'http://schemas.microsoft.com/sqlserver/2004/07/showplan'
+
+CLASSIC = ("Table '{0}'. Scan count 1, logical reads {1}, physical reads 0, read-ahead reads {2}, "
+           "lob logical reads 0, lob physical reads 0, lob read-ahead reads 0.\n")
+PAGE_SERVER = ("Table '{0}'. Scan count 1, logical reads {1}, physical reads 0, page server reads 0, "
+               "read-ahead reads {2}, page server read-ahead reads 0, lob logical reads 0, "
+               "lob physical reads 0, lob page server reads 0, lob read-ahead reads 0, "
+               "lob page server read-ahead reads 0.\n")
+SEGMENT = "Table '{0}'. Segment reads {1}, segment skipped {2}.\n"
+
+def table_names(count: int) -> List[str]:
+    return [f"Table{i}" for i in range(count)]
+
+def iter_stats_capture(queries: int, tables: int, seed: int = 0,
+                       table_pool: int = 100) -> Iterator[str]:
+    """Yield the lines of a capture with ``queries`` blocks of ``tables`` table lines."""
+    rng = random.Random(seed)
+    names = table_names(max(table_pool, tables))
+    for query in range(queries):
+        for t, name in enumerate(rng.sample(names, tables)):
+            template = (CLASSIC, PAGE_SERVER, SEGMENT)[(query + t) % 3]
+            yield template.format(name, rng.randrange(100_000), rng.randrange(1_000))
+        yield f"({rng.randrange(10_000)} rows affected)\n"
+        seconds = query % 86_400
+        yield (f"Completion time: 2024-03-01T{seconds // 3600:02}:{seconds // 60 % 60:02}:"
+               f"{seconds % 60:02}.{rng.randrange(10_000_000):07}+01:00\n")
+        yield "\n"
+
+def stats_capture(queries: int, tables: int, seed: int = 0, table_pool: int = 100) -> str:
+    return ''.join(iter_stats_capture(queries, tables, seed, table_pool))
+
+def write_stats_capture(path: str, queries: int, tables: int, seed: int = 0,
+                        table_pool: int = 100) -> int:
+    """Write a capture to ``path`` and return its line count."""
+    lines = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        for line in iter_stats_capture(queries, tables, seed, table_pool):
+            f.write(line)
+            lines += 1
+    return lines
+
+# Physical operation -> showplan element, by number of children
+_LEAF_OPS = [('Clustered Index Seek', 'IndexScan'), ('Index Seek', 'IndexScan'),
+             ('Clustered Index Scan', 'IndexScan'), ('Index Scan', 'IndexScan'),
+             ('Table Scan', 'TableScan')]
+_UNARY_OPS = [('Sort', 'Sort'), ('Compute Scalar', 'ComputeScalar'), ('Filter', 'Filter'),
+              ('Stream Aggregate', 'StreamAggregate')]
+_JOIN_OPS = [('Nested Loops', 'NestedLoops', 'Inner Join'), ('Hash Match', 'Hash', 'Inner Join'),
+             ('Merge Join', 'Merge', 'Inner Join')]
+
+class _PlanWriter:
+    def __init__(self, rng: random.Random, depth: int, fanout: int, actual: bool, tables: int,
+                 advice: Optional[random.Random] = None):
+        self.rng = rng
+        self.advice = advice
+        self.depth = depth
+        self.fanout = fanout
+        self.actual = actual
+        self.tables = table_names(tables)
+        self.node_id = 0
+
+    def rel_op(self, level: int) -> Tuple[List[str], float, int]:
+        # Returns the operator's XML fragments, subtree cost and actual rows
+        rng = self.rng
+        node_id = self.node_id
+        self.node_id += 1
+        children = []
+        if level < self.depth and self.fanout:
+            children = [self.rel_op(level + 1) for _ in range(self.fanout)]
+
+        if not children:
+            physical, element = rng.choice(_LEAF_OPS)
+            logical = physical.replace('Clustered ', '')
+        elif len(children) == 1:
+            physical, element = rng.choice(_UNARY_OPS)
+            logical = physical
+        elif len(children) == 2:
+            physical, element, logical = rng.choice(_JOIN_OPS)
+        else:
+            physical = logical = element = 'Concatenation'
+
+        rows = rng.randint(1, 100_000)
+        io_cost = round(rng.uniform(0, 2) if not children else 0.0, 6)
+        cpu_cost = round(rng.uniform(0.0001, 1), 6)
+        subtree_cost = io_cost + cpu_cost + sum(cost for _, cost, _ in children)
+        parallel = int(rng.random() < 0.2)
+
+        parts = [f'<RelOp NodeId="{node_id}" PhysicalOp="{physical}" LogicalOp="{logical}" '
+                 f'EstimateRows="{rows}" EstimateIO="{io_cost}" EstimateCPU="{cpu_cost}" '
+                 f'AvgRowSize="{rng.randint(7, 400)}" EstimatedTotalSubtreeCost="{subtree_cost:.6f}" '
+                 f'Parallel="{parallel}" EstimateRebinds="0" EstimateRewinds="0">'
+                 '<OutputList><ColumnReference Column="Id"/></OutputList>']
+        if self.advice is not None and physical in ('Sort', 'Hash Match') and self.advice.random() < 0.1:
+            parts.append('<Warnings><SpillToTempDb SpillLevel="1" SpilledThreadCount="1"/></Warnings>')
+        actual_rows = 0
+        if self.actual:
+            # Mostly close to the estimate, sometimes far off, so misestimates show up
+            actual_rows = rows if rng.random() < 0.8 else rows * rng.choice([0, 10, 1000])
+            threads = 1 + parallel * 3
+            parts.append('<RunTimeInformation>')
+            for thread in range(threads):
+                parts.append(
+                    f'<RunTimeCountersPerThread Thread="{thread}" ActualRows="{actual_rows // threads}" '
+                    f'ActualExecutions="1" ActualExecutionMode="Row" ActualElapsedms="{rng.randint(0, 500)}" '
+                    f'ActualCPUms="{rng.randint(0, 500)}" ActualLogicalReads="{rng.randint(0, 5_000)}" '
+                    f'ActualPhysicalReads="{rng.randint(0, 50)}"/>'
+                )
+            parts.append('</RunTimeInformation>')
+        parts.append(f'<{element}>')
+        if not children:
+            table = rng.choice(self.tables)
+            parts.append(f'<Object Database="[Bench]" Schema="[dbo]" Table="[{table}]" '
+                         f'Index="[IX_{table}_{rng.randrange(4)}]" IndexKind="NonClustered"/>')
+        for child_parts, _, _ in children:
+            parts.extend(child_parts)
+        parts.append(f'</{element}></RelOp>')
+        return parts, subtree_cost, actual_rows
+
+def _missing_index(rng: random.Random, tables: int) -> str:
+    table = f"Table{rng.randrange(tables)}"
+    columns = [f"Col{i}" for i in rng.sample(range(10), 4)]
+    groups = [('EQUALITY', columns[:1]), ('INEQUALITY', columns[1:2] if rng.random() < 0.5 else []),
+              ('INCLUDE', columns[2:])]
+    return (f'<MissingIndexes><MissingIndexGroup Impact="{rng.uniform(10, 99):.2f}">'
+            f'<MissingIndex Database="[Bench]" Schema="[dbo]" Table="[{table}]">'
+            + ''.join(f'<ColumnGroup Usage="{usage}">'
+                      + ''.join(f'<Column Name="[{column}]"/>' for column in group) + '</ColumnGroup>'
+                      for usage, group in groups if group)
+            + '</MissingIndex></MissingIndexGroup></MissingIndexes>')
+
+def iter_showplan(statements: int, depth: int, fanout: int, seed: int = 0,
+                  actual: bool = True, tables: int = 100, advice: bool = True) -> Iterator[str]:
+    """Yield the XML of a showplan, one statement at a time.
+
+    With ``advice`` some statements carry a missing index suggestion and
+    some sorts and hash matches a spill warning, drawn from a separate
+    random stream so the operator trees do not change.
+    """
+    rng = random.Random(seed)
+    advice_rng = random.Random(seed + 1) if advice else None
+    yield (f'<ShowPlanXML xmlns="{SHOWPLAN_NS}" Version="1.564" Build="16.0.1000.6">'
+           '<BatchSequence><Batch><Statements>')
+    for statement in range(1, statements + 1):
+        writer = _PlanWriter(rng, depth, fanout, actual, tables, advice_rng)
+        parts, cost, _ = writer.rel_op(0)
+        yield (f'<StmtSimple StatementText="SELECT /* statement {statement} */ * FROM dbo.Table{statement % tables}" '
+               f'StatementId="{statement}" StatementCompId="{statement}" StatementType="SELECT" '
+               f'StatementSubTreeCost="{cost:.6f}" StatementEstRows="{rng.randint(1, 100_000)}">'
+               '<QueryPlan DegreeOfParallelism="1" CachedPlanSize="64">')
+        if advice_rng is not None and advice_rng.random() < 0.3:
+            yield _missing_index(advice_rng, min(tables, 10))
+        if actual:
+            granted = rng.randint(1_024, 1_048_576)
+            yield (f'<MemoryGrantInfo SerialRequiredMemory="512" SerialDesiredMemory="{granted}" '
+                   f'RequestedMemory="{granted}" GrantedMemory="{granted}" '
+                   f'MaxUsedMemory="{rng.randint(0, granted)}"/>'
+                   f'<QueryTimeStats CpuTime="{rng.randint(0, 10_000)}" '
+                   f'ElapsedTime="{rng.randint(0, 20_000)}"/>')
+        yield ''.join(parts)
+        yield '</QueryPlan></StmtSimple>'
+    yield '</Statements></Batch></BatchSequence></ShowPlanXML>'
+
+def showplan(statements: int, depth: int, fanout: int, seed: int = 0,
+             actual: bool = True, tables: int = 100, advice: bool = True) -> str:
+    return ''.join(iter_showplan(statements, depth, fanout, seed, actual, tables, advice))
+
+def operator_count(statements: int, depth: int, fanout: int) -> int:
+    """Number of RelOps in a showplan with the given shape."""
+    per_statement = depth + 1 if fanout == 1 else (fanout ** (depth + 1) - 1) // (fanout - 1)
+    return statements * per_statement
+
+def write_showplan(path: str, statements: int, depth: int, fanout: int, seed: int = 0,
+                   actual: bool = True, tables: int = 100, advice: bool = True) -> int:
+    """Write a showplan to ``path`` and return its operator count."""
+    with open(path, 'w', encoding='utf-8') as f:
+        for part in iter_showplan(statements, depth, fanout, seed, actual, tables, advice):
+            f.write(part)
+    return operator_count(statements, depth, fanout)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seed', type=int, default=0)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    stats = commands.add_parser('stats', help="Write a STATISTICS IO capture")
+    stats.add_argument('path')
+    stats.add_argument('--queries', type=int, default=10_000)
+    stats.add_argument('--tables', type=int, default=5, help="Table lines per query")
+
+    plan = commands.add_parser('plan', help="Write a showplan")
+    plan.add_argument('path')
+    plan.add_argument('--statements', type=int, default=10)
+    plan.add_argument('--depth', type=int, default=8)
+    plan.add_argument('--fanout', type=int, default=2)
+    plan.add_argument('--estimated', action='store_true', help="Leave out actual runtime counters")
+
+    args = parser.parse_args(argv)
+    if args.command == 'stats':
+        lines = write_stats_capture(args.path, args.queries, args.tables, args.seed)
+        print(f"Wrote {lines:,} lines to {args.path}")
+    else:
+        operators = write_showplan(args.path, args.statements, args.depth, args.fanout,
+                                   args.seed, not args.estimated)
+        print(f"Wrote {operators:,} operators to {args.path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""Parsers for SQL Server STATISTICS IO output and execution plans.
+
+The modules are imported on their own (``from sqlstatistics.parse_stats
+import iter_stats``); this package imports nothing, so a worker pays only
+for the parsers it uses. pandas is needed by the frame builders and the
+plan reports, pyarrow by workload Parquet output.
+"""
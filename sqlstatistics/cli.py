@@ -0,0 +1,118 @@
+"""Command line entry point for the sqlstatistics parsers.
+
+Only argparse and the stdlib parsers are imported at startup; pandas is
+loaded by the subcommands that build frames, and Dash is never imported.
+
+    sqlstatistics stats capture.txt more.txt
+    sqlstatistics follow running-script.txt
+    sqlstatistics plan query.sqlplan --top 10
+    sqlstatistics workload plans/ --output report/
+    sqlstatistics store --db stats.sqlite ingest captures/
+"""
+import argparse
+import sys
+
+def _stats(args):
+    from .parse_stats import iter_stats
+    from .stats_lines import COUNTER_COLUMNS
+
+    totals = {}
+    queries = 0
+    for path in args.paths:
+        for query in iter_stats(path):
+            queries += 1
+            for table in query.tables:
+                row = totals.setdefault(table.table_name, [0] * len(COUNTER_COLUMNS))
+                for i, column in enumerate(COUNTER_COLUMNS):
+                    row[i] += getattr(table, column)
+
+    columns = ['scan_count', 'logical_reads', 'physical_reads', 'read_ahead_reads']
+    indexes = [COUNTER_COLUMNS.index(column) for column in columns]
+    ranked = sorted(totals.items(), key=lambda item: item[1][indexes[1]], reverse=True)
+    width = max([len('table')] + [len(name) for name in totals])
+    print('table'.ljust(width), *(column.rjust(16) for column in columns))
+    for name, row in ranked[:args.top]:
+        print(name.ljust(width), *(str(row[i]).rjust(16) for i in indexes))
+    print(f"{queries} queries, {len(totals)} tables")
+
+def _follow(args):
+    from .parse_stats import follow_stats
+    from .stats_lines import COUNTER_COLUMNS
+
+    logical_reads = COUNTER_COLUMNS.index('logical_reads')
+    try:
+        for tail, update in follow_stats(args.path, args.interval, args.from_end):
+            if update.reset:
+                print(f"{args.path} was truncated or replaced, starting over")
+            changed = ', '.join(f"{tail.tables[i]}={tail.totals[i][logical_reads]}" for i in update.changed)
+            print(f"+{update.queries} queries ({tail.queries} total); logical reads: {changed}", flush=True)
+    except KeyboardInterrupt:
+        pass
+
+def _plan(args):
+    from .parse_execution_plan import parse_execution_plan_file
+
+    df = parse_execution_plan_file(args.path)
+    columns = ['Statement ID', 'Node ID', 'Physical Operation', 'Table', 'Index',
+               'Estimated Rows', 'Self Cost', 'Cost %']
+    print(df.nlargest(args.top, 'Self Cost')[columns].to_string(index=False))
+    print(f"{df['Statement ID'].nunique()} statements, {len(df)} operators")
+
+def _workload(args):
+    from .plan_workload import main as workload_main
+
+    workload_main(args.args)
+
+def _store(args):
+    from .stats_store import main as store_main
+
+    store_main(args.args)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='sqlstatistics',
+                                     description="Parse SQL Server STATISTICS IO output and execution plans.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    stats = commands.add_parser('stats', help="Per-table I/O totals of STATISTICS IO captures")
+    stats.add_argument('paths', nargs='+')
+    stats.add_argument('--top', type=int, default=20, help="Number of tables to show")
+    stats.set_defaults(handler=_stats)
+
+    follow = commands.add_parser('follow', help="Follow a capture that is still being written")
+    follow.add_argument('path')
+    follow.add_argument('--interval', type=float, default=1.0, help="Seconds between polls")
+    follow.add_argument('--from-end', action='store_true', help="Ignore the blocks already written")
+    follow.set_defaults(handler=_follow)
+
+    plan = commands.add_parser('plan', help="Most expensive operators of a .sqlplan file")
+    plan.add_argument('path')
+    plan.add_argument('--top', type=int, default=20, help="Number of operators to show")
+    plan.set_defaults(handler=_plan)
+
+    # Everything after 'workload' or 'store' is handed to that module's CLI untouched
+    workload = commands.add_parser('workload', add_help=False,
+                                   help="Rank operators across directories of plans (see sqlstatistics workload --help)")
+    workload.set_defaults(handler=_workload)
+
+    store = commands.add_parser('store', add_help=False,
+                                help="Persistent capture store (see sqlstatistics store --help)")
+    store.set_defaults(handler=_store)
+
+    args, extra = parser.parse_known_args(argv)
+    if args.command in ('workload', 'store'):
+        args.args = extra
+    elif extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    try:
+        args.handler(args)
+    except ImportError as e:
+        # Other missing extras say themselves what to install
+        hint = ""
+        if isinstance(e, ModuleNotFoundError) and e.name in ('pandas', 'numpy'):
+            hint = ". Install the pandas extra: pip install 'sqlstatistics[pandas]'"
+        parser.exit(1, f"{parser.prog} {args.command}: {e}{hint}\n")
+    except (OSError, ValueError) as e:
+        parser.exit(1, f"{parser.prog} {args.command}: {e}\n")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,142 @@
+"""Content-addressed cache for parsed analyzer inputs.
+
+Entries are keyed by a SHA-256 of the pasted text and stored pickled in a
+SQLite file, so every gunicorn worker on the host shares the same entries
+and hit/miss counters; SQLite's locking serialises concurrent writers.
+Eviction is least-recently-used, bounded by both entry count and total
+pickled size. Pass ``path=None`` for a private in-memory cache.
+
+Entries are unpickled, so anyone who can write the file can run code in
+the app: keep it in a directory only the app's user can write, such as
+private_cache_dir().
+"""
+import contextlib
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional
+
+from .sqlite_files import connection
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO counters (name, value) VALUES ('hits', 0), ('misses', 0);
+"""
+
+def private_cache_dir(name: str = 'sqlstatistics') -> str:
+    """Per-user cache directory under $XDG_CACHE_HOME (or ~/.cache), created with mode 0700.
+
+    Raises PermissionError if it already exists but belongs to someone else
+    or can be written by other users.
+    """
+    base = os.getenv('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    path = os.path.join(base, name)
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    if hasattr(os, 'getuid'):
+        stat = os.stat(path)
+        if stat.st_uid != os.getuid() or stat.st_mode & 0o022:
+            raise PermissionError(f"{path} must be owned by this user and not writable by others")
+    return path
+
+def content_key(text: str) -> str:
+    """Hex SHA-256 of the pasted text."""
+    return hashlib.sha256(text.encode('utf-8', errors='surrogatepass')).hexdigest()
+
+class ParseCache:
+    def __init__(self, path: Optional[str], max_entries: int = 64, max_bytes: int = 512 * 2**20):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._memory = None
+        if path is None:
+            self._memory = sqlite3.connect(':memory:', check_same_thread=False)
+        with self._connect() as conn:
+            if path is not None:
+                conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(_SCHEMA)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        # The in-memory database cannot be reopened, so it is the one kept open
+        if self._memory is not None:
+            with self._lock, self._memory:
+                yield self._memory
+            return
+        with connection(self.path) as conn:
+            yield conn
+
+    def get(self, key: str, default=None):
+        with self._connect() as conn:
+            row = conn.execute('SELECT value FROM entries WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                conn.execute("UPDATE counters SET value = value + 1 WHERE name = 'misses'")
+                return default
+            conn.execute('UPDATE entries SET accessed = ? WHERE key = ?', (time.time(), key))
+            conn.execute("UPDATE counters SET value = value + 1 WHERE name = 'hits'")
+        return pickle.loads(row[0])
+
+    def set(self, key: str, value):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            return
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO entries (key, value, size, accessed) VALUES (?, ?, ?, ?)',
+                (key, blob, len(blob), time.time())
+            )
+            # Evict least recently used entries beyond either bound
+            conn.execute(
+                'DELETE FROM entries WHERE key IN ('
+                ' SELECT key FROM entries ORDER BY accessed DESC LIMIT -1 OFFSET ?)',
+                (self.max_entries,)
+            )
+            conn.execute(
+                'DELETE FROM entries WHERE key IN ('
+                ' SELECT key FROM (SELECT key, SUM(size) OVER (ORDER BY accessed DESC) AS running'
+                ' FROM entries) WHERE running > ?)',
+                (self.max_bytes,)
+            )
+
+    def get_or_compute(self, key: str, compute: Callable[[], object]):
+        """Return the cached value for ``key``, computing and storing it on a miss.
+
+        Exceptions from ``compute`` propagate and nothing is stored.
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def stats(self) -> dict:
+        with self._connect() as conn:
+            counters = dict(conn.execute('SELECT name, value FROM counters'))
+            entries, size = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries').fetchone()
+        lookups = counters['hits'] + counters['misses']
+        return {
+            'hits': counters['hits'],
+            'misses': counters['misses'],
+            'hit_rate': counters['hits'] / lookups if lookups else 0.0,
+            'entries': entries,
+            'bytes': size,
+        }
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute('DELETE FROM entries')
+            conn.execute('UPDATE counters SET value = 0')
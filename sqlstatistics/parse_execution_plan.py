@@ -0,0 +1,551 @@
+import xml.etree.ElementTree as ET
+import itertools
+import logging
+import math
+import os
+import re
+from array import array
+from dataclasses import dataclass
+from typing import Callable, Iterator, List, Optional, Tuple, Union
+
+from .text_encoding import detect_encoding
+from .timing import span
+
+logger = logging.getLogger(__name__)
+
+SHOWPLAN_NS = 'http://schemas.microsoft.com/sqlserver/2004/07/showplan'
+_STMT_SIMPLE = f'{{{SHOWPLAN_NS}}}StmtSimple'
+_REL_OP = f'{{{SHOWPLAN_NS}}}RelOp'
+_NS = {'sp': SHOWPLAN_NS}
+
+# Per-thread runtime counters, summed across threads, and the statement-level
+# runtime attributes; elapsed time is the slowest thread's, since threads
+# run concurrently
+_THREAD_SUM_COUNTERS = ['ActualRows', 'ActualExecutions', 'ActualCPUms', 'ActualLogicalReads',
+                        'ActualPhysicalReads']
+_STATEMENT_RUNTIME = {
+    'QueryTimeStats': {'CpuTime': 'StatementCPUms', 'ElapsedTime': 'StatementElapsedms'},
+    'MemoryGrantInfo': {'RequestedMemory': 'RequestedMemoryKB', 'GrantedMemory': 'GrantedMemoryKB',
+                        'MaxUsedMemory': 'MaxUsedMemoryKB'},
+}
+
+# Size of the pieces fed to the XML parser
+CHUNK_SIZE = 1 << 16
+
+def _text_chunks(content: str, progress: Optional[Callable[[float], None]] = None) -> Iterator[str]:
+    for start in range(0, len(content), CHUNK_SIZE):
+        yield content[start:start + CHUNK_SIZE]
+        if progress is not None:
+            progress(min(start + CHUNK_SIZE, len(content)) / len(content))
+
+def _buffer_chunks(view: memoryview, progress: Optional[Callable[[float], None]] = None) -> Iterator[memoryview]:
+    # Slices of the caller's buffer; nothing is copied before expat reads it
+    for start in range(0, len(view), CHUNK_SIZE):
+        yield view[start:start + CHUNK_SIZE]
+        if progress is not None:
+            progress(min(start + CHUNK_SIZE, len(view)) / len(view))
+
+def _stream_chunks(stream) -> Iterator[memoryview]:
+    # expat copies what it is fed, so one buffer is reused for every read
+    readinto = getattr(stream, 'readinto', None)
+    if readinto is None:
+        yield from iter(lambda: stream.read(CHUNK_SIZE), stream.read(0))
+        return
+    buffer = memoryview(bytearray(CHUNK_SIZE))
+    while True:
+        count = readinto(buffer)
+        if not count:
+            return
+        yield buffer[:count]
+
+def _file_chunks(source) -> Iterator[memoryview]:
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            yield from _stream_chunks(f)
+    else:
+        yield from _stream_chunks(source)
+
+# Plans copied out of SSMS keep their encoding="utf-16" declaration when saved as UTF-8
+_DECLARED_ENCODING = re.compile(rb'<\?xml[^>]*?encoding\s*=\s*["\']([A-Za-z0-9._-]+)["\']')
+_EXPAT_ENCODINGS = {'utf-8': 'UTF-8', 'utf-16-le': 'UTF-16LE', 'utf-16-be': 'UTF-16BE'}
+
+def _xml_encoding(head) -> Optional[str]:
+    """The encoding expat should use for bytes starting with ``head``, or None for the declared one."""
+    encoding, bom = detect_encoding(bytes(head[:4]))
+    if bom or encoding != 'utf-8':
+        return _EXPAT_ENCODINGS[encoding]
+    # Other ASCII-compatible declarations (ISO-8859-1, windows-1252) are honoured
+    declared = _DECLARED_ENCODING.match(bytes(head[:256]).lstrip())
+    if declared and declared.group(1).lower().startswith((b'utf-16', b'ucs-2', b'unicode')):
+        return 'UTF-8'
+    return None
+
+def _detect_chunks(chunks: Iterator) -> Tuple[Optional[str], Iterator]:
+    # Peeks at the first chunk, which is still fed to the parser first
+    first = next(chunks, b'')
+    return _xml_encoding(first), itertools.chain([first], chunks)
+
+class _ChunkReader:
+    # The file object iterparse reads from: each read returns the next chunk
+    # as is, whatever size was asked for
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+
+    def read(self, size=-1):
+        return next(self._chunks, b'')
+
+def _iter_events(chunks, encoding: Optional[str] = None):
+    # An explicit encoding overrides the XML declaration
+    return ET.iterparse(_ChunkReader(chunks), events=('start', 'end'),
+                        parser=ET.XMLParser(encoding=encoding))
+
+def _to_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+def _to_int(value, default: int = -1) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+class PlanTree:
+    """Array-backed RelOp tree, one row per operator in document order.
+
+    ``parent[i]`` is the row of operator ``i``'s parent (-1 for a statement
+    root) and always precedes ``i``. ``self_cost`` is the operator's own
+    cost: its EstimatedTotalSubtreeCost minus that of its direct children.
+    """
+
+    def __init__(self):
+        self.node_id = array('q')
+        self.parent = array('q')
+        self.depth = array('q')
+        self.statement_id = []
+        self.subtree_cost = array('d')
+        self.self_cost = array('d')
+        self._child_cost = array('d')
+        self._children = None
+
+    def __len__(self) -> int:
+        return len(self.node_id)
+
+    def add(self, node_id: int, parent: int, depth: int, statement_id, subtree_cost: float) -> int:
+        self.node_id.append(node_id)
+        self.parent.append(parent)
+        self.depth.append(depth)
+        self.statement_id.append(statement_id)
+        self.subtree_cost.append(subtree_cost)
+        self.self_cost.append(subtree_cost)
+        self._child_cost.append(0.0)
+        self._children = None
+        return len(self.node_id) - 1
+
+    def close(self, index: int):
+        # Called once all children of ``index`` have been added and closed
+        cost = self.subtree_cost[index]
+        if not math.isnan(cost):
+            # Costs are rounded in the XML, so clamp tiny negatives to zero
+            self.self_cost[index] = max(cost - self._child_cost[index], 0.0)
+            if self.parent[index] >= 0:
+                self._child_cost[self.parent[index]] += cost
+
+    def children(self, index: int) -> List[int]:
+        if self._children is None:
+            self._children = [[] for _ in range(len(self))]
+            for child, parent in enumerate(self.parent):
+                if parent >= 0:
+                    self._children[parent].append(child)
+        return self._children[index]
+
+    def roots(self) -> List[int]:
+        return [i for i, parent in enumerate(self.parent) if parent < 0]
+
+    @classmethod
+    def from_frame(cls, df) -> 'PlanTree':
+        """Rebuild the tree from a frame returned by parse_execution_plan."""
+        tree = cls()
+        rows = {}
+        for node_id, stmt_id, parent_id, depth, cost in zip(
+                df['Node ID'], df['Statement ID'], df['Parent Node ID'], df['Depth'], df['Subtree Cost']):
+            parent = rows.get((stmt_id, parent_id), -1) if depth > 0 else -1
+            index = tree.add(_to_int(node_id), parent, int(depth), stmt_id, float(cost))
+            rows[(stmt_id, node_id)] = index
+        for index in reversed(range(len(tree))):
+            tree.close(index)
+        return tree
+
+def _runtime_counters(rel_op) -> dict:
+    counters = dict.fromkeys(_THREAD_SUM_COUNTERS + ['ActualElapsedms'], math.nan)
+    threads = rel_op.findall('sp:RunTimeInformation/sp:RunTimeCountersPerThread', _NS)
+    for name in _THREAD_SUM_COUNTERS:
+        values = [_to_float(thread.get(name)) for thread in threads if thread.get(name) is not None]
+        if values:
+            counters[name] = sum(values)
+    elapsed = [_to_float(thread.get('ActualElapsedms')) for thread in threads
+               if thread.get('ActualElapsedms') is not None]
+    if elapsed:
+        counters['ActualElapsedms'] = max(elapsed)
+    # Row or Batch; batch mode operators time only their own work
+    counters['ActualExecutionMode'] = next(
+        (thread.get('ActualExecutionMode') for thread in threads if thread.get('ActualExecutionMode')), None
+    )
+    return counters
+
+_OBJECT_ATTRIBUTES = {
+    'Database': 'ObjectDatabase',
+    'Schema': 'ObjectSchema',
+    'Table': 'ObjectTable',
+    'Index': 'ObjectIndex',
+    'Alias': 'ObjectAlias',
+}
+
+def _operator_object(rel_op) -> dict:
+    # The object a scan/seek/lookup/DML operator touches sits under its own
+    # operator element; nested RelOps are deeper and already cleared
+    element = rel_op.find('sp:*/sp:Object', _NS)
+    return {
+        column: element.get(attribute, '').strip('[]') or None if element is not None else None
+        for attribute, column in _OBJECT_ATTRIBUTES.items()
+    }
+
+_SCAN_TYPES = {'EQ': '=', 'NE': '<>', 'LT': '<', 'LE': '<=', 'GT': '>', 'GE': '>=',
+               'IS': 'IS', 'ISNOT': 'IS NOT'}
+# Residual predicates of scans, seeks, filters and joins
+_PREDICATE_PATHS = ['sp:*/sp:Predicate/sp:ScalarOperator', 'sp:Hash/sp:ProbeResidual/sp:ScalarOperator',
+                    'sp:Merge/sp:Residual/sp:ScalarOperator']
+
+def _column_name(reference) -> str:
+    table = '.'.join(filter(None, (reference.get(part) for part in ('Database', 'Schema', 'Table'))))
+    column = f"[{reference.get('Column', '')}]"
+    return f"{table}.{column}" if table else column
+
+def _operator_predicates(rel_op) -> dict:
+    # Seek keys come as column/expression pairs under each range element
+    # (Prefix, StartRange, EndRange); residual predicates as ScalarStrings
+    seeks = []
+    for ranges in rel_op.iterfind('sp:*/sp:SeekPredicates', _NS):
+        for keys in ranges.iter():
+            scan_type = keys.get('ScanType')
+            if scan_type is None:
+                continue
+            columns = keys.findall('sp:RangeColumns/sp:ColumnReference', _NS)
+            values = keys.findall('sp:RangeExpressions/sp:ScalarOperator', _NS)
+            operator = _SCAN_TYPES.get(scan_type, scan_type)
+            seeks.extend(f"{_column_name(column)} {operator} {value.get('ScalarString', '?')}"
+                         for column, value in zip(columns, values))
+    residual = [element.get('ScalarString') for path in _PREDICATE_PATHS
+                for element in rel_op.iterfind(path, _NS) if element.get('ScalarString')]
+    seek = ' AND '.join(seeks) or None
+    predicate = ' AND '.join(residual) or None
+    return {
+        'SeekPredicate': seek,
+        'Predicate': predicate,
+        'ImplicitConversion': 'CONVERT_IMPLICIT' in f"{seek} {predicate}",
+    }
+
+def _missing_indexes(stmt) -> List[dict]:
+    # One record per suggested index, carrying its group's estimated impact
+    suggestions = []
+    for group in stmt.iterfind('sp:QueryPlan/sp:MissingIndexes/sp:MissingIndexGroup', _NS):
+        impact = _to_float(group.get('Impact'))
+        for index in group.iterfind('sp:MissingIndex', _NS):
+            suggestion = {
+                'Impact': impact,
+                'Database': index.get('Database', '').strip('[]') or None,
+                'Schema': index.get('Schema', '').strip('[]') or None,
+                'Table': index.get('Table', '').strip('[]') or None,
+                'Equality': [],
+                'Inequality': [],
+                'Include': [],
+            }
+            for columns in index.iterfind('sp:ColumnGroup', _NS):
+                usage = columns.get('Usage', '').capitalize()
+                if usage in suggestion:
+                    suggestion[usage].extend(column.get('Name', '').strip('[]')
+                                             for column in columns.iterfind('sp:Column', _NS))
+            suggestions.append(suggestion)
+    return suggestions
+
+# Warning elements by the kind they are reported as; boolean attributes of
+# the Warnings element itself are listed separately
+_WARNING_KINDS = {
+    'SpillToTempDb': 'Spill',
+    'SortSpillDetails': 'Spill',
+    'HashSpillDetails': 'Spill',
+    'ExchangeSpillDetails': 'Spill',
+    'SpillOccurred': 'Spill',
+    'PlanAffectingConvert': 'Implicit Conversion',
+    'MemoryGrantWarning': 'Memory Grant',
+    'WaitForMemoryGrant': 'Memory Grant',
+    'ColumnsWithNoStatistics': 'No Statistics',
+    'UnmatchedIndexes': 'Unmatched Indexes',
+}
+_WARNING_FLAGS = {
+    'NoJoinPredicate': 'No Join Predicate',
+    'SpatialGuess': 'Spatial Guess',
+    'UnmatchedIndexes': 'Unmatched Indexes',
+    'FullUpdateForOnlineIndexBuild': 'Full Update For Online Index Build',
+}
+
+def _warnings(element) -> List[dict]:
+    # element is a RelOp's or QueryPlan's Warnings child, if any
+    if element is None:
+        return []
+    # UnmatchedIndexes is both a flag and an element listing the indexes;
+    # the element, when present, stands for both
+    children = {child.tag.rpartition('}')[2] for child in element}
+    found = [{'Kind': kind, 'Detail': None} for attribute, kind in _WARNING_FLAGS.items()
+             if element.get(attribute) in ('1', 'true') and attribute not in children]
+    for child in element:
+        tag = child.tag.rpartition('}')[2]
+        if tag == 'PlanAffectingConvert':
+            detail = f"{child.get('ConvertIssue')}: {child.get('Expression')}"
+        elif tag == 'ColumnsWithNoStatistics':
+            detail = ', '.join(_column_name(column) for column in child.iterfind('sp:ColumnReference', _NS))
+        else:
+            detail = ', '.join(f"{name}={value}" for name, value in child.attrib.items()) or None
+        found.append({'Kind': _WARNING_KINDS.get(tag, tag), 'Detail': detail})
+    return found
+
+def warning_text(warnings: List[dict]) -> Optional[str]:
+    """One line per operator or statement: "Kind: detail; Kind; ..."."""
+    return '; '.join(f"{w['Kind']}: {w['Detail']}" if w['Detail'] else w['Kind'] for w in warnings) or None
+
+def _statement_runtime(stmt) -> dict:
+    runtime = {}
+    for tag, attributes in _STATEMENT_RUNTIME.items():
+        element = stmt.find(f'sp:QueryPlan/sp:{tag}', _NS)
+        for attribute, column in attributes.items():
+            runtime[column] = _to_float(element.get(attribute)) if element is not None else math.nan
+    return runtime
+
+def _collect_plan(chunks, encoding: Optional[str] = None):
+    """Walk a showplan in a single streaming, depth-first pass.
+
+    Statement and RelOp attributes are read as their start tags arrive;
+    actual runtime counters, accessed objects, predicates, warnings and
+    missing index suggestions as their end tags arrive. Each RelOp is
+    attached to the innermost enclosing StmtSimple and RelOp, so operators
+    of nested statements are never counted twice. Each RelOp is cleared at
+    its end tag and each StmtSimple is detached from its parent once
+    handled, so peak memory is bounded by the largest statement rather than
+    by the whole document.
+    """
+    stats = []
+    statements = []
+    tree = PlanTree()
+    # Enclosing StmtSimple rows with their open RelOp rows, innermost last
+    frames = []
+    open_elements = []
+
+    for event, elem in _iter_events(chunks, encoding):
+        if event == 'start':
+            if elem.tag == _STMT_SIMPLE:
+                frames.append((len(statements), []))
+                statements.append({
+                    'StatementId': _to_int(elem.get('StatementId'), None),
+                    'StatementType': elem.get('StatementType'),
+                    'StatementText': elem.get('StatementText')
+                })
+            elif elem.tag == _REL_OP and frames:
+                statement, rel_ops = frames[-1]
+                # Extract basic statistics
+                stats.append({
+                    'StatementIndex': statement,
+                    'PhysicalOp': elem.get('PhysicalOp'),
+                    'LogicalOp': elem.get('LogicalOp'),
+                    'EstimateRows': _to_float(elem.get('EstimateRows')),
+                    # EstimateRows is per execution; the first one is neither a rebind nor a rewind
+                    'EstimateExecutions': 1 + sum(_to_float(elem.get(name, 0))
+                                                  for name in ('EstimateRebinds', 'EstimateRewinds')),
+                    'EstimateCPU': _to_float(elem.get('EstimateCPU')),
+                    'EstimateIO': _to_float(elem.get('EstimateIO')),
+                    'AvgRowSize': _to_float(elem.get('AvgRowSize')),
+                    'Parallel': elem.get('Parallel') in ('1', 'true')
+                })
+                rel_ops.append(tree.add(
+                    _to_int(elem.get('NodeId')),
+                    rel_ops[-1] if rel_ops else -1,
+                    len(rel_ops),
+                    statements[statement]['StatementId'],
+                    _to_float(elem.get('EstimatedTotalSubtreeCost'))
+                ))
+            open_elements.append(elem)
+            continue
+
+        open_elements.pop()
+        if elem.tag == _REL_OP:
+            if frames and frames[-1][1]:
+                index = frames[-1][1].pop()
+                tree.close(index)
+                stats[index].update(_runtime_counters(elem))
+                stats[index].update(_operator_object(elem))
+                stats[index].update(_operator_predicates(elem))
+                stats[index]['Warnings'] = _warnings(elem.find('sp:Warnings', _NS))
+            elem.clear()
+        elif elem.tag == _STMT_SIMPLE:
+            statement = statements[frames.pop()[0]]
+            statement.update(_statement_runtime(elem))
+            statement['MissingIndexes'] = _missing_indexes(elem)
+            statement['Warnings'] = _warnings(elem.find('sp:QueryPlan/sp:Warnings', _NS))
+            elem.clear()
+            if open_elements:
+                open_elements[-1].remove(elem)
+
+    return stats, statements, tree
+
+def _error_context(content: str, lineno: int, column: int, width: int = 80) -> str:
+    # At most ``width`` characters either side of the error and a caret under
+    # it; plans from query_plan columns are a single multi-megabyte line
+    start = 0
+    for _ in range(lineno - 1):
+        start = content.find('\n', start) + 1
+        if start == 0:
+            return ''
+    first = start + max(0, column - width)
+    last = content.find('\n', first, start + column + width)
+    snippet = content[first:last if last != -1 else start + column + width]
+    return snippet + '\n' + ' ' * (start + column - first) + '^'
+
+@dataclass
+class PlanRecords:
+    """The single pass's output as plain Python objects, before any pandas work.
+
+    ``operators`` holds one dict per RelOp in document order (rows of
+    ``tree``), including its ``Warnings``; ``statements`` one per StmtSimple,
+    including its ``MissingIndexes`` suggestions and ``Warnings``.
+    """
+    operators: List[dict]
+    statements: List[dict]
+    tree: PlanTree
+
+def read_plan(content: Union[str, bytes, bytearray, memoryview],
+              progress: Optional[Callable[[float], None]] = None) -> PlanRecords:
+    """Parse showplan XML held in memory without building a DataFrame.
+
+    ``content`` is either text or the bytes of a plan file (anything with
+    the buffer protocol, including an mmap); bytes are fed to the parser in
+    place, in their detected encoding. ``progress``, if given, is called
+    with the fraction of the input consumed so far after each chunk is fed
+    to the parser.
+    """
+    encoding = None
+    if isinstance(content, str):
+        logger.debug("First 200 characters of XML content: %s", content[:200])
+        chunks = _text_chunks(content, progress)
+    else:
+        view = memoryview(content).cast('B')
+        encoding = _xml_encoding(view[:256])
+        chunks = _buffer_chunks(view, progress)
+    try:
+        with span('read_plan'):
+            return PlanRecords(*_collect_plan(chunks, encoding))
+    except ET.ParseError as e:
+        # Left to the caller to report; only the context is logged here
+        if isinstance(content, str) and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("XML Parse Error: %s\n%s", e, _error_context(content, *e.position))
+        raise ValueError(f"Error parsing execution plan: {str(e)}")
+
+def read_plan_file(source) -> PlanRecords:
+    """Stream showplan XML from a path or binary file object without pandas.
+
+    The document is never held in memory as a whole; see _collect_plan.
+    UTF-16 files as saved by SSMS and UTF-8 ones are both read as is.
+    """
+    try:
+        with span('read_plan_file'):
+            encoding, chunks = _detect_chunks(_file_chunks(source))
+            return PlanRecords(*_collect_plan(chunks, encoding))
+    except ET.ParseError as e:
+        raise ValueError(f"Error parsing execution plan: {str(e)}")
+
+def plan_frame(records: PlanRecords):
+    """Build the per-operator DataFrame parse_execution_plan returns."""
+    with span('plan_frame'):
+        return _build_frame(records.operators, records.statements, records.tree)
+
+def parse_execution_plan(content, progress=None):
+    """Parse showplan XML held in a string or bytes into a per-operator DataFrame."""
+    return plan_frame(read_plan(content, progress))
+
+def parse_execution_plan_file(source):
+    """Stream showplan XML from a path or binary file object into a DataFrame."""
+    return plan_frame(read_plan_file(source))
+
+# Repeated per operator, so stored as categoricals
+_CATEGORY_COLUMNS = ['StatementType', 'StatementText', 'PhysicalOp', 'LogicalOp', 'ObjectDatabase',
+                     'ObjectSchema', 'ObjectTable', 'ObjectIndex', 'ObjectAlias', 'SeekPredicate',
+                     'Predicate', 'Warnings', 'ActualExecutionMode']
+_STATEMENT_RUNTIME_COLUMNS = [column for attributes in _STATEMENT_RUNTIME.values()
+                              for column in attributes.values()]
+
+def _build_frame(stats, statements, tree):
+    # pandas is only needed for the frame; the pull parser itself is stdlib-only
+    import numpy as np
+    import pandas as pd
+
+    try:
+        if not stats:
+            raise ValueError("No execution plan statistics found in the XML file")
+        
+        # Convert to DataFrames
+        df_stats = pd.DataFrame(stats)
+        df_statements = pd.DataFrame(statements)
+        
+        # Attach the tree structure; parents always precede their children.
+        # Ids are nullable integers, with -1 marking a missing NodeId
+        node_ids = np.frombuffer(tree.node_id, dtype=np.int64)
+        parent = np.frombuffer(tree.parent, dtype=np.int64)
+        parent_ids = node_ids[np.maximum(parent, 0)]
+        df_stats['NodeId'] = pd.array(node_ids, dtype='Int64')
+        df_stats.loc[node_ids < 0, 'NodeId'] = pd.NA
+        df_stats['ParentNodeId'] = pd.array(parent_ids, dtype='Int64')
+        df_stats.loc[(parent < 0) | (parent_ids < 0), 'ParentNodeId'] = pd.NA
+        df_stats['Depth'] = np.frombuffer(tree.depth, dtype=np.int64)
+        df_stats['SubtreeCost'] = np.frombuffer(tree.subtree_cost, dtype=np.float64)
+        df_stats['SelfCost'] = np.frombuffer(tree.self_cost, dtype=np.float64)
+        
+        # Attach statement attributes by position rather than merging on id
+        statement_rows = df_statements.take(df_stats.pop('StatementIndex').to_numpy())
+        df_stats['StatementId'] = pd.array(statement_rows['StatementId'].to_numpy(), dtype='Int64')
+        for column in ['StatementType', 'StatementText'] + _STATEMENT_RUNTIME_COLUMNS:
+            df_stats[column] = statement_rows[column].to_numpy()
+        
+        # Each operator's own cost as a share of its statement's total cost
+        statement_cost = df_stats.groupby(statement_rows.index.to_numpy(), sort=False)['SelfCost'].transform('sum')
+        df_stats['CostPercentage'] = (df_stats['SelfCost'] / statement_cost * 100).fillna(0).round(2)
+        
+        df_stats['Warnings'] = [warning_text(warnings) for warnings in df_stats['Warnings']]
+        df_stats[_CATEGORY_COLUMNS] = df_stats[_CATEGORY_COLUMNS].astype('category')
+        
+        # Format the output
+        df_stats = df_stats[['NodeId', 'StatementId', 'StatementType', 'StatementText', 
+                           'PhysicalOp', 'LogicalOp', 'ObjectDatabase', 'ObjectSchema',
+                           'ObjectTable', 'ObjectIndex', 'ObjectAlias', 'SeekPredicate', 'Predicate',
+                           'ImplicitConversion', 'Warnings', 'EstimateRows', 'EstimateExecutions',
+                           'EstimateCPU', 'EstimateIO', 'AvgRowSize', 'Parallel', 'CostPercentage',
+                           'ParentNodeId', 'Depth', 'SubtreeCost', 'SelfCost',
+                           'ActualRows', 'ActualExecutions', 'ActualExecutionMode', 'ActualElapsedms',
+                           'ActualCPUms', 'ActualLogicalReads', 'ActualPhysicalReads',
+                           'StatementCPUms', 'StatementElapsedms',
+                           'RequestedMemoryKB', 'GrantedMemoryKB', 'MaxUsedMemoryKB']]
+        
+        # Rename columns for better readability
+        df_stats.columns = ['Node ID', 'Statement ID', 'Statement Type', 'Statement Text',
+                          'Physical Operation', 'Logical Operation', 'Database', 'Schema',
+                          'Table', 'Index', 'Alias', 'Seek Predicate', 'Predicate',
+                          'Implicit Conversion', 'Warnings', 'Estimated Rows', 'Estimated Executions',
+                          'CPU Cost', 'IO Cost', 'Avg Row Size', 'Parallel', 'Cost %',
+                          'Parent Node ID', 'Depth', 'Subtree Cost', 'Self Cost',
+                          'Actual Rows', 'Actual Executions', 'Actual Execution Mode', 'Actual Elapsed ms',
+                          'Actual CPU ms', 'Actual Logical Reads', 'Actual Physical Reads',
+                          'Statement CPU ms', 'Statement Elapsed ms',
+                          'Requested Memory KB', 'Granted Memory KB', 'Max Used Memory KB']
+        
+        return df_stats
+    
+    except Exception as e:
+        raise ValueError(f"Error parsing execution plan: {str(e)}")
@@ -0,0 +1,525 @@
+import contextlib
+import io
+import logging
+import math
+import mmap
+import os
+import time
+from array import array
+from dataclasses import dataclass
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+from datetime import datetime
+
+from .stats_lines import COMPLETION_TIME, COUNTER_COLUMNS, ROWS_AFFECTED, TABLE, match_line
+from .text_encoding import HEAD_SIZE, detect_encoding, detect_file_encoding, is_binary_stream, open_text
+from .timing import span
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class TableStats:
+    table_name: str
+    scan_count: int
+    logical_reads: int
+    physical_reads: int
+    read_ahead_reads: int
+    lob_logical_reads: int
+    lob_physical_reads: int
+    lob_read_ahead_reads: int
+    page_server_reads: int = 0
+    page_server_read_ahead_reads: int = 0
+    lob_page_server_reads: int = 0
+    lob_page_server_read_ahead_reads: int = 0
+    segment_reads: int = 0
+    segment_skipped: int = 0
+
+@dataclass
+class QueryStats:
+    tables: List[TableStats]
+    rows_affected: List[int]
+    completion_time: datetime
+
+Block = Tuple[List[Tuple[str, Tuple[int, ...]]], List[int], Optional[datetime]]
+
+def _iter_blocks(lines: Iterable[str]) -> Iterator[Block]:
+    # Yields (tables, rows_affected, completion_time) per query block, where
+    # tables is a list of (table_name, counters) tuples in COUNTER_COLUMNS order
+    tables = []
+    rows_affected = []
+    completion_time = None
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            # A blank line ends the current query block
+            if tables or rows_affected or completion_time:
+                yield tables, rows_affected, completion_time
+            tables = []
+            rows_affected = []
+            completion_time = None
+            continue
+
+        matched = match_line(line)
+        if matched is None:
+            logger.debug("Skipping unrecognised line: %s", line)
+            continue
+        kind, value = matched
+        if kind == TABLE:
+            tables.append(value)
+        elif kind == ROWS_AFFECTED:
+            rows_affected.append(value)
+        elif kind == COMPLETION_TIME:
+            completion_time = value
+
+    if tables or rows_affected or completion_time:
+        yield tables, rows_affected, completion_time
+
+# A path, bytes-like object, binary file or iterable of text lines
+StatsSource = Union[str, os.PathLike, bytes, bytearray, memoryview, BinaryIO, Iterable[str]]
+
+def _open_lines(file_or_stream):
+    # Anything not already text is decoded as it is read, see text_encoding
+    if isinstance(file_or_stream, (str, os.PathLike, bytes, bytearray, memoryview)) or is_binary_stream(file_or_stream):
+        return open_text(file_or_stream)
+    return contextlib.nullcontext(file_or_stream)
+
+def iter_stats(file_or_stream: StatsSource) -> Iterator[QueryStats]:
+    """Yield each QueryStats as soon as its blank-line terminated block ends.
+
+    Accepts a file path, bytes, a binary file object (all decoded as UTF-8
+    or, given a BOM or the telltale zero bytes, UTF-16) or any iterable of
+    lines (an open text file, a StringIO, ...). Only the current block is
+    held in memory.
+    """
+    with _open_lines(file_or_stream) as lines:
+        for tables, rows_affected, completion_time in _iter_blocks(lines):
+            yield QueryStats(
+                tables=[TableStats(name, *counters) for name, counters in tables],
+                rows_affected=rows_affected,
+                completion_time=completion_time
+            )
+
+def parse_stats_file(file_path: str) -> List[QueryStats]:
+    return list(iter_stats(file_path))
+
+def parse_stats_text(text: str) -> List[QueryStats]:
+    # Lines are matched and turned into objects block by block, so this is one stage
+    with span('parse_stats_text'):
+        return list(iter_stats(io.StringIO(text)))
+
+class StatsFrame:
+    """Columnar STATISTICS IO result.
+
+    ``tables`` holds one row per ``Table '...'`` line: the 0-based ``query``
+    index, a categorical ``table_name`` and int64 counters. ``queries`` holds
+    one row per query block with its rows affected and completion time.
+    Indexing or iterating yields QueryStats views built on demand, so code
+    written against parse_stats_text keeps working.
+    """
+
+    def __init__(self, tables, queries):
+        self.tables = tables
+        self.queries = queries
+        import numpy as np
+        # Table rows are stored in query order, so each query owns a slice
+        self._offsets = np.searchsorted(
+            tables['query'].to_numpy(), np.arange(len(queries) + 1)
+        )
+
+    def __len__(self) -> int:
+        return len(self.queries)
+
+    def __getitem__(self, index: int) -> QueryStats:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('query index out of range')
+        rows = self.tables.iloc[self._offsets[index]:self._offsets[index + 1]]
+        names = rows['table_name'].tolist()
+        counters = rows[COUNTER_COLUMNS].to_numpy().tolist()
+        query = self.queries.iloc[index]
+        return QueryStats(
+            tables=[TableStats(name, *values) for name, values in zip(names, counters)],
+            rows_affected=query['rows_affected'],
+            completion_time=query['completion_time']
+        )
+
+    def __iter__(self) -> Iterator[QueryStats]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def table_totals(self):
+        """Sum the counters per table, in order of first appearance."""
+        return self.tables.groupby('table_name', observed=True, sort=False)[COUNTER_COLUMNS].sum()
+
+    def query_totals(self):
+        """Sum the counters per query; queries without tables get zeros."""
+        totals = self.tables.groupby('query')[COUNTER_COLUMNS].sum()
+        return totals.reindex(range(len(self)), fill_value=0)
+
+def parse_stats_columns(file_or_stream: StatsSource) -> StatsFrame:
+    """Parse STATISTICS IO output straight into a columnar StatsFrame.
+
+    No per-row TableStats objects are created: table names are interned to
+    categorical codes and counters are appended to int64 arrays.
+    """
+    query_index = array('q')
+    name_codes = array('q')
+    counters = [array('q') for _ in COUNTER_COLUMNS]
+    categories = {}
+    rows_affected = []
+    completion_times = []
+
+    with span('parse_stats_columns.scan'), _open_lines(file_or_stream) as lines:
+        for query, (tables, affected, completion_time) in enumerate(_iter_blocks(lines)):
+            for name, values in tables:
+                query_index.append(query)
+                name_codes.append(categories.setdefault(name, len(categories)))
+                for column, value in zip(counters, values):
+                    column.append(value)
+            rows_affected.append(affected)
+            completion_times.append(completion_time)
+
+    with span('parse_stats_columns.frame'):
+        return _stats_frame(query_index, name_codes, list(categories), counters, rows_affected, completion_times)
+
+def _stats_frame(query_index, name_codes, categories, counters, rows_affected, completion_times) -> StatsFrame:
+    # The one place the StatsFrame schema is set: int64 query index and
+    # counters, categorical table names, object query columns
+    import numpy as np
+    import pandas as pd
+
+    tables = pd.DataFrame({
+        'query': np.frombuffer(query_index, dtype=np.int64),
+        'table_name': pd.Categorical.from_codes(
+            # Typed explicitly so an empty frame's categories match and concat
+            np.frombuffer(name_codes, dtype=np.int64), categories=pd.Index(categories, dtype=str)
+        ),
+        **{
+            name: np.frombuffer(column, dtype=np.int64)
+            for name, column in zip(COUNTER_COLUMNS, counters)
+        }
+    })
+    queries = pd.DataFrame({
+        'rows_affected': pd.Series(rows_affected, dtype=object),
+        'completion_time': pd.Series(completion_times, dtype=object)
+    })
+    return StatsFrame(tables, queries)
+
+def parse_stats_text_columns(text: str) -> StatsFrame:
+    return parse_stats_columns(io.StringIO(text))
+
+def concat_stats_frames(frames: Sequence[StatsFrame]) -> StatsFrame:
+    """Concatenate StatsFrames, renumbering queries to follow on in order."""
+    import pandas as pd
+    from pandas.api.types import union_categoricals
+
+    if not frames:
+        return _stats_frame(array('q'), array('q'), [], [array('q') for _ in COUNTER_COLUMNS], [], [])
+    tables = []
+    offset = 0
+    for frame in frames:
+        tables.append(frame.tables.assign(query=frame.tables['query'] + offset))
+        offset += len(frame)
+    names = union_categoricals([t['table_name'] for t in tables])
+    merged = pd.concat(tables, ignore_index=True)
+    merged['table_name'] = pd.Categorical(names)
+    queries = pd.concat([frame.queries for frame in frames], ignore_index=True)
+    return StatsFrame(merged, queries)
+
+def _next_block_boundary(mm: mmap.mmap, offset: int) -> int:
+    # Skip to the next line start at or after offset, then past the next blank line
+    if offset == 0:
+        return 0
+    mm.seek(offset - 1)
+    if mm.read_byte() != ord('\n'):
+        mm.readline()
+    while True:
+        line = mm.readline()
+        if not line:
+            return len(mm)
+        if not line.strip():
+            return mm.tell()
+
+def _shard_bounds(path: str, shards: int) -> List[Tuple[int, int]]:
+    """Split a capture into up to ``shards`` byte ranges cut after blank lines."""
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        # Only called for UTF-8 captures; the shards start after any BOM
+        bounds = [detect_encoding(mm[:HEAD_SIZE])[1]]
+        for i in range(1, shards):
+            boundary = _next_block_boundary(mm, max(size * i // shards, bounds[-1]))
+            if boundary >= size:
+                break
+            if boundary > bounds[-1]:
+                bounds.append(boundary)
+        bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+def _iter_range_lines(path: str, start: int, end: int) -> Iterator[str]:
+    with open(path, 'rb') as f:
+        f.seek(start)
+        position = start
+        while position < end:
+            line = f.readline()
+            if not line:
+                break
+            position += len(line)
+            yield line.decode('utf-8', errors='replace')
+
+def _parse_shard(shard):
+    path, start, end, columnar = shard
+    lines = path if start is None else _iter_range_lines(path, start, end)
+    if columnar:
+        return parse_stats_columns(lines)
+    return list(iter_stats(lines))
+
+def parse_stats_parallel(paths: Union[str, os.PathLike, Sequence[Union[str, os.PathLike]]],
+                         workers: Optional[int] = None, columnar: bool = False):
+    """Parse one or more captures across a process pool.
+
+    Each file is cut at blank-line boundaries near evenly spaced byte
+    offsets, so every shard holds whole query blocks and can be parsed
+    independently; UTF-16 files are parsed whole by one worker. Shards of
+    all files are scheduled over the same pool and merged back in order.
+    Returns a merged QueryStats list (or StatsFrame when ``columnar`` is
+    set) for a single path, or a list of those, one per file, when given a
+    list of paths.
+    """
+    single = isinstance(paths, (str, os.PathLike))
+    paths = [os.fspath(paths)] if single else [os.fspath(p) for p in paths]
+    workers = workers or os.cpu_count() or 1
+
+    # Give each file a share of the shards proportional to its size
+    sizes = [os.path.getsize(path) for path in paths]
+    total_size = sum(sizes) or 1
+    shards = []
+    owners = []
+    for index, (path, size) in enumerate(zip(paths, sizes)):
+        if size and detect_file_encoding(path)[0] != 'utf-8':
+            # Blank lines are only found byte-wise in UTF-8; a UTF-16 capture is one shard
+            shards.append((path, None, None, columnar))
+            owners.append(index)
+            continue
+        count = min(workers, max(1, math.ceil(size * workers / total_size)))
+        for start, end in _shard_bounds(path, count):
+            shards.append((path, start, end, columnar))
+            owners.append(index)
+
+    per_file = [[] for _ in paths]
+    if workers == 1 or len(shards) <= 1:
+        results = map(_parse_shard, shards)
+        for owner, result in zip(owners, results):
+            per_file[owner].append(result)
+    else:
+        # Imported here so the single-process path never loads multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for owner, result in zip(owners, executor.map(_parse_shard, shards)):
+                per_file[owner].append(result)
+
+    if columnar:
+        merged = [concat_stats_frames(parts) for parts in per_file]
+    else:
+        merged = [[query for part in parts for query in part] for parts in per_file]
+    return merged[0] if single else merged
+
+TAIL_READ_SIZE = 8 * 2**20
+
+@dataclass
+class TailUpdate:
+    queries: int
+    # Positions in StatsTail.tables whose totals changed, ascending
+    changed: List[int]
+    # The file was truncated or replaced and the totals started over
+    reset: bool = False
+
+class StatsTail:
+    """Follow a growing STATISTICS IO capture, parsing only appended bytes.
+
+    Each poll() reads from where the previous one stopped to the current end
+    of file. A trailing partial line is held back as bytes and complete lines
+    are held until a blank line closes their block, so a block split across
+    reads is parsed once, when it is complete. ``tables`` and ``totals`` are
+    the running per-table counter sums (COUNTER_COLUMNS order) in order of
+    first appearance; only the tables of new blocks are touched. The file
+    may be UTF-8 or UTF-16, as detected from its first bytes.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], from_end: bool = False):
+        self.path = os.fspath(path)
+        self._reset()
+        if from_end:
+            self._seek_end()
+
+    def _reset(self):
+        self.offset = 0
+        self.queries = 0
+        self.tables: List[str] = []
+        self.totals: List[List[int]] = []
+        self._positions: Dict[str, int] = {}
+        self._identity = None
+        self._partial = b''
+        self._pending: List[str] = []
+        self._skip_to_block = False
+        # Detected from the first bytes of the file once there are enough
+        self._encoding: Optional[str] = None
+        self._newline = b'\n'
+
+    def _detect_encoding(self, f) -> int:
+        # Returns the length of the BOM, which the parsed bytes start after
+        f.seek(0)
+        self._encoding, bom = detect_encoding(f.read(HEAD_SIZE))
+        self._newline = '\n'.encode(self._encoding)
+        return bom
+
+    def _seek_end(self):
+        # Start after the existing content; if it stops mid-block, drop the
+        # rest of that block rather than counting it half
+        with open(self.path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            self._identity = (stat.st_dev, stat.st_ino)
+            self.offset = stat.st_size
+            if self.offset < HEAD_SIZE:
+                return
+            bom = self._detect_encoding(f)
+            # 4096 keeps a UTF-16 read aligned to whole code units
+            f.seek(max(bom, self.offset - 4096))
+            tail = f.read().decode(self._encoding, errors='replace')
+        self._skip_to_block = bool(tail) and (
+            not tail.endswith('\n') or bool(tail[:-1].rsplit('\n', 1)[-1].strip())
+        )
+
+    def poll(self, max_bytes: Optional[int] = None) -> TailUpdate:
+        """Parse whatever was appended since the previous poll.
+
+        With ``max_bytes`` at most that much is read; the rest is picked up
+        by later polls, which bounds the work done per call.
+        """
+        reset = False
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return TailUpdate(0, [])
+        identity = (stat.st_dev, stat.st_ino)
+        if self._identity is not None and (identity != self._identity or stat.st_size < self.offset):
+            logger.info("%s was truncated or replaced; restarting totals", self.path)
+            self._reset()
+            reset = True
+        self._identity = identity
+        if stat.st_size == self.offset or (self._encoding is None and stat.st_size < HEAD_SIZE):
+            return TailUpdate(0, [], reset)
+
+        queries = 0
+        changed = set()
+        stop = stat.st_size if max_bytes is None else min(stat.st_size, self.offset + max_bytes)
+        with open(self.path, 'rb') as f:
+            if self._encoding is None:
+                bom = self._detect_encoding(f)
+                self.offset = max(self.offset, bom)
+            f.seek(self.offset)
+            # Bounded reads keep a large backlog from being loaded at once
+            while self.offset < stop:
+                data = f.read(min(TAIL_READ_SIZE, stop - self.offset))
+                if not data:
+                    break
+                self.offset += len(data)
+                queries += self._feed(data, changed)
+        return TailUpdate(queries, sorted(changed), reset)
+
+    def _feed(self, data: bytes, changed: set) -> int:
+        data = self._partial + data
+        end = self._line_end(data)
+        self._partial = data[end:]
+        lines = data[:end].decode(self._encoding, errors='replace').split('\n')[:-1]
+
+        if self._skip_to_block:
+            blank = next((i for i, line in enumerate(lines) if not line.strip()), None)
+            if blank is None:
+                return 0
+            self._skip_to_block = False
+            lines = lines[blank + 1:]
+
+        # Only the new lines are searched for the last block boundary
+        cut = len(lines) - 1
+        while cut >= 0 and lines[cut].strip():
+            cut -= 1
+        if cut < 0:
+            self._pending.extend(lines)
+            return 0
+        complete = self._pending + lines[:cut + 1]
+        self._pending = lines[cut + 1:]
+        return self._add_blocks(complete, changed)
+
+    def _line_end(self, data: bytes) -> int:
+        # Just past the last newline; in UTF-16 it has to start on a code
+        # unit, and data always starts on one
+        unit = len(self._newline)
+        end = data.rfind(self._newline)
+        while end > 0 and end % unit:
+            end = data.rfind(self._newline, 0, end + unit - 1)
+        return end + unit if end >= 0 else 0
+
+    def flush(self) -> TailUpdate:
+        """Count the unfinished last block, e.g. once the writer has exited."""
+        lines = self._pending + ([self._partial.decode(self._encoding, errors='replace')] if self._partial else [])
+        self._pending = []
+        self._partial = b''
+        changed = set()
+        queries = self._add_blocks(lines, changed)
+        return TailUpdate(queries, sorted(changed))
+
+    def _add_blocks(self, lines: List[str], changed: set) -> int:
+        queries = 0
+        for tables, _, _ in _iter_blocks(lines):
+            queries += 1
+            for name, counters in tables:
+                position = self._positions.get(name)
+                if position is None:
+                    position = self._positions[name] = len(self.tables)
+                    self.tables.append(name)
+                    self.totals.append([0] * len(COUNTER_COLUMNS))
+                row = self.totals[position]
+                for i, value in enumerate(counters):
+                    row[i] += value
+                changed.add(position)
+        self.queries += queries
+        return queries
+
+def follow_stats(path: Union[str, os.PathLike], interval: float = 1.0,
+                 from_end: bool = False) -> Iterator[Tuple[StatsTail, TailUpdate]]:
+    """Poll a capture forever, yielding the tail after every poll that changed it."""
+    tail = StatsTail(path, from_end=from_end)
+    while True:
+        update = tail.poll()
+        if update.queries or update.reset:
+            yield tail, update
+        time.sleep(interval)
+
+if __name__ == "__main__":
+    # Example usage
+    stats = parse_stats_columns("fast statistics io.txt")
+    query_logical_reads = stats.query_totals()['logical_reads']
+    
+    # Print the parsed statistics
+    for i, query in enumerate(stats, 1):
+        print(f"\nQuery {i}:")
+        for table in query.tables:
+            print(f"\nTable: {table.table_name}")
+            print(f"  Scan count: {table.scan_count}")
+            print(f"  Logical reads: {table.logical_reads}")
+            print(f"  Physical reads: {table.physical_reads}")
+        
+        if query.rows_affected:
+            print(f"\nRows affected: {query.rows_affected}")
+        
+        if query.completion_time:
+            print(f"Completion time: {query.completion_time}")
+        
+        print(f"\nTotal logical reads for this query: {query_logical_reads.iloc[i - 1]}")
+    
+    print(f"\n{'='*50}")
+    print(f"Total logical reads across all queries: {stats.tables['logical_reads'].sum()}")
+    print(f"{'='*50}")
@@ -0,0 +1,127 @@
+"""Missing index recommendations and plan warnings from parsed plans.
+
+The same missing index is usually suggested by many statements, often in
+many plans, with columns listed in varying order and case. Suggestions are
+merged on a canonical key: the table plus the equality, inequality and
+included column sets, all case-folded. Each merged entry is ranked by its
+weighted impact, the statement cost times the suggested improvement summed
+over every statement that asked for it, the same measure SQL Server's
+missing index DMVs are usually ranked by.
+"""
+import math
+from typing import Iterable, List, Optional
+
+import pandas as pd
+
+from .parse_execution_plan import PlanRecords
+
+MISSING_INDEX_COLUMNS = ['Database', 'Schema', 'Table', 'Equality', 'Inequality', 'Include',
+                         'Statements', 'Plans', 'Avg Impact', 'Max Impact', 'Weighted Impact',
+                         'Create Statement']
+WARNING_COLUMNS = ['Statement ID', 'Node ID', 'Physical Operation', 'Kind', 'Detail']
+
+def missing_index_key(suggestion: dict) -> tuple:
+    """Canonical identity of a suggestion: table and column sets, case-folded."""
+    def fold(value):
+        return (value or '').lower()
+
+    return (
+        fold(suggestion['Database']), fold(suggestion['Schema']), fold(suggestion['Table']),
+        tuple(sorted(map(fold, suggestion['Equality']))),
+        tuple(sorted(map(fold, suggestion['Inequality']))),
+        tuple(sorted(map(fold, suggestion['Include']))),
+    )
+
+def create_index_statement(suggestion: dict) -> str:
+    keys = suggestion['Equality'] + suggestion['Inequality']
+    name = f"IX_{suggestion['Table']}_{'_'.join(keys)}"[:128]
+    table = '.'.join(f"[{part}]" for part in (suggestion['Database'], suggestion['Schema'], suggestion['Table'])
+                     if part)
+    statement = f"CREATE NONCLUSTERED INDEX [{name}] ON {table} ({', '.join(f'[{c}]' for c in keys)})"
+    if suggestion['Include']:
+        statement += f" INCLUDE ({', '.join(f'[{c}]' for c in suggestion['Include'])})"
+    return statement
+
+def statement_costs(records: PlanRecords) -> List[float]:
+    """Total estimated cost of each statement: the sum of its operators' own costs."""
+    costs = [0.0] * len(records.statements)
+    for operator, cost in zip(records.operators, records.tree.self_cost):
+        if not math.isnan(cost):
+            costs[operator['StatementIndex']] += cost
+    return costs
+
+class MissingIndexAdvisor:
+    """Deduplicated missing index suggestions across statements and plans.
+
+    Feed plans with add_plan(); advisors built in separate processes can be
+    combined with merge(). Only one entry per distinct index is kept, so
+    memory grows with the number of different suggestions, not plans.
+    """
+
+    def __init__(self):
+        # key -> [first suggestion seen, statements, plans, impact sum, max impact, weighted impact]
+        self._entries = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add_plan(self, records: PlanRecords, weight: float = 1.0):
+        """Add every suggestion in one plan; ``weight`` scales its statements' costs."""
+        seen = set()
+        for statement, cost in zip(records.statements, statement_costs(records)):
+            for suggestion in statement.get('MissingIndexes', []):
+                impact = 0.0 if math.isnan(suggestion['Impact']) else suggestion['Impact']
+                key = missing_index_key(suggestion)
+                entry = self._entries.setdefault(key, [suggestion, 0, 0, 0.0, 0.0, 0.0])
+                entry[1] += 1
+                entry[2] += key not in seen
+                entry[3] += impact
+                entry[4] = max(entry[4], impact)
+                entry[5] += cost * impact / 100 * weight
+                seen.add(key)
+
+    def merge(self, other: 'MissingIndexAdvisor'):
+        for key, (suggestion, statements, plans, impact, max_impact, weighted) in other._entries.items():
+            entry = self._entries.setdefault(key, [suggestion, 0, 0, 0.0, 0.0, 0.0])
+            entry[1] += statements
+            entry[2] += plans
+            entry[3] += impact
+            entry[4] = max(entry[4], max_impact)
+            entry[5] += weighted
+
+    def report(self, top: Optional[int] = None) -> pd.DataFrame:
+        """Suggestions ranked by weighted impact, with a CREATE INDEX statement each."""
+        rows = []
+        for suggestion, statements, plans, impact, max_impact, weighted in self._entries.values():
+            rows.append((
+                suggestion['Database'], suggestion['Schema'], suggestion['Table'],
+                ', '.join(suggestion['Equality']), ', '.join(suggestion['Inequality']),
+                ', '.join(suggestion['Include']), statements, plans, round(impact / statements, 2),
+                max_impact, weighted, create_index_statement(suggestion)
+            ))
+        df = pd.DataFrame(rows, columns=MISSING_INDEX_COLUMNS)
+        df = df.sort_values(['Weighted Impact', 'Avg Impact'], ascending=False, ignore_index=True)
+        return df if top is None else df.head(top)
+
+def missing_index_report(plans: Iterable[PlanRecords], top: Optional[int] = None) -> pd.DataFrame:
+    advisor = MissingIndexAdvisor()
+    for records in plans:
+        advisor.add_plan(records)
+    return advisor.report(top)
+
+def warnings_report(records: PlanRecords) -> pd.DataFrame:
+    """One row per warning; statement-level warnings have no Node ID."""
+    rows = []
+    for statement in records.statements:
+        for warning in statement.get('Warnings', []):
+            rows.append((statement['StatementId'], None, None, warning['Kind'], warning['Detail']))
+    for index, operator in enumerate(records.operators):
+        for warning in operator.get('Warnings', []):
+            statement = records.statements[operator['StatementIndex']]
+            node_id = records.tree.node_id[index]
+            rows.append((statement['StatementId'], node_id if node_id >= 0 else None, operator['PhysicalOp'],
+                         warning['Kind'], warning['Detail']))
+    df = pd.DataFrame(rows, columns=WARNING_COLUMNS)
+    df['Statement ID'] = df['Statement ID'].astype('Int64')
+    df['Node ID'] = df['Node ID'].astype('Int64')
+    return df
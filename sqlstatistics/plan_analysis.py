@@ -0,0 +1,83 @@
+"""Runtime reports over actual execution plans.
+
+All reports work column-wise on the frame returned by parse_execution_plan
+and return an empty frame for estimated-only plans, whose actual columns
+are all missing.
+"""
+import numpy as np
+import pandas as pd
+
+def has_runtime(df: pd.DataFrame) -> bool:
+    """True if the plan carries actual (post-execution) counters."""
+    return bool(df['Actual Rows'].notna().any())
+
+def misestimate_report(df: pd.DataFrame, top: int = 20) -> pd.DataFrame:
+    """Operators ranked by how far actual rows were from the estimate.
+
+    EstimateRows is per execution, so it is scaled by the estimated number
+    of executions (rebinds and rewinds plus one) before being compared with
+    the actual rows summed over all executions and threads; ActualExecutions
+    is itself summed over threads, so it would count a parallel operator's
+    DOP as executions. ``Misestimate Factor`` is the larger
+    of the two over the smaller (at least 1 row), so under- and
+    over-estimates rank together; ``Direction`` tells them apart.
+    """
+    df = df[df['Actual Rows'].notna()]
+    estimated = df['Estimated Rows'] * df['Estimated Executions']
+    actual = df['Actual Rows']
+    factor = np.maximum(actual, estimated) / np.maximum(np.minimum(actual, estimated), 1)
+    report = pd.DataFrame({
+        'Statement ID': df['Statement ID'],
+        'Node ID': df['Node ID'],
+        'Physical Operation': df['Physical Operation'],
+        'Estimated Rows': estimated,
+        'Actual Rows': actual,
+        'Misestimate Factor': factor.round(2),
+        'Direction': np.where(actual > estimated, 'under', 'over'),
+    })
+    return report.sort_values('Misestimate Factor', ascending=False).head(top).reset_index(drop=True)
+
+def elapsed_report(df: pd.DataFrame, top: int = 20) -> pd.DataFrame:
+    """Operators ranked by their own elapsed time.
+
+    Row-mode operators report elapsed time including their children, so
+    their ``Self Elapsed ms`` subtracts the slowest direct child. Batch-mode
+    operators already report only their own time and are taken as is.
+    Plans from before batch mode have no execution mode and are row mode.
+    """
+    df = df[df['Actual Elapsed ms'].notna()]
+    child_elapsed = df.groupby(['Statement ID', 'Parent Node ID'])['Actual Elapsed ms'].max()
+    slowest_child = pd.Series(
+        child_elapsed.reindex(pd.MultiIndex.from_arrays([df['Statement ID'], df['Node ID']])).to_numpy(),
+        index=df.index
+    ).fillna(0)
+    mode = df['Actual Execution Mode'].astype(object).fillna('Row')
+    slowest_child = slowest_child.where(mode == 'Row', 0)
+    report = pd.DataFrame({
+        'Statement ID': df['Statement ID'],
+        'Node ID': df['Node ID'],
+        'Physical Operation': df['Physical Operation'],
+        'Execution Mode': mode,
+        'Actual Elapsed ms': df['Actual Elapsed ms'],
+        'Self Elapsed ms': (df['Actual Elapsed ms'] - slowest_child).clip(lower=0),
+        'Actual CPU ms': df['Actual CPU ms'],
+        'Actual Logical Reads': df['Actual Logical Reads'],
+    })
+    return report.sort_values('Self Elapsed ms', ascending=False).head(top).reset_index(drop=True)
+
+def memory_grant_report(df: pd.DataFrame) -> pd.DataFrame:
+    """Requested, granted and used query memory per statement."""
+    statements = df.drop_duplicates('Statement ID')
+    statements = statements[statements['Granted Memory KB'].notna()]
+    granted = statements['Granted Memory KB']
+    used = statements['Max Used Memory KB']
+    report = pd.DataFrame({
+        'Statement ID': statements['Statement ID'],
+        'Statement Type': statements['Statement Type'],
+        'Requested Memory KB': statements['Requested Memory KB'],
+        'Granted Memory KB': granted,
+        'Max Used Memory KB': used,
+        'Unused Grant KB': granted - used,
+        'Grant Used %': (used / granted.where(granted > 0) * 100).round(2),
+    })
+    return report.sort_values('Unused Grant KB', ascending=False).reset_index(drop=True)
@@ -0,0 +1,69 @@
+"""Join STATISTICS IO table reads to the plan operators that touch each table.
+
+STATISTICS IO names tables bare ('Orders', or a padded '#temp____...0001'
+for temp tables) while showplan Objects carry bracketed, schema-qualified
+names, so both sides are reduced to a lower-cased bare table name and
+joined with a hashed merge rather than by scanning operators per table.
+"""
+import re
+
+import pandas as pd
+
+from .parse_stats import StatsFrame
+
+# SQL Server pads temp table names with underscores and a 12-digit hex suffix
+_TEMP_SUFFIX = re.compile(r'^(#.*?)_+[0-9A-Fa-f]{12}$')
+
+CORRELATION_COLUMNS = [
+    'Table', 'Scan Count', 'Logical Reads', 'Physical Reads', 'Read-Ahead Reads',
+    'Statement ID', 'Node ID', 'Physical Operation', 'Logical Operation', 'Index',
+    'Estimated Rows', 'Cost %', 'Actual Logical Reads'
+]
+
+_READ_COLUMNS = {
+    'query': 'Query',
+    'table_name': 'Table',
+    'scan_count': 'Scan Count',
+    'logical_reads': 'Logical Reads',
+    'physical_reads': 'Physical Reads',
+    'read_ahead_reads': 'Read-Ahead Reads',
+}
+
+def table_key(name: str) -> str:
+    """Normalise a table name from either source to a join key."""
+    name = str(name).rsplit('.', 1)[-1].strip('[]')
+    match = _TEMP_SUFFIX.match(name)
+    if match:
+        name = match.group(1)
+    return name.lower()
+
+def _keys(names: pd.Series) -> pd.Series:
+    # Normalise each distinct name once
+    names = names.astype(str)
+    return names.map({name: table_key(name) for name in names.unique()})
+
+def correlate_stats_with_plan(stats: StatsFrame, plan: pd.DataFrame, by_query: bool = False) -> pd.DataFrame:
+    """Map table reads to the operators that access the same table.
+
+    With ``by_query`` unset, reads are first totalled per table; otherwise
+    every ``Table '...'`` row is kept, tagged with its 1-based query number.
+    Tables no operator touches keep a row with empty operator columns.
+    """
+    if by_query:
+        reads = stats.tables.assign(query=stats.tables['query'] + 1)
+    else:
+        reads = stats.table_totals().reset_index()
+    reads = reads[[c for c in _READ_COLUMNS if c in reads.columns]].rename(columns=_READ_COLUMNS)
+    reads['key'] = _keys(reads['Table'])
+
+    operators = plan[plan['Table'].notna()]
+    operators = operators[['Statement ID', 'Node ID', 'Physical Operation', 'Logical Operation',
+                           'Table', 'Index', 'Estimated Rows', 'Cost %', 'Actual Logical Reads']]
+    operators = operators.rename(columns={'Table': 'Plan Table'})
+    operators['key'] = _keys(operators['Plan Table'])
+
+    joined = reads.merge(operators, on='key', how='left').drop(columns=['key', 'Plan Table'])
+    columns = (['Query'] if by_query else []) + CORRELATION_COLUMNS
+    return joined[columns].sort_values(
+        ['Logical Reads', 'Cost %'], ascending=False, kind='stable'
+    ).reset_index(drop=True)
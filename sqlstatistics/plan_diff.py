@@ -0,0 +1,176 @@
+"""Operator-by-operator comparison of two execution plans.
+
+Plans are aligned structurally rather than by NodeId, which the optimizer
+renumbers freely. Statements are paired by their text, then each pair of
+operator trees is walked top-down: children of matched operators are paired
+first by identical (physical, logical) operator, then positionally, so an
+Index Seek that became an Index Scan under the same parent is reported as a
+replacement rather than as unrelated removal and addition. Every pairing
+step is a dictionary lookup, so the alignment is linear in plan size.
+"""
+from collections import defaultdict, deque
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from .parse_execution_plan import PlanTree
+
+DIFF_COLUMNS = [
+    'Status', 'Flag', 'Statement ID', 'Old Node ID', 'New Node ID',
+    'Old Operation', 'New Operation', 'Old Cost %', 'New Cost %', 'Cost % Delta',
+    'Old Estimated Rows', 'New Estimated Rows', 'Rows Ratio'
+]
+
+class _Plan:
+    # Tree plus the per-row attributes the alignment needs
+    def __init__(self, df: pd.DataFrame):
+        self.tree = PlanTree.from_frame(df)
+        self.node_id = df['Node ID'].tolist()
+        self.statement_id = df['Statement ID'].tolist()
+        self.physical = df['Physical Operation'].astype(str).tolist()
+        self.logical = df['Logical Operation'].astype(str).tolist()
+        self.cost = df['Cost %'].tolist()
+        self.rows = df['Estimated Rows'].tolist()
+        self.statements: Dict[object, str] = {}
+        self.roots: Dict[object, List[int]] = defaultdict(list)
+        for stmt_id, text in zip(df['Statement ID'], df['Statement Text']):
+            self.statements.setdefault(stmt_id, ' '.join(str(text).split()))
+        for root in self.tree.roots():
+            self.roots[self.statement_id[root]].append(root)
+
+    def key(self, index: int) -> Tuple[str, str]:
+        return self.physical[index], self.logical[index]
+
+    def subtree(self, index: int) -> List[int]:
+        rows = []
+        stack = [index]
+        while stack:
+            row = stack.pop()
+            rows.append(row)
+            stack.extend(reversed(self.tree.children(row)))
+        return rows
+
+def _pair(old: _Plan, new: _Plan, old_rows: List[int], new_rows: List[int]):
+    """Pair sibling lists; returns (pairs, unmatched_old, unmatched_new)."""
+    by_key = defaultdict(deque)
+    for row in old_rows:
+        by_key[old.key(row)].append(row)
+    pairs = []
+    leftover_new = []
+    for row in new_rows:
+        candidates = by_key.get(new.key(row))
+        if candidates:
+            pairs.append((candidates.popleft(), row))
+        else:
+            leftover_new.append(row)
+    paired_old = {o for o, _ in pairs}
+    leftover_old = [row for row in old_rows if row not in paired_old]
+    # Whatever is left under the same parent is paired up in order
+    count = min(len(leftover_old), len(leftover_new))
+    pairs.extend(zip(leftover_old[:count], leftover_new[:count]))
+    return pairs, leftover_old[count:], leftover_new[count:]
+
+def _pair_statements(old: _Plan, new: _Plan):
+    # Statements with the same text pair up in order; the rest by position
+    by_text = defaultdict(deque)
+    for stmt_id in old.roots:
+        by_text[old.statements.get(stmt_id)].append(stmt_id)
+    pairs = []
+    unmatched_new = []
+    for stmt_id in new.roots:
+        candidates = by_text.get(new.statements.get(stmt_id))
+        if candidates:
+            pairs.append((candidates.popleft(), stmt_id))
+        else:
+            unmatched_new.append(stmt_id)
+    unmatched_old = [s for candidates in by_text.values() for s in candidates]
+    count = min(len(unmatched_old), len(unmatched_new))
+    pairs.extend(zip(unmatched_old[:count], unmatched_new[:count]))
+    return pairs, unmatched_old[count:], unmatched_new[count:]
+
+def _is_seek_to_scan(old_op: str, new_op: str) -> bool:
+    return 'Seek' in old_op and 'Scan' in new_op
+
+def diff_plans(old_df: pd.DataFrame, new_df: pd.DataFrame,
+               cost_threshold: float = 1.0, rows_threshold: float = 2.0) -> pd.DataFrame:
+    """Compare two frames returned by parse_execution_plan.
+
+    Returns one row per operator with a Status of ``unchanged``,
+    ``changed`` (cost share moved by at least ``cost_threshold`` points or
+    estimated rows by at least ``rows_threshold`` times), ``replaced`` (a
+    different operator in the same place), ``added`` or ``removed``. Flag
+    marks scans that took the place of seeks.
+    """
+    old = _Plan(old_df)
+    new = _Plan(new_df)
+    records = []
+
+    def emit(status, old_row: Optional[int], new_row: Optional[int], flag=''):
+        old_cost = old.cost[old_row] if old_row is not None else None
+        new_cost = new.cost[new_row] if new_row is not None else None
+        old_rows = old.rows[old_row] if old_row is not None else None
+        new_rows = new.rows[new_row] if new_row is not None else None
+        records.append({
+            'Status': status,
+            'Flag': flag,
+            'Statement ID': new.statement_id[new_row] if new_row is not None else old.statement_id[old_row],
+            'Old Node ID': old.node_id[old_row] if old_row is not None else None,
+            'New Node ID': new.node_id[new_row] if new_row is not None else None,
+            'Old Operation': old.physical[old_row] if old_row is not None else None,
+            'New Operation': new.physical[new_row] if new_row is not None else None,
+            'Old Cost %': old_cost,
+            'New Cost %': new_cost,
+            'Cost % Delta': (new_cost or 0.0) - (old_cost or 0.0),
+            'Old Estimated Rows': old_rows,
+            'New Estimated Rows': new_rows,
+            'Rows Ratio': new_rows / old_rows if old_rows and new_rows is not None else None,
+        })
+
+    def removed(row):
+        for r in old.subtree(row):
+            emit('removed', r, None)
+
+    def added(row, flag=''):
+        for r in new.subtree(row):
+            emit('added', None, r, flag if 'Scan' in new.physical[r] else '')
+
+    stmt_pairs, old_only, new_only = _pair_statements(old, new)
+    stack = []
+    for old_stmt, new_stmt in reversed(stmt_pairs):
+        stack.append((old.roots[old_stmt], new.roots[new_stmt]))
+    while stack:
+        old_rows, new_rows = stack.pop()
+        pairs, gone, fresh = _pair(old, new, old_rows, new_rows)
+        # A seek dropped under this parent while a scan appeared
+        lost_seek = any('Seek' in old.physical[r] for r in gone)
+        for old_row, new_row in pairs:
+            if old.key(old_row) != new.key(new_row):
+                flag = 'seek replaced by scan' if _is_seek_to_scan(old.physical[old_row], new.physical[new_row]) else ''
+                emit('replaced', old_row, new_row, flag)
+            else:
+                old_cost, new_cost = old.cost[old_row], new.cost[new_row]
+                old_est, new_est = old.rows[old_row], new.rows[new_row]
+                cost_moved = abs((new_cost or 0.0) - (old_cost or 0.0)) >= cost_threshold
+                rows_moved = bool(old_est and new_est) and \
+                    max(old_est, new_est) / min(old_est, new_est) >= rows_threshold
+                emit('changed' if cost_moved or rows_moved else 'unchanged', old_row, new_row)
+            stack.append((old.tree.children(old_row), new.tree.children(new_row)))
+        for row in gone:
+            removed(row)
+        for row in fresh:
+            added(row, 'new scan where a seek was removed' if lost_seek else '')
+
+    for stmt_id in old_only:
+        for root in old.roots[stmt_id]:
+            removed(root)
+    for stmt_id in new_only:
+        for root in new.roots[stmt_id]:
+            added(root)
+
+    return pd.DataFrame.from_records(records, columns=DIFF_COLUMNS)
+
+def summarize_diff(diff: pd.DataFrame) -> Dict[str, int]:
+    """Operator counts per status, plus the number of flagged rows."""
+    counts = diff['Status'].value_counts().to_dict()
+    counts['flagged'] = int((diff['Flag'] != '').sum())
+    return counts
@@ -0,0 +1,299 @@
+"""Workload analysis over directories of saved execution plans.
+
+Every .sqlplan file is parsed in a worker process and reduced there to
+per-operator totals and deduplicated missing index suggestions (see
+plan_advice), so only those small summaries travel back; the parent merges
+them as they arrive and never holds more than a bounded window of results.
+Operators are normalised to their physical operation, the object they touch
+and the shape of their predicates (literals and parameters replaced by
+``?``, qualifiers and aliases dropped), so the same access pattern in
+different plans lands on the same row.
+
+Costs are estimated self costs, multiplied by a per-plan weight: 1 unless a
+weights file (e.g. execution counts from a Query Store export) says
+otherwise. Reports are ranked by weighted cost and can be written to
+Parquet with pyarrow installed.
+
+    sqlstatistics workload plans/ --weights executions.csv --output report/
+"""
+import argparse
+import csv
+import logging
+import math
+import os
+import re
+from concurrent.futures import FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .parse_execution_plan import read_plan_file
+from .plan_advice import MissingIndexAdvisor
+from .stats_store import iter_capture_files
+
+logger = logging.getLogger(__name__)
+
+_ALIAS = re.compile(r"\s+as\s+\[[^\]]*\](?:\.\[[^\]]*\])?", re.IGNORECASE)
+_QUALIFIED = re.compile(r"(?:\[[^\]]*\]\.)+(\[[^\]]*\])")
+_STRING = re.compile(r"N?'(?:[^']|'')*'")
+_VARIABLE = re.compile(r"\[?@\w+\]?")
+_NUMBER = re.compile(r"(?<![\w\]])[-+]?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?")
+_PARENTHESISED = re.compile(r"\(\?\)")
+_SPACE = re.compile(r"\s+")
+
+def predicate_shape(text: Optional[str]) -> str:
+    """Reduce a predicate to its shape: bare column names, values as ``?``."""
+    if not text:
+        return ''
+    text = _ALIAS.sub('', text)
+    text = _QUALIFIED.sub(r'\1', text)
+    text = _STRING.sub('?', text)
+    text = _VARIABLE.sub('?', text)
+    text = _NUMBER.sub('?', text)
+    text = _PARENTHESISED.sub('?', text)
+    return _SPACE.sub(' ', text.replace('[', '').replace(']', '')).strip()
+
+def operator_shape(operator: dict) -> str:
+    seek = predicate_shape(operator.get('SeekPredicate'))
+    residual = predicate_shape(operator.get('Predicate'))
+    return '; '.join(part for part in (seek and f"seek {seek}", residual and f"where {residual}") if part)
+
+def operator_object(operator: dict) -> str:
+    parts = ('ObjectDatabase', 'ObjectSchema', 'ObjectTable', 'ObjectIndex')
+    return '.'.join(operator[part] for part in parts if operator.get(part))
+
+OPERATOR_COLUMNS = ['physical_op', 'object', 'predicate_shape', 'implicit_conversion', 'plans',
+                    'occurrences', 'cost', 'weighted_cost', 'cost_share']
+DETAIL_COLUMNS = ['plan', 'statement_id', 'node_id', 'physical_op', 'object', 'predicate_shape',
+                  'implicit_conversion', 'self_cost', 'weight']
+
+# Per-plan operator totals: key -> [occurrences, cost, weighted cost]
+Totals = Dict[tuple, List[float]]
+
+@dataclass
+class PlanSummary:
+    path: str
+    operators: Totals = field(default_factory=dict)
+    missing_indexes: MissingIndexAdvisor = field(default_factory=MissingIndexAdvisor)
+    details: Optional[List[tuple]] = None
+    error: Optional[str] = None
+
+def summarize_plan(path: str, weight: float = 1.0, details: bool = False) -> PlanSummary:
+    """Parse one plan and reduce it to weighted per-key totals."""
+    summary = PlanSummary(path, details=[] if details else None)
+    try:
+        plan = read_plan_file(path)
+    except (OSError, ValueError) as e:
+        summary.error = str(e)
+        return summary
+
+    for index, operator in enumerate(plan.operators):
+        cost = plan.tree.self_cost[index]
+        cost = 0.0 if math.isnan(cost) else cost
+        key = (operator['PhysicalOp'], operator_object(operator), operator_shape(operator),
+               operator['ImplicitConversion'])
+        totals = summary.operators.setdefault(key, [0, 0.0, 0.0])
+        totals[0] += 1
+        totals[1] += cost
+        totals[2] += cost * weight
+        if details:
+            statement_id = plan.tree.statement_id[index]
+            summary.details.append((path, statement_id, plan.tree.node_id[index], *key[:3], key[3],
+                                    cost, weight))
+
+    summary.missing_indexes.add_plan(plan, weight)
+    return summary
+
+def _summarize_task(task):
+    return summarize_plan(*task)
+
+def _bounded_map(executor, fn: Callable, items: Iterable, window: int) -> Iterator:
+    # Like executor.map, but unordered and with at most `window` tasks in
+    # flight, so results are consumed as fast as they are produced
+    pending = set()
+    for item in items:
+        pending.add(executor.submit(fn, item))
+        if len(pending) >= window:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield future.result()
+
+def _require_pyarrow():
+    try:
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("Writing Parquet needs pyarrow: pip install 'sqlstatistics[workload]'") from e
+
+class _ParquetSink:
+    """Append rows to a Parquet file in row groups of ``batch_size``."""
+
+    def __init__(self, path: str, batch_size: int = 65536):
+        _require_pyarrow()
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self._pa = pa
+        types = [pa.string(), pa.int64(), pa.int64(), pa.string(), pa.string(), pa.string(),
+                 pa.bool_(), pa.float64(), pa.float64()]
+        self._schema = pa.schema(list(zip(DETAIL_COLUMNS, types)))
+        self._writer = pq.ParquetWriter(path, self._schema)
+        self._rows = []
+        self.batch_size = batch_size
+
+    def write(self, rows: List[tuple]):
+        self._rows.extend(rows)
+        if len(self._rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self._rows:
+            columns = list(zip(*self._rows))
+            self._writer.write_table(self._pa.Table.from_arrays(
+                [self._pa.array(column, type=f.type) for column, f in zip(columns, self._schema)],
+                schema=self._schema
+            ))
+            self._rows = []
+
+    def close(self):
+        self.flush()
+        self._writer.close()
+
+@dataclass
+class WorkloadReport:
+    plans: int
+    failed: List[Tuple[str, str]]
+    operators: Any
+    missing_indexes: Any
+
+    @property
+    def implicit_conversions(self):
+        return self.operators[self.operators['implicit_conversion']].reset_index(drop=True)
+
+    def to_parquet(self, directory: str):
+        """Write the ranked reports as Parquet files into ``directory``."""
+        os.makedirs(directory, exist_ok=True)
+        self.operators.to_parquet(os.path.join(directory, 'operators.parquet'), index=False)
+        self.missing_indexes.to_parquet(os.path.join(directory, 'missing_indexes.parquet'), index=False)
+        self.implicit_conversions.to_parquet(os.path.join(directory, 'implicit_conversions.parquet'),
+                                             index=False)
+
+def _operator_frame(operators: Totals, plans_per_key: Dict[tuple, int]):
+    import pandas as pd
+
+    operator_rows = [(*key, plans_per_key[key], *totals) for key, totals in operators.items()]
+    df_operators = pd.DataFrame(operator_rows, columns=OPERATOR_COLUMNS[:-1])
+    total = df_operators['weighted_cost'].sum()
+    df_operators['cost_share'] = (df_operators['weighted_cost'] / total * 100).round(2) if total else 0.0
+    return df_operators.sort_values('weighted_cost', ascending=False, ignore_index=True)
+
+def analyze_workload(paths: Iterable[str], pattern: str = '*.sqlplan', workers: Optional[int] = None,
+                     weights: Optional[Dict[str, float]] = None, details_path: Optional[str] = None,
+                     progress: Optional[Callable[[int], None]] = None) -> WorkloadReport:
+    """Rank operators and missing indexes across every plan under ``paths``.
+
+    ``weights`` maps plan paths or file names to a multiplier for their
+    costs. With ``details_path`` every operator is also streamed to that
+    Parquet file, one row per operator per plan. ``progress`` is called with
+    the number of plans handled so far.
+    """
+    weights = weights or {}
+    workers = workers or os.cpu_count() or 1
+    details = _ParquetSink(details_path) if details_path else None
+    tasks = ((path, weights.get(path, weights.get(os.path.basename(path), 1.0)), details is not None)
+             for path in iter_capture_files(paths, pattern))
+
+    operators: Totals = {}
+    plans_per_key: Dict[tuple, int] = {}
+    missing_indexes = MissingIndexAdvisor()
+    plans = 0
+    failed = []
+    executor = None
+    try:
+        if workers == 1:
+            results = map(_summarize_task, tasks)
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            executor = ProcessPoolExecutor(max_workers=workers)
+            results = _bounded_map(executor, _summarize_task, tasks, window=workers * 4)
+        for summary in results:
+            plans += 1
+            if summary.error:
+                logger.warning("Skipping %s: %s", summary.path, summary.error)
+                failed.append((summary.path, summary.error))
+            for key, totals in summary.operators.items():
+                target = operators.setdefault(key, [0, 0.0, 0.0])
+                for i, value in enumerate(totals):
+                    target[i] += value
+                plans_per_key[key] = plans_per_key.get(key, 0) + 1
+            missing_indexes.merge(summary.missing_indexes)
+            if details is not None and summary.details:
+                details.write(summary.details)
+            if progress is not None:
+                progress(plans)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        if details is not None:
+            details.close()
+
+    # Missing indexes are deduplicated on their canonical key by the advisor
+    df_missing = missing_indexes.report()
+    df_missing.columns = [column.lower().replace(' ', '_') for column in df_missing.columns]
+    return WorkloadReport(plans - len(failed), failed, _operator_frame(operators, plans_per_key), df_missing)
+
+def load_weights(path: str) -> Dict[str, float]:
+    """Read ``plan,weight`` rows from a CSV file; a header row is skipped."""
+    weights = {}
+    with open(path, newline='') as f:
+        for row in csv.reader(f):
+            if len(row) < 2:
+                continue
+            try:
+                weights[row[0].strip()] = float(row[1])
+            except ValueError:
+                continue
+    return weights
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="sqlstatistics workload",
+                                     description="Rank costly operators and missing indexes across saved plans.")
+    parser.add_argument('paths', nargs='+', help="Plan files or directories")
+    parser.add_argument('--pattern', default='*.sqlplan', help="File name pattern inside directories")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: one per CPU)")
+    parser.add_argument('--weights', help="CSV of plan file name and weight, e.g. execution count")
+    parser.add_argument('--top', type=int, default=20, help="Rows to print per report")
+    parser.add_argument('--output', help="Directory to write the reports to as Parquet")
+    parser.add_argument('--details', action='store_true',
+                        help="Also write every operator to operator_details.parquet in --output")
+    args = parser.parse_args(argv)
+    if args.details and not args.output:
+        parser.error("--details needs --output")
+    if args.output:
+        # Fail before the analysis rather than at the end when writing it out
+        try:
+            _require_pyarrow()
+        except ImportError as e:
+            parser.error(str(e))
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    details_path = None
+    if args.details:
+        os.makedirs(args.output, exist_ok=True)
+        details_path = os.path.join(args.output, 'operator_details.parquet')
+    report = analyze_workload(args.paths, args.pattern, args.workers,
+                              load_weights(args.weights) if args.weights else None, details_path)
+
+    print(f"{report.plans} plans analysed, {len(report.failed)} failed")
+    for title, frame in (("Top costly operators", report.operators),
+                         ("Missing indexes", report.missing_indexes),
+                         ("Implicit conversions", report.implicit_conversions)):
+        print(f"\n{title}:")
+        print(frame.head(args.top).to_string(index=False) if len(frame) else "  none")
+    if args.output:
+        report.to_parquet(args.output)
+        print(f"\nReports written to {args.output}")
+
+if __name__ == "__main__":
+    main()
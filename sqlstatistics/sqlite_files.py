@@ -0,0 +1,20 @@
+"""SQLite files shared by processes: ParseCache, StageMetrics and StatsStore.
+
+Every web worker, background job and CLI run opens the same database file,
+so nothing holds a connection between operations: a connection made
+before a fork would be shared by parent and child, which SQLite does not
+support.
+"""
+import contextlib
+import sqlite3
+from typing import Iterator
+
+@contextlib.contextmanager
+def connection(path: str) -> Iterator[sqlite3.Connection]:
+    """A fresh connection for one operation, committed if the block succeeds, then closed."""
+    conn = sqlite3.connect(path, timeout=30)
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
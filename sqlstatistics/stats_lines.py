@@ -0,0 +1,108 @@
+"""Line matcher for SET STATISTICS IO output.
+
+Each line is classified once by its first character and handed to a single
+precompiled, anchored extractor. Table lines in the classic layout are
+matched in one shot; newer SSMS layouts (page server reads, columnstore
+segment reads, ...) fall back to reading ``label value`` pairs, so counters
+are picked up whatever order or subset SSMS prints them in.
+"""
+import re
+from datetime import datetime
+from typing import Optional, Tuple
+
+# Counter columns in TableStats order; the first seven are the classic layout
+COUNTER_COLUMNS = [
+    'scan_count', 'logical_reads', 'physical_reads', 'read_ahead_reads',
+    'lob_logical_reads', 'lob_physical_reads', 'lob_read_ahead_reads',
+    'page_server_reads', 'page_server_read_ahead_reads',
+    'lob_page_server_reads', 'lob_page_server_read_ahead_reads',
+    'segment_reads', 'segment_skipped'
+]
+_COUNTER_INDEX = {name: i for i, name in enumerate(COUNTER_COLUMNS)}
+_CLASSIC_PADDING = (0,) * (len(COUNTER_COLUMNS) - 7)
+
+# Line kinds returned by match_line
+TABLE = 'table'
+ROWS_AFFECTED = 'rows_affected'
+COMPLETION_TIME = 'completion_time'
+
+_CLASSIC_TABLE = re.compile(
+    r"Table '([^']+)'\. Scan count (\d+), logical reads (\d+), physical reads (\d+), "
+    r"read-ahead reads (\d+), lob logical reads (\d+), lob physical reads (\d+), "
+    r"lob read-ahead reads (\d+)\.?$"
+)
+# SQL Server 2019+ layout with page server counters, in COUNTER_COLUMNS slots
+_PAGE_SERVER_TABLE = re.compile(
+    r"Table '([^']+)'\. Scan count (\d+), logical reads (\d+), physical reads (\d+), "
+    r"page server reads (\d+), read-ahead reads (\d+), page server read-ahead reads (\d+), "
+    r"lob logical reads (\d+), lob physical reads (\d+), lob page server reads (\d+), "
+    r"lob read-ahead reads (\d+), lob page server read-ahead reads (\d+)\.?$"
+)
+_PAGE_SERVER_ORDER = (0, 1, 2, 7, 3, 8, 4, 5, 9, 6, 10)
+_TABLE_NAME = re.compile(r"Table '([^']+)'\. ")
+_ROWS_AFFECTED = re.compile(r"\((\d+) rows? affected\)$")
+_COMPLETION_TIME = re.compile(r"Completion time: (.+)$")
+# SSMS prints 7 fractional digits; datetime only accepts up to 6 before 3.11
+_EXTRA_FRACTION = re.compile(r"(\.\d{6})\d+")
+
+def _match_table(line: str):
+    match = _CLASSIC_TABLE.match(line)
+    if match:
+        groups = match.groups()
+        return TABLE, (groups[0], tuple(map(int, groups[1:])) + _CLASSIC_PADDING)
+
+    counters = [0] * len(COUNTER_COLUMNS)
+    match = _PAGE_SERVER_TABLE.match(line)
+    if match:
+        groups = match.groups()
+        for slot, value in zip(_PAGE_SERVER_ORDER, groups[1:]):
+            counters[slot] = int(value)
+        return TABLE, (groups[0], tuple(counters))
+
+    # Any other layout: "label value" pairs separated by commas
+    match = _TABLE_NAME.match(line)
+    if not match:
+        return None
+    found = False
+    for pair in line[match.end():].rstrip('.').split(', '):
+        label, _, value = pair.rpartition(' ')
+        index = _COUNTER_INDEX.get(label.lower().replace(' ', '_').replace('-', '_'))
+        if index is not None and value.isdigit():
+            counters[index] = int(value)
+            found = True
+    if not found:
+        return None
+    return TABLE, (match.group(1), tuple(counters))
+
+def _match_rows_affected(line: str):
+    match = _ROWS_AFFECTED.match(line)
+    if match:
+        return ROWS_AFFECTED, int(match.group(1))
+    return None
+
+def _match_completion_time(line: str):
+    match = _COMPLETION_TIME.match(line)
+    if not match:
+        return None
+    try:
+        return COMPLETION_TIME, datetime.fromisoformat(_EXTRA_FRACTION.sub(r'\1', match.group(1)))
+    except ValueError:
+        return COMPLETION_TIME, None
+
+_DISPATCH = {
+    'T': _match_table,
+    '(': _match_rows_affected,
+    'C': _match_completion_time,
+}
+
+def match_line(line: str) -> Optional[Tuple[str, object]]:
+    """Classify a stripped, non-empty line.
+
+    Returns ``(TABLE, (table_name, counters))`` with counters in
+    COUNTER_COLUMNS order, ``(ROWS_AFFECTED, count)``,
+    ``(COMPLETION_TIME, datetime or None)``, or None for any other line.
+    """
+    extractor = _DISPATCH.get(line[0])
+    if extractor is None:
+        return None
+    return extractor(line)
@@ -0,0 +1,172 @@
+"""Persistent store of STATISTICS IO captures for tracking I/O over time.
+
+Captures are parsed and appended to a SQLite database with one row per
+query and one per table line; table rows carry the query's completion time
+and are indexed on table name and completion time. Files are identified by
+the SHA-256 of their contents, so re-running ingestion over the same
+directories only parses captures that have not been seen before.
+
+    sqlstatistics store --db stats.sqlite ingest captures/ more-captures/
+    sqlstatistics store --db stats.sqlite tables --since 2024-03-01
+"""
+import argparse
+import fnmatch
+import hashlib
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, List, Optional
+
+from .parse_stats import iter_stats
+from .sqlite_files import connection
+from .stats_lines import COUNTER_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    sha256 TEXT NOT NULL UNIQUE,
+    path TEXT NOT NULL,
+    ingested_at TEXT NOT NULL,
+    query_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS queries (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files (id),
+    query_index INTEGER NOT NULL,
+    rows_affected TEXT NOT NULL,
+    completion_time TEXT
+);
+CREATE TABLE IF NOT EXISTS table_reads (
+    query_id INTEGER NOT NULL REFERENCES queries (id),
+    table_name TEXT NOT NULL,
+    completion_time TEXT,
+    {', '.join(f'{column} INTEGER NOT NULL' for column in COUNTER_COLUMNS)}
+);
+CREATE INDEX IF NOT EXISTS table_reads_table_name ON table_reads (table_name);
+CREATE INDEX IF NOT EXISTS table_reads_completion_time ON table_reads (completion_time);
+"""
+
+# Same per-table totals as StatsFrame.table_totals, over any time window
+TABLE_TOTALS_SQL = f"""
+SELECT table_name, COUNT(DISTINCT query_id) AS queries,
+       {', '.join(f'SUM({column}) AS {column}' for column in COUNTER_COLUMNS)}
+FROM table_reads
+WHERE (:since IS NULL OR completion_time >= :since)
+  AND (:until IS NULL OR completion_time < :until)
+  AND (:table IS NULL OR table_name = :table)
+GROUP BY table_name
+ORDER BY logical_reads DESC
+"""
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _time_key(value: Optional[datetime]) -> Optional[str]:
+    # Offsets differ between captures; store UTC so the text sorts by time
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.isoformat()
+
+def iter_capture_files(paths: Iterable[str], pattern: str = '*.txt') -> Iterator[str]:
+    """Expand directories (recursively) into the capture files they hold."""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                for name in sorted(fnmatch.filter(names, pattern)):
+                    yield os.path.join(root, name)
+        else:
+            yield path
+
+class StatsStore:
+    def __init__(self, path: str):
+        self.path = path
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        return connection(self.path)
+
+    def ingest_file(self, path: str) -> Optional[int]:
+        """Append one capture; returns its query count, or None if already stored."""
+        sha256 = file_sha256(path)
+        with self._connect() as conn:
+            if conn.execute('SELECT 1 FROM files WHERE sha256 = ?', (sha256,)).fetchone():
+                return None
+            file_id = conn.execute(
+                'INSERT INTO files (sha256, path, ingested_at, query_count) VALUES (?, ?, ?, 0)',
+                (sha256, os.path.abspath(path), datetime.now(timezone.utc).isoformat())
+            ).lastrowid
+            count = 0
+            for count, query in enumerate(iter_stats(path), 1):
+                completion_time = _time_key(query.completion_time)
+                query_id = conn.execute(
+                    'INSERT INTO queries (file_id, query_index, rows_affected, completion_time) '
+                    'VALUES (?, ?, ?, ?)',
+                    (file_id, count - 1, ','.join(map(str, query.rows_affected)), completion_time)
+                ).lastrowid
+                conn.executemany(
+                    f"INSERT INTO table_reads VALUES (?, ?, ?{', ?' * len(COUNTER_COLUMNS)})",
+                    (
+                        (query_id, table.table_name, completion_time,
+                         *(getattr(table, column) for column in COUNTER_COLUMNS))
+                        for table in query.tables
+                    )
+                )
+            conn.execute('UPDATE files SET query_count = ? WHERE id = ?', (count, file_id))
+        return count
+
+    def ingest(self, paths: Iterable[str], pattern: str = '*.txt') -> List[str]:
+        """Ingest files and directories; returns the files that were new."""
+        ingested = []
+        for path in iter_capture_files(paths, pattern):
+            count = self.ingest_file(path)
+            if count is None:
+                logger.info("Skipping %s: already ingested", path)
+            else:
+                logger.info("Ingested %s: %d queries", path, count)
+                ingested.append(path)
+        return ingested
+
+    def table_totals(self, since: Optional[datetime] = None, until: Optional[datetime] = None,
+                     table: Optional[str] = None):
+        """Per-table counter totals for queries completed in [since, until)."""
+        import pandas as pd
+
+        params = {'since': _time_key(since), 'until': _time_key(until), 'table': table}
+        with self._connect() as conn:
+            return pd.read_sql_query(TABLE_TOTALS_SQL, conn, params=params, index_col='table_name')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="sqlstatistics store",
+                                     description="Persist and query STATISTICS IO captures.")
+    parser.add_argument('--db', default='stats.sqlite', help="SQLite store to use")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    ingest = commands.add_parser('ingest', help="Parse capture files and directories into the store")
+    ingest.add_argument('paths', nargs='+')
+    ingest.add_argument('--pattern', default='*.txt', help="File name pattern inside directories")
+
+    tables = commands.add_parser('tables', help="Show per-table totals")
+    tables.add_argument('--since', type=datetime.fromisoformat)
+    tables.add_argument('--until', type=datetime.fromisoformat)
+    tables.add_argument('--table')
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    store = StatsStore(args.db)
+    if args.command == 'ingest':
+        ingested = store.ingest(args.paths, args.pattern)
+        print(f"Ingested {len(ingested)} new file(s)")
+    else:
+        print(store.table_totals(args.since, args.until, args.table).to_string())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Server-side paging, sorting and filtering for Dash DataTables.
+
+Tables in the analyzer use ``page_action='custom'`` (and custom sort and
+filter), so the browser only ever receives the visible page. page_frame
+applies the table's ``filter_query`` and ``sort_by`` to the cached frame
+and returns that page as records.
+"""
+import math
+from typing import List, Optional, Tuple
+
+import pandas as pd
+
+OPERATORS = [
+    ['ge ', '>='],
+    ['le ', '<='],
+    ['lt ', '<'],
+    ['gt ', '>'],
+    ['ne ', '!='],
+    ['eq ', '='],
+    ['contains '],
+    ['datestartswith '],
+]
+
+def split_filter_part(filter_part: str) -> Tuple[Optional[str], Optional[str], object]:
+    # Parses one "{column} operator value" clause of a DataTable filter_query
+    for operator_type in OPERATORS:
+        for operator in operator_type:
+            if operator in filter_part:
+                name_part, value_part = filter_part.split(operator, 1)
+                name = name_part[name_part.find('{') + 1: name_part.rfind('}')]
+                value_part = value_part.strip()
+                v0 = value_part[0] if value_part else ''
+                if v0 and v0 == value_part[-1] and v0 in ("'", '"', '`'):
+                    value = value_part[1:-1].replace('\\' + v0, v0)
+                else:
+                    try:
+                        value = float(value_part)
+                    except ValueError:
+                        value = value_part
+                # Word operators need spaces after them in the filter string,
+                # but we don't want these later
+                return name, operator_type[0].strip(), value
+    return None, None, None
+
+def filter_frame(df: pd.DataFrame, filter_query: Optional[str]) -> pd.DataFrame:
+    if not filter_query:
+        return df
+    for filter_part in filter_query.split(' && '):
+        name, operator, value = split_filter_part(filter_part)
+        if name not in df.columns:
+            continue
+        column = df[name]
+        if operator in ('eq', 'ne', 'lt', 'le', 'gt', 'ge'):
+            if pd.api.types.is_bool_dtype(column):
+                # Flags are typed in as true/false (or 1/0)
+                value = str(value).strip().lower() in ('true', '1', '1.0')
+            elif isinstance(value, float):
+                column = pd.to_numeric(column, errors='coerce')
+            else:
+                column = column.astype(str)
+            mask = getattr(column, operator)(value)
+        elif operator == 'contains':
+            mask = column.astype(str).str.contains(str(value), case=False, regex=False)
+        elif operator == 'datestartswith':
+            mask = column.astype(str).str.startswith(str(value))
+        else:
+            continue
+        df = df.loc[mask.fillna(False)]
+    return df
+
+def sort_frame(df: pd.DataFrame, sort_by: Optional[List[dict]]) -> pd.DataFrame:
+    sort_by = [col for col in (sort_by or []) if col['column_id'] in df.columns]
+    if not sort_by:
+        return df
+    return df.sort_values(
+        [col['column_id'] for col in sort_by],
+        ascending=[col['direction'] == 'asc' for col in sort_by],
+        # Categoricals sort by label, not by order of first appearance
+        key=lambda s: s.astype(str) if isinstance(s.dtype, pd.CategoricalDtype) else s,
+        kind='stable'
+    )
+
+def page_frame(df: pd.DataFrame, page_current: Optional[int], page_size: int,
+               sort_by: Optional[List[dict]] = None,
+               filter_query: Optional[str] = None) -> Tuple[List[dict], int]:
+    """Return ``(records, page_count)`` for the requested page."""
+    df = sort_frame(filter_frame(df, filter_query), sort_by)
+    page_count = max(1, math.ceil(len(df) / page_size))
+    page_current = min(page_current or 0, page_count - 1)
+    page = df.iloc[page_current * page_size:(page_current + 1) * page_size]
+    # Missing values become null rather than NaN, which is not valid JSON
+    page = page.astype(object).where(page.notna(), None)
+    return page.to_dict('records'), page_count
@@ -0,0 +1,92 @@
+"""Encoding detection for captures and plans as SSMS saves them.
+
+SSMS writes .sqlplan files and results saved to file as UTF-16 with a byte
+order mark; most other tools write UTF-8, sometimes with a BOM. A BOM
+decides; without one, UTF-16 text that starts with ASCII has a zero in
+every other byte, and anything else is read as UTF-8. Only the first few
+bytes are looked at, so inputs can be streamed from disk or read straight
+out of a buffer without being decoded up front.
+"""
+import codecs
+import contextlib
+import io
+import os
+from typing import BinaryIO, Iterator, TextIO, Tuple
+
+# Bytes needed to tell the encodings apart
+HEAD_SIZE = 4
+
+_BOMS = [(codecs.BOM_UTF8, 'utf-8'), (codecs.BOM_UTF16_LE, 'utf-16-le'), (codecs.BOM_UTF16_BE, 'utf-16-be')]
+
+def detect_encoding(head: bytes) -> Tuple[str, int]:
+    """The codec of text starting with ``head`` and the length of its BOM."""
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding, len(bom)
+    if len(head) >= 2:
+        if head[0] == 0 and head[1] != 0:
+            return 'utf-16-be', 0
+        if head[0] != 0 and head[1] == 0:
+            return 'utf-16-le', 0
+    return 'utf-8', 0
+
+def detect_file_encoding(path) -> Tuple[str, int]:
+    with open(path, 'rb') as f:
+        return detect_encoding(f.read(HEAD_SIZE))
+
+def is_binary_stream(source) -> bool:
+    """Whether ``source`` is a file object that reads bytes rather than text."""
+    read = getattr(source, 'read', None)
+    return read is not None and isinstance(read(0), bytes)
+
+class _BufferReader(io.RawIOBase):
+    # Reads a bytes-like object (bytes, bytearray, memoryview, mmap) in
+    # place, where io.BytesIO would copy anything but bytes
+    def __init__(self, buffer):
+        self._view = memoryview(buffer).cast('B')
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        count = min(len(b), len(self._view) - self._position)
+        b[:count] = self._view[self._position:self._position + count]
+        self._position += count
+        return count
+
+    def close(self):
+        self._view.release()
+        super().close()
+
+def _head(stream: BinaryIO) -> bytes:
+    if hasattr(stream, 'peek'):
+        return stream.peek(HEAD_SIZE)[:HEAD_SIZE]
+    position = stream.tell()
+    head = stream.read(HEAD_SIZE)
+    stream.seek(position)
+    return head
+
+@contextlib.contextmanager
+def open_text(source) -> Iterator[TextIO]:
+    """Read a path, bytes-like object or binary file as text in its detected encoding.
+
+    Decoding happens a buffer at a time as lines are read, with undecodable
+    bytes replaced. A file object passed in is left open.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        stream = open(source, 'rb')
+    elif is_binary_stream(source):
+        stream = source
+    else:
+        stream = io.BufferedReader(_BufferReader(source))
+    encoding, bom = detect_encoding(_head(stream))
+    stream.read(bom)
+    text = io.TextIOWrapper(stream, encoding=encoding, errors='replace')
+    try:
+        yield text
+    finally:
+        if stream is source:
+            text.detach()
+        else:
+            text.close()
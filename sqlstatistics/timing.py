@@ -0,0 +1,184 @@
+"""Timing spans around the parsers' and the analyzer's stages.
+
+Wrap a stage in ``with span('name'):``. Every span is logged on this
+module's logger at DEBUG with its name and duration as ``extra`` fields,
+and, inside ``with record('operation') as timings:``, is also added to
+``timings``. Spans opened by the parsers a caller runs nest under the
+caller's own, so one collection holds the whole breakdown of, say, an
+Analyze Plan click. Outside record() a span costs two perf_counter calls
+and a context variable lookup.
+
+StageMetrics accumulates recorded stages as Prometheus histograms in a
+SQLite file, so every worker and background job on a host adds to the same
+series, like ParseCache.
+"""
+import bisect
+import contextlib
+import contextvars
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import Iterator, List
+
+from .sqlite_files import connection
+
+logger = logging.getLogger(__name__)
+
+_active: contextvars.ContextVar = contextvars.ContextVar('timings', default=None)
+
+@dataclass
+class Stage:
+    name: str
+    depth: int
+    seconds: float = 0.0
+
+class Timings:
+    """Stages recorded during one operation, in the order they started."""
+
+    def __init__(self, operation: str):
+        self.operation = operation
+        self.stages: List[Stage] = []
+        self.seconds = 0.0
+        self._depth = 0
+
+    def as_dict(self) -> dict:
+        """Milliseconds per stage name, summed over repeated stages."""
+        totals = {}
+        for stage in self.stages:
+            totals[stage.name] = totals.get(stage.name, 0.0) + stage.seconds * 1000
+        return {name: round(ms, 3) for name, ms in totals.items()}
+
+@contextlib.contextmanager
+def span(name: str) -> Iterator[None]:
+    timings = _active.get()
+    stage = None
+    if timings is not None:
+        stage = Stage(name, timings._depth)
+        timings.stages.append(stage)
+        timings._depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        if stage is not None:
+            stage.seconds = seconds
+            timings._depth -= 1
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%s took %.1f ms", name, seconds * 1000,
+                         extra={'stage': name, 'duration_ms': round(seconds * 1000, 3)})
+
+@contextlib.contextmanager
+def record(operation: str) -> Iterator[Timings]:
+    """Collect the spans run inside the block; log the breakdown at INFO when it ends."""
+    timings = Timings(operation)
+    token = _active.set(timings)
+    start = time.perf_counter()
+    try:
+        yield timings
+    finally:
+        timings.seconds = time.perf_counter() - start
+        _active.reset(token)
+        logger.info("%s took %.1f ms", operation, timings.seconds * 1000,
+                    extra={'operation': operation, 'duration_ms': round(timings.seconds * 1000, 3),
+                           'stages': timings.as_dict()})
+
+# Attributes every LogRecord has; anything else was passed in ``extra``
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message and any ``extra`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        entry.update((key, value) for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES)
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+# Histogram bucket upper bounds in seconds; +Inf is implied
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    operation TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (operation, stage, bucket)
+);
+CREATE TABLE IF NOT EXISTS totals (
+    operation TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    PRIMARY KEY (operation, stage)
+);
+"""
+
+def _label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+class StageMetrics:
+    """Per-operation, per-stage duration histograms shared through a SQLite file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        return connection(self.path)
+
+    def observe(self, timings: Timings):
+        """Add every stage of ``timings``, and its total as stage ``total``."""
+        observations = [(stage.name, stage.seconds) for stage in timings.stages]
+        observations.append(('total', timings.seconds))
+        with self._connect() as conn:
+            for stage, seconds in observations:
+                key = (timings.operation, stage)
+                conn.execute(
+                    'INSERT INTO buckets (operation, stage, bucket, count) VALUES (?, ?, ?, 1)'
+                    ' ON CONFLICT (operation, stage, bucket) DO UPDATE SET count = count + 1',
+                    (*key, bisect.bisect_left(BUCKETS, seconds))
+                )
+                conn.execute(
+                    'INSERT INTO totals (operation, stage, count, seconds) VALUES (?, ?, 1, ?)'
+                    ' ON CONFLICT (operation, stage) DO UPDATE SET count = count + 1,'
+                    ' seconds = seconds + excluded.seconds',
+                    (*key, seconds)
+                )
+
+    def render(self, prefix: str = 'sqlstatistics') -> str:
+        """The histograms in the Prometheus text exposition format."""
+        with self._connect() as conn:
+            counts = {}
+            for operation, stage, bucket, count in conn.execute('SELECT * FROM buckets'):
+                counts.setdefault((operation, stage), [0] * (len(BUCKETS) + 1))[bucket] = count
+            totals = conn.execute('SELECT * FROM totals ORDER BY operation, stage').fetchall()
+
+        name = f"{prefix}_stage_duration_seconds"
+        lines = [f"# HELP {name} Time spent in each stage of an analysis.",
+                 f"# TYPE {name} histogram"]
+        for operation, stage, count, seconds in totals:
+            labels = f'operation="{_label(operation)}",stage="{_label(stage)}"'
+            cumulative = 0
+            for bound, bucket_count in zip(BUCKETS + (float('inf'),), counts.get((operation, stage), [])):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+            lines.append(f'{name}_sum{{{labels}}} {seconds!r}')
+            lines.append(f'{name}_count{{{labels}}} {count}')
+        return '\n'.join(lines) + '\n'
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute('DELETE FROM buckets')
+            conn.execute('DELETE FROM totals')
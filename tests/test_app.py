@@ -0,0 +1,72 @@
+import importlib
+import os
+
+import pytest
+
+pytest.importorskip('dash')
+
+NS = 'http://schemas.microsoft.com/sqlserver/2004/07/showplan'
+
+STATS = ''.join(f"Table 'Table{i}'. Scan count 1, logical reads {i}, physical reads 0, read-ahead reads 0, "
+                f"lob logical reads 0, lob physical reads 0, lob read-ahead reads 0.\n(1 rows affected)\n\n"
+                for i in range(60))
+
+def showplan(operators):
+    rel_ops = ''.join(f'<RelOp NodeId="{node_id}" PhysicalOp="Index Scan" LogicalOp="Index Scan" '
+                      f'EstimateRows="10" EstimatedTotalSubtreeCost="1"><IndexScan>'
+                      f'<Object Database="[db]" Schema="[dbo]" Table="[Table{node_id}]" Index="[IX]"/>'
+                      f'</IndexScan></RelOp>'
+                      for node_id in range(operators))
+    return (f'<ShowPlanXML xmlns="{NS}"><BatchSequence><Batch><Statements>'
+            f'<StmtSimple StatementId="1" StatementType="SELECT"><QueryPlan>{rel_ops}</QueryPlan></StmtSimple>'
+            '</Statements></Batch></BatchSequence></ShowPlanXML>')
+
+@pytest.fixture(scope='module')
+def app(tmp_path_factory):
+    root = tmp_path_factory.mktemp('app')
+    for name, path in (('PARSE_CACHE_PATH', 'parse-cache.sqlite'), ('BACKGROUND_JOBS_PATH', 'jobs'),
+                       ('STATS_TAIL_STATE_PATH', 'tails'), ('METRICS_PATH', 'metrics.sqlite')):
+        os.environ[name] = str(root / path)
+    os.environ['STATS_TAIL_ROOT'] = str(root)
+    return importlib.import_module('app')
+
+@pytest.fixture
+def cache(app):
+    app.parse_cache.clear()
+    yield app.parse_cache
+    app.parse_cache.clear()
+
+def test_page_operations_after_eviction(app, cache):
+    xml = showplan(30)
+    key = app.content_key(xml)
+    data, page_count, status = app.page_operations(1, 25, [], '', key, xml)
+    assert len(data) == 5
+    assert page_count == 2
+    assert status is None
+    # Rebuilt from the input and cached again
+    assert cache.get(f"plan:{key}") is not None
+
+def test_paged_tables_rebuild_from_inputs(app, cache):
+    xml = showplan(30)
+    stats_key, plan_key = app.content_key(STATS), app.content_key(xml)
+    data, page_count, status = app.page_queries(0, 25, [], '', stats_key, STATS)
+    assert (len(data), page_count, status) == (25, 3, None)
+    data, _, status = app.page_correlation(0, 100, [], '', f"{stats_key}:{plan_key}", STATS, xml)
+    assert status is None
+    assert {row['Table'] for row in data} == {f"Table{i}" for i in range(60)}
+    data, _, status = app.page_diff(0, 100, [], '', f"{plan_key}:{plan_key}", xml, xml)
+    assert status is None
+    assert len(data) == 30
+
+def test_edited_input_shows_expired(app, cache):
+    key = app.content_key(showplan(30))
+    data, page_count, status = app.page_operations(0, 25, [], '', key, showplan(31))
+    assert (data, page_count) == ([], 1)
+    assert status is app.RESULTS_EXPIRED
+
+def test_cached_rows_are_served_without_inputs(app, cache):
+    xml = showplan(3)
+    key = app.content_key(xml)
+    cache.set(f"plan:{key}", app.parse_execution_plan(xml))
+    data, page_count, status = app.page_operations(0, 25, [], '', key, None)
+    assert (len(data), page_count, status) == (3, 1, None)
@@ -0,0 +1,70 @@
+# Throughput of the STATISTICS IO line matcher and parsers, in lines/sec.
+# Deselected by default; needs pytest-benchmark:
+#
+#     pytest -m benchmark tests/test_bench_parse_stats.py
+#     BENCH_STATS_LINES=10000000 pytest -m benchmark tests/test_bench_parse_stats.py
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'benchmarks'))
+
+from sqlstatistics.parse_stats import iter_stats, parse_stats_columns
+from sqlstatistics.stats_lines import match_line
+from synthetic import CLASSIC, PAGE_SERVER, SEGMENT
+
+pytestmark = pytest.mark.benchmark
+
+LINES = int(os.getenv('BENCH_STATS_LINES', '1000000'))
+
+def write_capture(path, lines, tables_per_query=5):
+    # Each query block: table lines, a rows affected line, a completion time and a blank line
+    block_lines = tables_per_query + 3
+    written = 0
+    query = 0
+    with open(path, 'w') as f:
+        while written < lines:
+            for t in range(tables_per_query):
+                template = (CLASSIC, PAGE_SERVER, SEGMENT)[(query + t) % 3]
+                f.write(template.format(f"Table{t}", query % 1000, t))
+            f.write(f"({query % 500} rows affected)\n")
+            f.write("Completion time: 2024-03-01T10:15:22.1234567+01:00\n\n")
+            written += block_lines
+            query += 1
+    return written
+
+@pytest.fixture(scope='module')
+def capture(tmp_path_factory):
+    path = tmp_path_factory.mktemp('bench') / 'capture.txt'
+    return str(path), write_capture(path, LINES)
+
+def run(benchmark, lines, func):
+    benchmark.pedantic(func, rounds=3, iterations=1)
+    benchmark.extra_info['lines'] = lines
+    benchmark.extra_info['lines_per_sec'] = round(lines / benchmark.stats.stats.min)
+
+def test_match_line(benchmark, capture):
+    path, lines = capture
+
+    def match_only():
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    match_line(line)
+
+    run(benchmark, lines, match_only)
+
+def test_iter_stats(benchmark, capture):
+    path, lines = capture
+
+    def consume():
+        for _ in iter_stats(path):
+            pass
+
+    run(benchmark, lines, consume)
+
+def test_parse_stats_columns(benchmark, capture):
+    path, lines = capture
+    run(benchmark, lines, lambda: parse_stats_columns(path))
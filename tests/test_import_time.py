@@ -0,0 +1,18 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'benchmarks'))
+
+from bench_import_time import BUDGETS, measure
+
+# Multiplies every budget, e.g. on slow CI machines
+SCALE = float(os.getenv('IMPORT_BUDGET_SCALE', '1'))
+
+@pytest.mark.parametrize('module', list(BUDGETS))
+def test_import_time(module):
+    runs = [measure(module) for _ in range(3)]
+    assert runs[0][1] == [], f"{module} imports {', '.join(runs[0][1])}"
+    best = min(ms for ms, _ in runs)
+    assert best <= BUDGETS[module] * SCALE, f"{module} took {best:.1f} ms"
@@ -0,0 +1,91 @@
+import itertools
+import os
+import subprocess
+import sys
+
+import pytest
+
+from sqlstatistics import parse_cache
+from sqlstatistics.parse_cache import ParseCache, content_key, private_cache_dir
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Distinct access times, so LRU order does not depend on timer resolution
+    ticks = itertools.count(1)
+    monkeypatch.setattr(parse_cache.time, 'time', lambda: float(next(ticks)))
+
+@pytest.fixture(params=['memory', 'file'])
+def make_cache(request, tmp_path):
+    def make(**kwargs):
+        return ParseCache(None if request.param == 'memory' else str(tmp_path / 'cache.sqlite'), **kwargs)
+    return make
+
+def test_get_or_compute_counts_hits(make_cache):
+    cache = make_cache()
+    calls = []
+    compute = lambda: calls.append(1) or {'rows': [1, 2]}
+    assert cache.get_or_compute('stats:a', compute) == {'rows': [1, 2]}
+    assert cache.get_or_compute('stats:a', compute) == {'rows': [1, 2]}
+    assert len(calls) == 1
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (1, 1, 1)
+
+def test_failed_compute_stores_nothing(make_cache):
+    cache = make_cache()
+    with pytest.raises(ValueError):
+        cache.get_or_compute('plan:a', lambda: int('x'))
+    assert cache.get('plan:a') is None
+
+def test_least_recently_used_is_evicted(make_cache, clock):
+    cache = make_cache(max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c')) == (1, 3)
+
+def test_byte_bound(make_cache, clock):
+    cache = make_cache(max_bytes=2_000)
+    cache.set('big', b'x' * 5_000)
+    assert cache.get('big') is None
+    cache.set('a', b'x' * 900)
+    cache.set('b', b'x' * 900)
+    cache.set('c', b'x' * 900)
+    assert cache.get('a') is None
+    assert cache.stats()['bytes'] <= 2_000
+
+def test_entries_are_shared_through_the_file(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    ParseCache(path).set('plan:a', [1, 2, 3])
+    assert ParseCache(path).get('plan:a') == [1, 2, 3]
+
+def test_content_key():
+    assert content_key('SELECT 1') == content_key('SELECT 1')
+    assert content_key('SELECT 1') != content_key('SELECT 2')
+    # Lone surrogates from pasted text do not fail
+    assert len(content_key('\ud800')) == 64
+
+@pytest.mark.skipif(not hasattr(os, 'getuid'), reason="POSIX permissions")
+def test_private_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    path = private_cache_dir()
+    assert path == str(tmp_path / 'sqlstatistics')
+    assert os.stat(path).st_mode & 0o777 == 0o700
+    os.chmod(path, 0o777)
+    with pytest.raises(PermissionError):
+        private_cache_dir()
+
+def test_app_starts_without_a_cache_dir_when_every_path_is_set(tmp_path):
+    pytest.importorskip('dash')
+    # A cache home that cannot be created: only the overridden paths may be used
+    blocker = tmp_path / 'not-a-directory'
+    blocker.write_text('')
+    env = dict(os.environ, XDG_CACHE_HOME=str(blocker), ENABLE_METRICS='1', LOG_LEVEL='WARNING')
+    for name in ('PARSE_CACHE_PATH', 'BACKGROUND_JOBS_PATH', 'STATS_TAIL_STATE_PATH', 'METRICS_PATH'):
+        env[name] = str(tmp_path / name.lower())
+    root = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+    result = subprocess.run([sys.executable, '-c', 'import app'], cwd=root, env=env,
+                            capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert not os.path.exists(blocker / 'sqlstatistics')
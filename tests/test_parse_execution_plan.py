@@ -0,0 +1,94 @@
+import codecs
+import io
+import logging
+
+import pandas as pd
+import pytest
+
+from sqlstatistics.parse_execution_plan import _error_context, parse_execution_plan, read_plan, read_plan_file
+
+NS = 'http://schemas.microsoft.com/sqlserver/2004/07/showplan'
+
+def statement(statement_id, operators):
+    rel_ops = ''.join(f'<RelOp NodeId="{node_id}" PhysicalOp="Index Scan" LogicalOp="Index Scan" '
+                      f'EstimateRows="10" EstimatedTotalSubtreeCost="1"><IndexScan/></RelOp>'
+                      for node_id in range(operators))
+    return (f'<StmtSimple StatementId="{statement_id}" StatementType="SELECT" '
+            f'StatementText="SELECT {statement_id}"><QueryPlan>{rel_ops}</QueryPlan></StmtSimple>')
+
+def showplan(statements=3, operators=2):
+    return (f'<?xml version="1.0" encoding="utf-16"?><ShowPlanXML xmlns="{NS}"><BatchSequence><Batch>'
+            f'<Statements>{"".join(statement(i, operators) for i in range(1, statements + 1))}</Statements>'
+            '</Batch></BatchSequence></ShowPlanXML>')
+
+def summary(records):
+    return ([(s['StatementId'], s['StatementText']) for s in records.statements],
+            [(o['PhysicalOp'], o['EstimateRows']) for o in records.operators],
+            list(records.tree.node_id))
+
+def test_read_plan_inputs_agree(tmp_path):
+    xml = showplan()
+    expected = summary(read_plan(xml))
+    assert len(expected[1]) == 6
+
+    utf16 = codecs.BOM_UTF16_LE + xml.encode('utf-16-le')
+    # The declaration says utf-16 but the bytes are UTF-8: the detected encoding wins
+    assert summary(read_plan(xml.encode('utf-8'))) == expected
+    assert summary(read_plan(utf16)) == expected
+    assert summary(read_plan(memoryview(utf16))) == expected
+    path = tmp_path / 'plan.sqlplan'
+    path.write_bytes(utf16)
+    assert summary(read_plan_file(path)) == expected
+    assert summary(read_plan_file(io.BytesIO(xml.encode('utf-8')))) == expected
+
+def test_read_plan_progress():
+    fractions = []
+    read_plan(showplan(statements=2000), progress=fractions.append)
+    assert len(fractions) > 1
+    assert fractions == sorted(fractions)
+    assert fractions[-1] == pytest.approx(1.0)
+
+def test_parse_error_is_raised_not_logged(tmp_path, caplog):
+    broken = showplan()[:-20]
+    path = tmp_path / 'broken.sqlplan'
+    path.write_text(broken)
+    with caplog.at_level(logging.INFO):
+        with pytest.raises(ValueError, match='Error parsing execution plan'):
+            read_plan(broken)
+        with pytest.raises(ValueError, match='Error parsing execution plan'):
+            read_plan_file(path)
+    assert not [record for record in caplog.records if record.levelno >= logging.WARNING]
+
+def test_error_context_is_bounded():
+    content = 'first line\n' + 'x' * 1_000_000 + '<' + 'y' * 1_000_000
+    snippet, caret = _error_context(content, 2, 1_000_000, width=80).split('\n')
+    assert len(snippet) == 160
+    assert snippet[len(caret) - 1] == '<'
+    assert caret.strip() == '^'
+
+def test_frame_dtypes():
+    root = ('<RelOp NodeId="0" PhysicalOp="Hash Match" LogicalOp="Inner Join" EstimateRows="5.5" '
+            'EstimateCPU="0.1" EstimatedTotalSubtreeCost="3" Parallel="1"><Hash>'
+            '<RelOp PhysicalOp="Index Seek" LogicalOp="Index Seek" EstimatedTotalSubtreeCost="1">'
+            '<IndexScan><Object Database="[db]" Schema="[dbo]" Table="[Orders]" Index="[IX]"/></IndexScan>'
+            '</RelOp></Hash></RelOp>')
+    df = parse_execution_plan(f'<ShowPlanXML xmlns="{NS}"><BatchSequence><Batch><Statements>'
+                              f'<StmtSimple StatementId="1" StatementType="SELECT" StatementText="SELECT 1">'
+                              f'<QueryPlan>{root}</QueryPlan></StmtSimple>'
+                              '</Statements></Batch></BatchSequence></ShowPlanXML>')
+    assert str(df['Node ID'].dtype) == 'Int64'
+    assert str(df['Parent Node ID'].dtype) == 'Int64'
+    assert df['Estimated Rows'].dtype == 'float64'
+    assert df['Parallel'].dtype == bool
+    for column in ('Physical Operation', 'Table', 'Statement Type', 'Warnings'):
+        assert isinstance(df[column].dtype, pd.CategoricalDtype)
+    # Missing values are missing, not 'N/A' strings
+    assert not df.isin(['N/A']).any().any()
+    assert df['Node ID'].isna().tolist() == [False, True]
+    assert df['Parent Node ID'].tolist()[1] == 0
+    assert df['Estimated Rows'].isna().tolist() == [False, True]
+    assert df['Table'].astype(object).tolist()[1] == 'Orders'
+    assert df['Self Cost'].tolist() == [2.0, 1.0]
+    assert df['Parallel'].tolist() == [True, False]
+    # Estimated-only plans have every actual counter missing
+    assert df['Actual Rows'].isna().all()
@@ -0,0 +1,57 @@
+import pandas as pd
+
+from sqlstatistics.parse_stats import (concat_stats_frames, iter_stats, parse_stats_columns,
+                                       parse_stats_text, parse_stats_text_columns)
+from sqlstatistics.stats_lines import COUNTER_COLUMNS
+
+CAPTURE = """Table 'Orders'. Scan count 1, logical reads 10, physical reads 2, read-ahead reads 0, lob logical reads 0, lob physical reads 0, lob read-ahead reads 0.
+Table 'Customers'. Scan count 3, logical reads 7, physical reads 0, page server reads 0, read-ahead reads 1, page server read-ahead reads 0, lob logical reads 0, lob physical reads 0, lob page server reads 0, lob read-ahead reads 0, lob page server read-ahead reads 0.
+(12 rows affected)
+Completion time: 2024-03-01T10:15:22.1234567+01:00
+
+(1 row affected)
+
+Table 'Orders'. Segment reads 4, segment skipped 6.
+Table 'Orders'. Scan count 2, logical reads 5, physical reads 0, read-ahead reads 0, lob logical reads 0, lob physical reads 0, lob read-ahead reads 0.
+"""
+
+def test_columns_match_rows():
+    frame = parse_stats_text_columns(CAPTURE)
+    assert len(frame) == 3
+    assert list(frame) == parse_stats_text(CAPTURE)
+    assert list(frame) == list(iter_stats(CAPTURE.splitlines(True)))
+    assert frame[-1].tables[0].segment_skipped == 6
+    assert frame[0].rows_affected == [12]
+    assert frame[0].completion_time.microsecond == 123456
+
+def test_schema():
+    frame = parse_stats_text_columns(CAPTURE)
+    assert isinstance(frame.tables['table_name'].dtype, pd.CategoricalDtype)
+    assert all(frame.tables[column].dtype == 'int64' for column in ['query'] + COUNTER_COLUMNS)
+
+def test_totals():
+    frame = parse_stats_text_columns(CAPTURE)
+    totals = frame.table_totals()
+    assert list(totals.index) == ['Orders', 'Customers']
+    assert totals.loc['Orders', 'logical_reads'] == 15
+    assert totals.loc['Orders', 'segment_reads'] == 4
+    # The second query touched no tables
+    assert frame.query_totals()['logical_reads'].tolist() == [17, 0, 5]
+
+def test_concat_renumbers_queries():
+    first = parse_stats_text_columns(CAPTURE)
+    second = parse_stats_text_columns("Table 'Lines'. Scan count 1, logical reads 3.\n")
+    merged = concat_stats_frames([first, parse_stats_text_columns(''), second])
+    assert len(merged) == 4
+    assert merged.tables['query'].tolist() == [0, 0, 2, 2, 3]
+    assert list(merged.table_totals().index) == ['Orders', 'Customers', 'Lines']
+    assert list(merged) == list(first) + list(second)
+
+def test_concat_nothing_has_the_parsed_schema():
+    empty = concat_stats_frames([])
+    parsed = parse_stats_columns([])
+    assert len(empty) == 0
+    assert empty.tables.dtypes.equals(parsed.tables.dtypes)
+    assert empty.queries.dtypes.equals(parsed.queries.dtypes)
+    assert empty.table_totals().empty
+    assert len(concat_stats_frames([empty, parse_stats_text_columns(CAPTURE)])) == 3
@@ -0,0 +1,42 @@
+import codecs
+
+import pytest
+
+from sqlstatistics.parse_stats import _shard_bounds, iter_stats, parse_stats_parallel
+
+def block(table, logical_reads):
+    return (f"Table '{table}'. Scan count 1, logical reads {logical_reads}, physical reads 0, "
+            f"read-ahead reads 0, lob logical reads 0, lob physical reads 0, lob read-ahead reads 0.\n"
+            f"(1 rows affected)\n"
+            f"\n")
+
+def capture(blocks):
+    return ''.join(block(f"Table{i % 7}", i + 1) for i in range(blocks))
+
+@pytest.mark.parametrize('bom', [b'', codecs.BOM_UTF8])
+@pytest.mark.parametrize('shards', [1, 2, 3, 7, 50])
+def test_shard_bounds_cut_after_blank_lines(tmp_path, bom, shards):
+    path = tmp_path / 'capture.txt'
+    data = bom + capture(40).encode()
+    path.write_bytes(data)
+
+    bounds = _shard_bounds(str(path), shards)
+    assert bounds[0][0] == len(bom)
+    assert bounds[-1][1] == len(data)
+    assert all(end == start for (_, end), (start, _) in zip(bounds, bounds[1:]))
+    for start, _ in bounds[1:]:
+        assert data[:start].endswith(b'\n\n')
+
+@pytest.mark.parametrize('encoding', ['utf-8', 'utf-8-sig', 'utf-16'])
+def test_parallel_matches_serial(tmp_path, encoding):
+    path = tmp_path / 'capture.txt'
+    path.write_text(capture(200), encoding=encoding)
+    assert parse_stats_parallel(path, workers=4) == list(iter_stats(path))
+
+def test_parallel_several_files(tmp_path):
+    paths = []
+    for i, blocks in enumerate([0, 1, 150]):
+        path = tmp_path / f"capture{i}.txt"
+        path.write_text(capture(blocks))
+        paths.append(path)
+    assert parse_stats_parallel(paths, workers=3) == [list(iter_stats(path)) for path in paths]
@@ -0,0 +1,80 @@
+import pandas as pd
+import pytest
+
+from sqlstatistics.parse_execution_plan import read_plan
+from sqlstatistics.plan_advice import MissingIndexAdvisor, missing_index_report, warnings_report
+
+NS = 'http://schemas.microsoft.com/sqlserver/2004/07/showplan'
+
+def missing_index(table, equality, include, impact):
+    columns = ''.join(f'<Column Name="[{column}]"/>' for column in equality)
+    included = ''.join(f'<Column Name="[{column}]"/>' for column in include)
+    return (f'<MissingIndexes><MissingIndexGroup Impact="{impact}">'
+            f'<MissingIndex Database="[db]" Schema="[dbo]" Table="[{table}]">'
+            f'<ColumnGroup Usage="EQUALITY">{columns}</ColumnGroup>'
+            f'<ColumnGroup Usage="INCLUDE">{included}</ColumnGroup>'
+            '</MissingIndex></MissingIndexGroup></MissingIndexes>')
+
+def statement(statement_id, cost, query_plan='', operator_warnings=''):
+    return (f'<StmtSimple StatementId="{statement_id}" StatementType="SELECT"><QueryPlan>{query_plan}'
+            f'<RelOp NodeId="0" PhysicalOp="Sort" LogicalOp="Sort" EstimateRows="1" '
+            f'EstimatedTotalSubtreeCost="{cost}">{operator_warnings}<Sort/></RelOp>'
+            '</QueryPlan></StmtSimple>')
+
+def plan(*statements):
+    return read_plan(f'<ShowPlanXML xmlns="{NS}"><BatchSequence><Batch><Statements>{"".join(statements)}'
+                     '</Statements></Batch></BatchSequence></ShowPlanXML>')
+
+def test_missing_indexes_are_deduplicated():
+    records = plan(
+        statement(1, 10, missing_index('Orders', ['CustomerId', 'Status'], ['Total'], 50)),
+        # Same index, columns in another order and case
+        statement(2, 20, missing_index('orders', ['status', 'customerid'], ['TOTAL'], 25)),
+        statement(3, 5, missing_index('Orders', ['OrderDate'], [], 90)),
+    )
+    report = missing_index_report([records])
+    assert len(report) == 2
+    top = report.iloc[0]
+    assert top['Statements'] == 2
+    assert top['Weighted Impact'] == pytest.approx((10 * 50 + 20 * 25) / 100)
+    assert top['Create Statement'].startswith('CREATE NONCLUSTERED INDEX')
+    assert 'INCLUDE ([Total])' in top['Create Statement']
+    assert report.iloc[1]['Weighted Impact'] == pytest.approx(5 * 90 / 100)
+
+def test_advisors_merge_across_plans():
+    first = plan(statement(1, 10, missing_index('Orders', ['CustomerId'], [], 50)))
+    second = plan(statement(1, 30, missing_index('Orders', ['CUSTOMERID'], [], 10)))
+    advisor, other = MissingIndexAdvisor(), MissingIndexAdvisor()
+    advisor.add_plan(first)
+    other.add_plan(second)
+    advisor.merge(other)
+    assert len(advisor) == 1
+    report = advisor.report()
+    assert report['Plans'][0] == 2
+    assert report['Weighted Impact'][0] == pytest.approx((10 * 50 + 30 * 10) / 100)
+
+def test_unmatched_indexes_reported_once():
+    element = ('<Warnings UnmatchedIndexes="true"><UnmatchedIndexes><Parameterization>'
+               '<Object Database="[db]" Schema="[dbo]" Table="[Orders]" Index="[IX_Filtered]"/>'
+               '</Parameterization></UnmatchedIndexes></Warnings>')
+    flag_only = '<Warnings UnmatchedIndexes="true"/>'
+    for warnings in (element, flag_only):
+        report = warnings_report(plan(statement(1, 1, warnings)))
+        assert report['Kind'].tolist() == ['Unmatched Indexes']
+
+def test_operator_and_statement_warnings():
+    operator_warnings = ('<Warnings NoJoinPredicate="true"><SpillToTempDb SpillLevel="2" SpilledThreadCount="1"/>'
+                         '<PlanAffectingConvert ConvertIssue="Seek Plan" Expression="CONVERT_IMPLICIT(int,[a])"/>'
+                         '</Warnings>')
+    records = plan(statement(7, 1, '<Warnings><MemoryGrantWarning GrantWarningKind="Excessive Grant"/></Warnings>',
+                             operator_warnings))
+    report = warnings_report(records)
+    rows = [tuple(None if pd.isna(value) else value for value in row)
+            for row in report[['Node ID', 'Kind', 'Detail']].itertuples(index=False)]
+    assert rows == [
+        (None, 'Memory Grant', 'GrantWarningKind=Excessive Grant'),
+        (0, 'No Join Predicate', None),
+        (0, 'Spill', 'SpillLevel=2, SpilledThreadCount=1'),
+        (0, 'Implicit Conversion', 'Seek Plan: CONVERT_IMPLICIT(int,[a])'),
+    ]
+    assert set(report['Statement ID']) == {7}
@@ -0,0 +1,54 @@
+from sqlstatistics.parse_execution_plan import parse_execution_plan
+from sqlstatistics.plan_analysis import elapsed_report, has_runtime, misestimate_report
+
+NS = 'http://schemas.microsoft.com/sqlserver/2004/07/showplan'
+
+def threads(rows, mode='Row', elapsed=(10,), executions=1):
+    return ('<RunTimeInformation>'
+            + ''.join(f'<RunTimeCountersPerThread Thread="{thread}" ActualRows="{rows}" '
+                      f'ActualExecutions="{executions}" ActualExecutionMode="{mode}" '
+                      f'ActualElapsedms="{ms}" ActualCPUms="{ms}" ActualLogicalReads="5"/>'
+                      for thread, ms in enumerate(elapsed))
+            + '</RunTimeInformation>')
+
+def rel_op(node_id, physical, estimate_rows, runtime, children='', parallel=0, rebinds=0, rewinds=0):
+    return (f'<RelOp NodeId="{node_id}" PhysicalOp="{physical}" LogicalOp="{physical}" '
+            f'EstimateRows="{estimate_rows}" EstimateRebinds="{rebinds}" EstimateRewinds="{rewinds}" '
+            f'EstimatedTotalSubtreeCost="1" Parallel="{parallel}">{runtime}'
+            f'<Op>{children}</Op></RelOp>')
+
+def plan(root):
+    return (f'<ShowPlanXML xmlns="{NS}"><BatchSequence><Batch><Statements>'
+            f'<StmtSimple StatementId="1" StatementType="SELECT"><QueryPlan>{root}</QueryPlan></StmtSimple>'
+            '</Statements></Batch></BatchSequence></ShowPlanXML>')
+
+def factors(df):
+    report = misestimate_report(df)
+    return dict(zip(report['Node ID'], report['Misestimate Factor']))
+
+def test_parallel_operator_estimated_exactly():
+    # Four threads reading 25 rows each; ActualExecutions sums to the DOP
+    scan = rel_op(1, 'Index Scan', 100, threads(25, elapsed=(5, 5, 5, 5)), parallel=1)
+    df = parse_execution_plan(plan(rel_op(0, 'Parallelism', 100, threads(100), scan, parallel=1)))
+    assert df['Actual Executions'].tolist() == [1, 4]
+    assert factors(df) == {0: 1.0, 1: 1.0}
+
+def test_rebinds_scale_the_estimate():
+    # The inner side of a nested loop: 10 rows per execution, 10 executions
+    seek = rel_op(1, 'Index Seek', 10, threads(100, executions=10), rebinds=9)
+    df = parse_execution_plan(plan(rel_op(0, 'Nested Loops', 1000, threads(10), seek)))
+    assert df['Estimated Executions'].tolist() == [1.0, 10.0]
+    assert factors(df) == {0: 100.0, 1: 1.0}
+    assert misestimate_report(df)['Direction'][0] == 'over'
+
+def test_estimated_plan_has_no_runtime():
+    df = parse_execution_plan(plan(rel_op(0, 'Index Scan', 10, '')))
+    assert not has_runtime(df)
+    assert misestimate_report(df).empty
+
+def test_self_elapsed_by_execution_mode():
+    scan = rel_op(1, 'Index Scan', 10, threads(10, elapsed=(55,)))
+    for mode, expected in (('Row', 0), ('Batch', 40)):
+        root = rel_op(0, 'Hash Match', 10, threads(10, mode=mode, elapsed=(40,)), scan)
+        report = elapsed_report(parse_execution_plan(plan(root)))
+        assert report.set_index('Node ID')['Self Elapsed ms'][0] == expected
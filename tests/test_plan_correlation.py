@@ -0,0 +1,49 @@
+from sqlstatistics.parse_execution_plan import parse_execution_plan
+from sqlstatistics.parse_stats import parse_stats_text_columns
+from sqlstatistics.plan_correlation import correlate_stats_with_plan, table_key
+
+NS = 'http://schemas.microsoft.com/sqlserver/2004/07/showplan'
+
+STATS = """Table 'Orders'. Scan count 1, logical reads 100, physical reads 0, read-ahead reads 0, lob logical reads 0, lob physical reads 0, lob read-ahead reads 0.
+Table '#work_______________________________________________________________________________________________________000000000012'. Scan count 1, logical reads 40, physical reads 0, read-ahead reads 0, lob logical reads 0, lob physical reads 0, lob read-ahead reads 0.
+Table 'Worktable'. Scan count 0, logical reads 0, physical reads 0, read-ahead reads 0, lob logical reads 0, lob physical reads 0, lob read-ahead reads 0.
+
+Table 'Orders'. Scan count 1, logical reads 50, physical reads 0, read-ahead reads 0, lob logical reads 0, lob physical reads 0, lob read-ahead reads 0.
+"""
+
+def scan(node_id, table, index, cost):
+    return (f'<RelOp NodeId="{node_id}" PhysicalOp="Index Scan" LogicalOp="Index Scan" EstimateRows="1" '
+            f'EstimatedTotalSubtreeCost="{cost}"><IndexScan>'
+            f'<Object Database="[db]" Schema="[dbo]" Table="{table}" Index="[{index}]"/></IndexScan></RelOp>')
+
+def plan():
+    root = ('<RelOp NodeId="0" PhysicalOp="Hash Match" LogicalOp="Inner Join" EstimateRows="1" '
+            'EstimatedTotalSubtreeCost="10"><Hash>'
+            + scan(1, '[ORDERS]', 'IX_Orders', 4) + scan(2, '[#work]', 'PK_work', 1) + scan(3, '[Orders]', 'PK_Orders', 2)
+            + '</Hash></RelOp>')
+    return parse_execution_plan(f'<ShowPlanXML xmlns="{NS}"><BatchSequence><Batch><Statements>'
+                                f'<StmtSimple StatementId="1" StatementType="SELECT"><QueryPlan>{root}</QueryPlan>'
+                                '</StmtSimple></Statements></Batch></BatchSequence></ShowPlanXML>')
+
+def test_table_key():
+    assert table_key('[db].[dbo].[Orders]') == 'orders'
+    assert table_key('#work____________000000000012') == '#work'
+    assert table_key('#work_2') == '#work_2'
+
+def test_reads_join_every_operator_on_the_table():
+    correlation = correlate_stats_with_plan(parse_stats_text_columns(STATS), plan())
+    orders = correlation[correlation['Table'] == 'Orders']
+    # Totalled over both queries, once per operator touching the table, costliest first
+    assert orders['Logical Reads'].tolist() == [150, 150]
+    assert orders['Index'].astype(str).tolist() == ['IX_Orders', 'PK_Orders']
+    work = correlation[correlation['Table'].astype(str).str.startswith('#work')]
+    assert work['Node ID'].tolist() == [2]
+    # Tables no operator reads keep their row
+    worktable = correlation[correlation['Table'] == 'Worktable']
+    assert len(worktable) == 1
+    assert worktable['Node ID'].isna().all()
+
+def test_by_query_keeps_every_read():
+    correlation = correlate_stats_with_plan(parse_stats_text_columns(STATS), plan(), by_query=True)
+    orders = correlation[correlation['Table'] == 'Orders']
+    assert sorted(zip(orders['Query'], orders['Logical Reads'])) == [(1, 100), (1, 100), (2, 50), (2, 50)]
@@ -0,0 +1,62 @@
+from sqlstatistics.parse_execution_plan import parse_execution_plan
+from sqlstatistics.plan_diff import diff_plans, summarize_diff
+
+NS = 'http://schemas.microsoft.com/sqlserver/2004/07/showplan'
+
+def op(node_id, physical, cost, rows=10, children='', table=None, logical=None):
+    obj = f'<Object Schema="[dbo]" Table="[{table}]"/>' if table else ''
+    return (f'<RelOp NodeId="{node_id}" PhysicalOp="{physical}" LogicalOp="{logical or physical}" '
+            f'EstimateRows="{rows}" EstimatedTotalSubtreeCost="{cost}"><Op>{obj}{children}</Op></RelOp>')
+
+def plan(*statements):
+    body = ''.join(f'<StmtSimple StatementId="{i}" StatementType="SELECT" StatementText="{text}">'
+                   f'<QueryPlan>{root}</QueryPlan></StmtSimple>'
+                   for i, (text, root) in enumerate(statements, 1))
+    return parse_execution_plan(f'<ShowPlanXML xmlns="{NS}"><BatchSequence><Batch><Statements>{body}'
+                                '</Statements></Batch></BatchSequence></ShowPlanXML>')
+
+def rows(diff):
+    return list(zip(diff['Status'], diff['Old Operation'], diff['New Operation'], diff['Flag']))
+
+def join(children, cost=10):
+    return op(0, 'Nested Loops', cost, children=children, logical='Inner Join')
+
+def test_identical_plans_are_unchanged():
+    root = join(op(1, 'Index Seek', 2, table='Orders') + op(2, 'Index Seek', 3, table='Lines'))
+    diff = diff_plans(plan(('SELECT 1', root)), plan(('SELECT 1', root)))
+    assert set(diff['Status']) == {'unchanged'}
+    assert summarize_diff(diff) == {'unchanged': 3, 'flagged': 0}
+
+def test_seek_replaced_by_scan_despite_renumbering():
+    old = join(op(1, 'Index Seek', 2, table='Orders') + op(2, 'Index Seek', 3, table='Lines'))
+    # Node ids renumbered and the seek on Lines became a scan
+    new = join(op(7, 'Index Scan', 30, table='Lines') + op(5, 'Index Seek', 2, table='Orders'), cost=40)
+    diff = diff_plans(plan(('SELECT 1', old)), plan(('SELECT 1', new)))
+    assert sorted(rows(diff)) == sorted([
+        ('changed', 'Nested Loops', 'Nested Loops', ''),
+        ('changed', 'Index Seek', 'Index Seek', ''),
+        ('replaced', 'Index Seek', 'Index Scan', 'seek replaced by scan'),
+    ])
+    seek = diff[diff['Status'] == 'changed'].set_index('Old Operation').loc['Index Seek']
+    assert (seek['Old Node ID'], seek['New Node ID']) == (1, 5)
+
+def test_added_and_removed_subtrees():
+    old = join(op(1, 'Index Seek', 2) + op(2, 'Index Seek', 3))
+    new = join(op(1, 'Index Seek', 2) + op(2, 'Sort', 5, children=op(3, 'Index Seek', 3))
+               + op(4, 'Table Scan', 1))
+    diff = diff_plans(plan(('SELECT 1', old), ('SELECT 2', old)), plan(('SELECT 1', new)))
+    counts = summarize_diff(diff)
+    # The Sort pairs positionally with the second seek; its child and the scan are new
+    assert counts['replaced'] == 1
+    assert counts['added'] == 2
+    # The second statement has no counterpart
+    assert counts['removed'] == 3
+    assert (diff.loc[diff['Status'] == 'removed', 'Statement ID'] == 2).all()
+
+def test_rows_ratio_threshold():
+    old = op(0, 'Index Seek', 1, rows=10)
+    diff = diff_plans(plan(('SELECT 1', old)), plan(('SELECT 1', op(0, 'Index Seek', 1, rows=15))))
+    assert diff['Status'].tolist() == ['unchanged']
+    diff = diff_plans(plan(('SELECT 1', old)), plan(('SELECT 1', op(0, 'Index Seek', 1, rows=30))))
+    assert diff['Status'].tolist() == ['changed']
+    assert diff['Rows Ratio'].tolist() == [3.0]
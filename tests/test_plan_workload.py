@@ -0,0 +1,57 @@
+import logging
+
+import pytest
+
+from sqlstatistics.plan_workload import analyze_workload, load_weights, predicate_shape
+
+NS = 'http://schemas.microsoft.com/sqlserver/2004/07/showplan'
+
+def plan_xml(table, value, cost, missing_index=''):
+    predicate = f'[db].[dbo].[{table}].[Status] as [o].[Status]={value}'
+    return (f'<ShowPlanXML xmlns="{NS}"><BatchSequence><Batch><Statements>'
+            f'<StmtSimple StatementId="1" StatementType="SELECT"><QueryPlan>{missing_index}'
+            f'<RelOp NodeId="0" PhysicalOp="Clustered Index Scan" LogicalOp="Clustered Index Scan" '
+            f'EstimateRows="1" EstimatedTotalSubtreeCost="{cost}"><IndexScan>'
+            f'<Object Database="[db]" Schema="[dbo]" Table="[{table}]" Index="[PK_{table}]"/>'
+            f'<Predicate><ScalarOperator ScalarString="{predicate}"/></Predicate></IndexScan></RelOp>'
+            '</QueryPlan></StmtSimple></Statements></Batch></BatchSequence></ShowPlanXML>')
+
+MISSING_INDEX = ('<MissingIndexes><MissingIndexGroup Impact="90">'
+                 '<MissingIndex Database="[db]" Schema="[dbo]" Table="[Orders]">'
+                 '<ColumnGroup Usage="EQUALITY"><Column Name="[Status]"/></ColumnGroup>'
+                 '</MissingIndex></MissingIndexGroup></MissingIndexes>')
+
+def test_predicate_shape():
+    assert predicate_shape("[db].[dbo].[Orders].[Status] as [o].[Status]=N'open'") == 'Status=?'
+    assert predicate_shape('[o].[Id]>=@p1 AND [o].[Total]<(10.5)') == 'Id>=? AND Total<?'
+
+def test_operators_ranked_across_plans_with_weights(tmp_path):
+    (tmp_path / 'a.sqlplan').write_text(plan_xml('Orders', 1, 2.0, MISSING_INDEX))
+    (tmp_path / 'b.sqlplan').write_text(plan_xml('Orders', "N'open'", 3.0, MISSING_INDEX))
+    (tmp_path / 'c.sqlplan').write_text(plan_xml('Customers', 2, 4.0))
+    (tmp_path / 'weights.csv').write_text('plan,weight\na.sqlplan,10\n')
+
+    report = analyze_workload([str(tmp_path)], workers=1, weights=load_weights(str(tmp_path / 'weights.csv')))
+    assert report.plans == 3
+    assert report.failed == []
+    # The two Orders scans differ only in their literal, so they share a row
+    operators = report.operators
+    assert operators['object'].tolist() == ['db.dbo.Orders.PK_Orders', 'db.dbo.Customers.PK_Customers']
+    assert operators['predicate_shape'][0] == 'where Status=?'
+    assert operators['plans'].tolist() == [2, 1]
+    assert operators['cost'].tolist() == [5.0, 4.0]
+    assert operators['weighted_cost'].tolist() == [23.0, 4.0]
+    assert operators['cost_share'].sum() == pytest.approx(100)
+    assert report.missing_indexes['plans'].tolist() == [2]
+    assert report.implicit_conversions.empty
+
+def test_failed_plan_reported_once(tmp_path, caplog):
+    (tmp_path / 'good.sqlplan').write_text(plan_xml('Orders', 1, 1.0))
+    (tmp_path / 'bad.sqlplan').write_text(f'<ShowPlanXML xmlns="{NS}"><BatchSequence>')
+
+    with caplog.at_level(logging.WARNING):
+        report = analyze_workload([str(tmp_path)], workers=1)
+    assert report.plans == 1
+    assert [path for path, _ in report.failed] == [str(tmp_path / 'bad.sqlplan')]
+    records = [record for record in caplog.records if 'bad.sqlplan' in record.getMessage()]
+    assert len(records) == 1
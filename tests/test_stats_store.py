@@ -0,0 +1,41 @@
+import os
+from datetime import datetime
+
+from sqlstatistics.stats_store import StatsStore, iter_capture_files
+
+def capture(table, reads, completed):
+    return (f"Table '{table}'. Scan count 1, logical reads {reads}, physical reads 0, read-ahead reads 0, "
+            "lob logical reads 0, lob physical reads 0, lob read-ahead reads 0.\n"
+            f"Completion time: {completed}\n\n")
+
+def test_ingest_skips_files_already_stored(tmp_path):
+    captures = tmp_path / 'captures'
+    (captures / 'nested').mkdir(parents=True)
+    (captures / 'a.txt').write_text(capture('Orders', 10, '2024-03-01T10:00:00.000+00:00'))
+    (captures / 'nested' / 'b.txt').write_text(capture('Orders', 5, '2024-03-02T10:00:00.000+00:00'))
+    (captures / 'notes.md').write_text('not a capture')
+    found = [os.path.relpath(path, captures) for path in iter_capture_files([str(captures)])]
+    assert found == ['a.txt', os.path.join('nested', 'b.txt')]
+
+    store = StatsStore(str(tmp_path / 'stats.sqlite'))
+    assert len(store.ingest([str(captures)])) == 2
+    # Same contents under another name are recognised by their hash
+    (captures / 'copy.txt').write_text(capture('Orders', 10, '2024-03-01T10:00:00.000+00:00'))
+    assert store.ingest([str(captures)]) == []
+    assert store.table_totals().loc['Orders', 'logical_reads'] == 15
+
+def test_table_totals_filters_by_window_and_table(tmp_path):
+    (tmp_path / 'a.txt').write_text(
+        capture('Orders', 10, '2024-03-01T10:00:00.000+00:00')
+        + capture('Customers', 3, '2024-03-01T12:00:00.000+02:00')
+        + capture('Orders', 7, '2024-03-05T10:00:00.000+00:00')
+    )
+    store = StatsStore(str(tmp_path / 'stats.sqlite'))
+    store.ingest_file(str(tmp_path / 'a.txt'))
+
+    march = store.table_totals(since=datetime(2024, 3, 1), until=datetime(2024, 3, 2))
+    assert march['logical_reads'].to_dict() == {'Orders': 10, 'Customers': 3}
+    assert store.table_totals(since=datetime(2024, 3, 2))['logical_reads'].to_dict() == {'Orders': 7}
+    orders = store.table_totals(table='Orders')
+    assert orders.loc['Orders', 'queries'] == 2
+    assert orders.loc['Orders', 'logical_reads'] == 17
@@ -0,0 +1,137 @@
+import codecs
+
+import pytest
+
+from sqlstatistics.parse_stats import StatsTail, parse_stats_text
+from sqlstatistics.stats_lines import COUNTER_COLUMNS
+
+LOGICAL_READS = COUNTER_COLUMNS.index('logical_reads')
+
+def block(table, logical_reads, rows=1):
+    return (f"Table '{table}'. Scan count 1, logical reads {logical_reads}, physical reads 0, "
+            f"read-ahead reads 0, lob logical reads 0, lob physical reads 0, lob read-ahead reads 0.\n"
+            f"({rows} rows affected)\n"
+            f"Completion time: 2024-03-01T10:00:00.0000000+01:00\n"
+            f"\n")
+
+def capture(blocks):
+    return ''.join(block(f"Table{i % 7}", i + 1) for i in range(blocks))
+
+def logical_reads(tail):
+    return {table: totals[LOGICAL_READS] for table, totals in zip(tail.tables, tail.totals)}
+
+def expected_reads(text):
+    reads = {}
+    for query in parse_stats_text(text):
+        for table in query.tables:
+            reads[table.table_name] = reads.get(table.table_name, 0) + table.logical_reads
+    return reads
+
+def append(path, data):
+    with open(path, 'ab') as f:
+        f.write(data)
+
+def test_tail_block_split_across_polls(tmp_path):
+    path = tmp_path / 'live.txt'
+    text = block('Orders', 10)
+    path.write_bytes(b'')
+    tail = StatsTail(path)
+
+    # Cut inside the table line, then before the closing blank line
+    first, second = 20, len(text) - 1
+    append(path, text[:first].encode())
+    assert tail.poll().queries == 0
+    append(path, text[first:second].encode())
+    assert tail.poll().queries == 0
+    append(path, text[second:].encode())
+    update = tail.poll()
+    assert update.queries == 1
+    assert update.changed == [0]
+    assert logical_reads(tail) == {'Orders': 10}
+
+@pytest.mark.parametrize('bom, encoding', [
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+    (b'', 'utf-16-le'),
+    (b'', 'utf-16-be'),
+    (codecs.BOM_UTF8, 'utf-8'),
+])
+def test_tail_encodings(tmp_path, bom, encoding):
+    path = tmp_path / 'live.txt'
+    text = capture(30)
+    data = bom + text.encode(encoding)
+    path.write_bytes(b'')
+    tail = StatsTail(path)
+
+    # Odd chunk sizes split UTF-16 code units and the BOM itself
+    queries = 0
+    for start in range(0, len(data), 37):
+        append(path, data[start:start + 37])
+        queries += tail.poll().queries
+    assert queries == 30
+    assert logical_reads(tail) == expected_reads(text)
+
+def test_tail_max_bytes(tmp_path):
+    path = tmp_path / 'live.txt'
+    text = capture(20)
+    path.write_text(text)
+    tail = StatsTail(path)
+    while tail.offset < len(text):
+        tail.poll(max_bytes=50)
+    assert tail.queries == 20
+    assert logical_reads(tail) == expected_reads(text)
+
+def test_tail_truncation_resets(tmp_path):
+    path = tmp_path / 'live.txt'
+    path.write_text(capture(10))
+    tail = StatsTail(path)
+    assert tail.poll().queries == 10
+
+    path.write_text(block('Customers', 5))
+    update = tail.poll()
+    assert update.reset
+    assert update.queries == 1
+    assert tail.queries == 1
+    assert logical_reads(tail) == {'Customers': 5}
+
+def test_tail_replaced_file_resets(tmp_path):
+    path = tmp_path / 'live.txt'
+    path.write_text(capture(3))
+    tail = StatsTail(path)
+    tail.poll()
+
+    # A new file of the same size under the same name
+    replacement = tmp_path / 'new.txt'
+    replacement.write_text(capture(3).replace("'Table", "'Other"))
+    replacement.replace(path)
+    update = tail.poll()
+    assert update.reset
+    assert set(tail.tables) == {f"Other{i}" for i in range(3)}
+
+def test_tail_from_end_mid_block(tmp_path):
+    path = tmp_path / 'live.txt'
+    old, rest = block('Old', 100), block('New', 7)
+    cut = old.index('(')
+    path.write_text(capture(5) + old[:cut])
+    tail = StatsTail(path, from_end=True)
+
+    # The rest of the half-written block is dropped, not counted half
+    append(path, (old[cut:] + rest).encode())
+    update = tail.poll()
+    assert update.queries == 1
+    assert logical_reads(tail) == {'New': 7}
+
+def test_tail_from_end_at_block_boundary(tmp_path):
+    path = tmp_path / 'live.txt'
+    path.write_text(capture(5))
+    tail = StatsTail(path, from_end=True)
+    append(path, block('New', 7).encode())
+    assert tail.poll().queries == 1
+    assert logical_reads(tail) == {'New': 7}
+
+def test_tail_flush_counts_unfinished_block(tmp_path):
+    path = tmp_path / 'live.txt'
+    path.write_text(block('Orders', 10).rstrip('\n'))
+    tail = StatsTail(path)
+    assert tail.poll().queries == 0
+    assert tail.flush().queries == 1
+    assert logical_reads(tail) == {'Orders': 10}
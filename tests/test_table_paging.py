@@ -0,0 +1,31 @@
+import pandas as pd
+
+from sqlstatistics.table_paging import page_frame
+
+def frame():
+    return pd.DataFrame({
+        'Table': pd.Categorical(['b', 'a', 'c', 'a', 'b']),
+        'Logical Reads': pd.array([5, 1, None, 3, 2], dtype='Int64'),
+        'Parallel': [True, False, True, False, False],
+    })
+
+def test_pages_are_clamped():
+    records, page_count = page_frame(frame(), 7, 2)
+    assert page_count == 3
+    assert len(records) == 1
+
+def test_sort_and_filter():
+    records, page_count = page_frame(frame(), 0, 10,
+                                     sort_by=[{'column_id': 'Table', 'direction': 'asc'},
+                                              {'column_id': 'Logical Reads', 'direction': 'desc'}],
+                                     filter_query='{Logical Reads} ge 2')
+    assert page_count == 1
+    assert [(r['Table'], r['Logical Reads']) for r in records] == [('a', 3), ('b', 5), ('b', 2)]
+
+def test_flags_and_missing_values():
+    records, _ = page_frame(frame(), 0, 10, filter_query='{Parallel} eq true')
+    assert [r['Table'] for r in records] == ['b', 'c']
+    # Missing counters are sent as null, not NaN
+    assert records[1]['Logical Reads'] is None
+    records, _ = page_frame(frame(), 0, 10, filter_query='{Table} contains A')
+    assert len(records) == 2
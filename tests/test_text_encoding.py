@@ -0,0 +1,51 @@
+import codecs
+import io
+
+import pytest
+
+from sqlstatistics.text_encoding import detect_encoding, detect_file_encoding, open_text
+
+TEXT = "Table 'Orders'. Scan count 1, logical reads 7.\n\n(1 row affected)\n"
+
+@pytest.mark.parametrize('head, expected', [
+    (codecs.BOM_UTF8 + b'Tab', ('utf-8', 3)),
+    (codecs.BOM_UTF16_LE + b'T\x00', ('utf-16-le', 2)),
+    (codecs.BOM_UTF16_BE + b'\x00T', ('utf-16-be', 2)),
+    (b'T\x00a\x00', ('utf-16-le', 0)),
+    (b'\x00T\x00a', ('utf-16-be', 0)),
+    (b'Tabl', ('utf-8', 0)),
+    (b'T', ('utf-8', 0)),
+    (b'', ('utf-8', 0)),
+])
+def test_detect_encoding(head, expected):
+    assert detect_encoding(head) == expected
+
+ENCODED = {
+    'utf-8': TEXT.encode('utf-8'),
+    'utf-8-sig': codecs.BOM_UTF8 + TEXT.encode('utf-8'),
+    'utf-16': codecs.BOM_UTF16_LE + TEXT.encode('utf-16-le'),
+    'utf-16-le': TEXT.encode('utf-16-le'),
+    'utf-16-be': TEXT.encode('utf-16-be'),
+}
+
+@pytest.mark.parametrize('name', list(ENCODED))
+def test_open_text_sources(tmp_path, name):
+    data = ENCODED[name]
+    path = tmp_path / 'capture.txt'
+    path.write_bytes(data)
+
+    with open_text(path) as f:
+        assert f.read() == TEXT
+    with open_text(data) as f:
+        assert f.read() == TEXT
+    with open_text(memoryview(data)) as f:
+        assert f.read() == TEXT
+    stream = io.BytesIO(data)
+    with open_text(stream) as f:
+        assert f.readline() == TEXT.splitlines(True)[0]
+    assert not stream.closed
+
+def test_detect_file_encoding(tmp_path):
+    path = tmp_path / 'plan.sqlplan'
+    path.write_bytes(ENCODED['utf-16'])
+    assert detect_file_encoding(path) == ('utf-16-le', 2)
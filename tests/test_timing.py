@@ -0,0 +1,24 @@
+from sqlstatistics.timing import StageMetrics, record, span
+
+def test_spans_nest_under_record():
+    with record('analyze') as timings:
+        with span('parse'):
+            with span('blocks'):
+                pass
+        with span('layout'):
+            pass
+    assert [(stage.name, stage.depth) for stage in timings.stages] == [('parse', 0), ('blocks', 1), ('layout', 0)]
+    assert set(timings.as_dict()) == {'parse', 'blocks', 'layout'}
+
+def test_stage_metrics_shared_through_the_file(tmp_path):
+    path = str(tmp_path / 'metrics.sqlite')
+    for _ in range(2):
+        with record('analyze') as timings:
+            with span('parse'):
+                pass
+        # A separate instance per observation, as in separate workers
+        StageMetrics(path).observe(timings)
+    text = StageMetrics(path).render()
+    name = 'sqlstatistics_stage_duration_seconds'
+    assert f'{name}_count{{operation="analyze",stage="parse"}} 2' in text
+    assert f'{name}_bucket{{operation="analyze",stage="total",le="+Inf"}} 2' in text